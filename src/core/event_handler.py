@@ -17,9 +17,20 @@ class EventHandler(QObject):
     recording_started = Signal(str)  # Path to the recording file
     recording_stopped = Signal(str)  # Path to the recording file
     recording_error = Signal(str)  # Error message
+    recording_status_changed = Signal(str)  # IDLE, STARTING, RECORDING, STOPPING
+    recording_stats_updated = Signal(dict)  # Totals (fps, bytes...) and "cameras"
+    recording_disk_warning = Signal(str)  # Disk full or too slow, "" once fine
+    recording_disk_full = Signal(str)  # Stream path of the camera that hit it
+    recording_reconnecting = Signal(bool)  # True while the stream is lost
+    # (media time, lost seconds); markers are shown in review mode only
+    recording_gap = Signal(float, float)
+    recording_finalized = Signal(str)  # Path to the recording, index first
+    frame_index_ready = Signal(str)  # Path to the video whose sidecar was built
+    proxy_ready = Signal(str)  # Path to the video whose proxy was encoded
 
     # Tag management Signals
     tags_updated = Signal(list)  # List of all tags
+    gaps_updated = Signal(list)  # Gap markers of the video, dicts at/duration
     add_tag_clicked = Signal()
     tag_selected = Signal(str)
     request_tag_timestamp = Signal(int)  # Tag number requested by voice command
@@ -36,6 +47,16 @@ class EventHandler(QObject):
     streaming_stopped = Signal()
     streaming_error = Signal(str)
     streaming_status = Signal(str)
+    stream_ingest_ready = Signal(str)  # Stream path
+    stream_ingest_closed = Signal(str)  # Stream path
+    mediamtx_state_changed = Signal(str)  # STARTING, READY, RESTARTING...
+    # Path -> bitrate, bitrate_variation, readers...
+    stream_telemetry_updated = Signal(dict)
+    stream_health_warning = Signal(str, str)  # Path, message ("" when healthy)
+    live_stream_ready = Signal(str)  # Stream path, ready with tracks
+    live_first_frame = Signal(float)  # Seconds from stream start to first frame
+    cycle_live_profile_Signal = Signal()
+    live_profile_changed = Signal(str)  # Live view profile name
 
     # Media Signals
     media_loaded = Signal(str)
@@ -50,6 +71,8 @@ class EventHandler(QObject):
     forward_Signal = Signal()
     play_pause_Signal = Signal()
     seek_Signal = Signal(float)
+    step_forward_Signal = Signal()
+    step_backward_Signal = Signal()
     slow_down_Signal = Signal()
     position_changed = Signal(float, float)
 
@@ -21,10 +21,13 @@ class KeyboardShortcutsService:
         self._add_shortcut("Space", events.play_pause_Signal.emit)
         self._add_shortcut("Right", events.forward_Signal.emit)
         self._add_shortcut("Left", events.rewind_Signal.emit)
+        self._add_shortcut(".", events.step_forward_Signal.emit)
+        self._add_shortcut(",", events.step_backward_Signal.emit)
 
         # Mode shortcuts
         self._add_shortcut("D", events.live_mode_clicked.emit)
         self._add_shortcut("R", events.review_mode_clicked.emit)
+        self._add_shortcut("L", events.cycle_live_profile_Signal.emit)
 
         # Recording shortcuts
         self._add_shortcut("E", events.start_recording_clicked.emit)
@@ -1,4 +1,5 @@
 import ctypes
+import multiprocessing
 import sys
 import os
 import locale
@@ -46,4 +47,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # The isolated recorder runs in a spawned child process
+    multiprocessing.freeze_support()
     main()
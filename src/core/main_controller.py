@@ -4,13 +4,15 @@ from src.core.camera_connection.gopro_service import GoProService
 from src.core.event_handler import events
 from src.core.keyboard_shortcuts_service import KeyboardShortcutsService
 from src.core.logging_config import logger
+from src.core.streaming.stream_ingest import StreamIngestService
 from src.core.video_processing.media_service import MediaService
 from src.core.video_processing.mode_service import ModeService, Mode
-from src.core.video_processing.player import VLCPlayer
+from src.core.video_processing.player import PyAVPlayer, VLCPlayer
 from src.core.video_processing.recording_service import RecordingService
 from src.core.video_processing.tag_service import TagService
 from src.core.voice_recognition.voice_service import VoiceService
 from src.ui.dialogs.dialog_service import DialogService
+from src.utils.resource_manager import ResourceManager
 
 
 class MainController:
@@ -21,16 +23,23 @@ class MainController:
     It acts as the bridge between the UI (MainWindow) and the core services.
     """
 
+    # Replay player: "vlc" or "pyav"
+    REPLAY_PLAYER = "vlc"
+
     def __init__(self, main_window: QMainWindow):
         self.main_window = main_window
 
         # Initialize base sections
-        self.replay_player = VLCPlayer()
+        if self.REPLAY_PLAYER == "pyav":
+            self.replay_player = PyAVPlayer()
+        else:
+            self.replay_player = VLCPlayer()
         self.tag_manager = TagService()
         self.mode_manager = ModeService()
 
         # Initialize services
-        self.recording_service = RecordingService()
+        self.ingest_service = StreamIngestService(parent=main_window)
+        self.recording_service = RecordingService(ingest_service=self.ingest_service)
         self.media_service = MediaService(self.replay_player, parent=main_window)
         self.gopro_service = GoProService(parent=main_window)
         self.dialog_service = DialogService(parent=main_window)
@@ -38,7 +47,10 @@ class MainController:
         self.keyboard_shortcuts_service = KeyboardShortcutsService(parent=main_window)
 
         # Set video output for replay player
-        if self.main_window.media_player.replay_section.video_frame.winId():
+        if isinstance(self.replay_player, PyAVPlayer):
+            surface = self.main_window.media_player.replay_section.add_video_surface()
+            self.replay_player.frame_ready.connect(surface.set_frame)
+        elif self.main_window.media_player.replay_section.video_frame.winId():
             self.media_service.set_video_output(
                 self.main_window.media_player.replay_section.video_frame.winId()
             )
@@ -115,6 +127,8 @@ class MainController:
         events.rewind_Signal.connect(lambda: self.media_service.rewind(10))
         events.forward_Signal.connect(lambda: self.media_service.forward(10))
         events.seek_Signal.connect(self.media_service.seek)
+        events.step_forward_Signal.connect(self.media_service.step_forward)
+        events.step_backward_Signal.connect(self.media_service.step_backward)
         events.slow_down_Signal.connect(self.media_service.slow_down)
         events.cycle_zoom_Signal.connect(self.media_service.cycle_zoom)
         events.zoom_in_Signal.connect(self.media_service.zoom_in)
@@ -139,20 +153,48 @@ class MainController:
         events.streaming_started.connect(
             self.main_window.media_player.live_section.on_streaming_started
         )
+        events.live_stream_ready.connect(
+            self.main_window.media_player.live_section.on_live_stream_ready
+        )
         events.streaming_stopped.connect(
             self.main_window.media_player.live_section.on_streaming_stopped
         )
+        events.cycle_live_profile_Signal.connect(
+            self.main_window.media_player.live_section.cycle_live_profile
+        )
+        events.stream_ingest_ready.connect(self._on_stream_ingest_ready)
 
         # Live mode connections
         events.live_mode_changed.connect(
             self.main_window.sidebar.action_section.on_live_mode_changed
         )
         events.live_mode_changed.connect(self.main_window.media_player.update_display)
+        events.live_mode_changed.connect(self.media_service.set_live_mode)
+        self.main_window.media_player.replay_section.visibility_changed.connect(
+            self.media_service.set_view_visible
+        )
 
         # Recording state connections
         events.recording_state_changed.connect(
             self.main_window.sidebar.action_section.update_recording_state
         )
+        events.recording_status_changed.connect(
+            self.main_window.sidebar.action_section.on_recording_status_changed
+        )
+        events.recording_stats_updated.connect(
+            self.main_window.sidebar.action_section.on_recording_stats_updated
+        )
+        events.recording_disk_warning.connect(
+            lambda message: self.main_window.status_indicator.set_message(
+                "recording_disk", message
+            )
+        )
+        events.stream_health_warning.connect(
+            self.main_window.status_indicator.set_message
+        )
+        events.recording_reconnecting.connect(
+            self.main_window.sidebar.action_section.on_recording_reconnecting
+        )
         events.recording_state_changed.connect(
             self.main_window.media_player.live_section.on_recording_state_changed
         )
@@ -170,6 +212,17 @@ class MainController:
         events.tags_updated.connect(
             self.main_window.media_player.replay_section.controls.on_tags_changed
         )
+        events.gaps_updated.connect(
+            self.main_window.media_player.replay_section.controls.on_gaps_changed
+        )
+
+    def _on_stream_ingest_ready(self, stream_path: str) -> None:
+        """Feed the live view from the stream ingest when it renders in-app."""
+        if stream_path != ResourceManager.STREAMING_PATH:
+            return  # The live view shows the main camera only
+        self.main_window.media_player.live_section.attach_ingest(
+            self.ingest_service.get_ingest(stream_path)
+        )
 
     def _on_recording_state_changed(self, is_recording: bool) -> None:
         """Handle recording state changes."""
@@ -210,7 +263,7 @@ class MainController:
         if self.mode_manager.get_mode() == Mode.LIVE:
             if self.recording_service.is_recording:
                 self.tag_manager.add_tag_at_time(
-                    self.recording_service._recording_thread.get_recording_duration()
+                    self.recording_service.get_media_time()
                 )
         else:
             self.tag_manager.add_tag_at_time(self.media_service.get_current_time()[0])
@@ -238,6 +291,8 @@ class MainController:
 
         if hasattr(self, "recording_service"):
             self.recording_service.cleanup()
+        if hasattr(self, "ingest_service"):
+            self.ingest_service.cleanup()
         # if hasattr(self, "streaming_service"):
         #     self.streaming_service.stop_mediamtx()
         if hasattr(self, "media_service"):
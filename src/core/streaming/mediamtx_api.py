@@ -0,0 +1,76 @@
+"""
+Client of the MediaMTX control API.
+One keep-alive HTTP session is shared by the users of the API (stream
+availability, telemetry), so a poll reuses an open connection instead of
+paying a TCP handshake each time.
+"""
+
+import threading
+from typing import List
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.resource_manager import ResourceManager
+
+
+class MediaMTXApiClient:
+    """Pooled, keep-alive client of the MediaMTX API (apiAddress in mediamtx.yml)."""
+
+    API_PORT = 9997
+    # (connect, read) timeouts in seconds: the server is local
+    TIMEOUT = (0.5, 2.0)
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, port: int = API_PORT):
+        self._base_url = f"http://{ResourceManager.STREAMING_HOST}:{port}/v3"
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self._session.mount("http://", adapter)
+
+    @classmethod
+    def shared(cls) -> "MediaMTXApiClient":
+        """Client shared by the whole application."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def get(self, endpoint: str) -> dict:
+        """
+        GET an API endpoint.
+
+        Args:
+            endpoint: Path under /v3, e.g. "paths/list".
+
+        Raises:
+            requests.RequestException: If the server is unreachable or
+                answers with an error status.
+        """
+        response = self._session.get(
+            f"{self._base_url}/{endpoint}", timeout=self.TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def list_items(self, endpoint: str) -> List[dict]:
+        """All the items of a list endpoint, following its pages."""
+        items = []
+        page = 0
+        while True:
+            data = self.get(f"{endpoint}?page={page}&itemsPerPage=100")
+            items.extend(data.get("items") or [])
+            page += 1
+            if page >= data.get("pageCount", 1):
+                return items
+
+    def ready_paths(self) -> List[str]:
+        """Names of the paths a publisher is streaming to."""
+        return [
+            path["name"] for path in self.list_items("paths/list") if path.get("ready")
+        ]
+
+    def close(self) -> None:
+        self._session.close()
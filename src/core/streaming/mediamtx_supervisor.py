@@ -0,0 +1,283 @@
+"""
+Supervision of the MediaMTX server process.
+The supervisor drains the server output on a reader thread (a full pipe
+would block the server), forwards it to the application log and detects
+readiness from the "listener opened" lines, so start returns as soon as the
+RTMP, RTSP and API listeners are up instead of polling a port.
+A watchdog restarts the server with exponential backoff when it exits or
+stops answering its API, and every state change is published through
+mediamtx_state_changed.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from enum import Enum, auto
+from typing import Callable, Dict, Optional
+
+import requests
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.streaming.mediamtx_api import MediaMTXApiClient
+from src.utils.resource_manager import ResourceManager
+
+# "2024/05/01 10:00:00 INF [RTMP] listener opened on :1935"
+_LOG_LINE = re.compile(r"^\S+ \S+ (DEB|INF|WAR|ERR) (?:\[(\w+)\] )?(.*)$")
+
+
+class MediaMTXState(Enum):
+    """Server states, published by name through mediamtx_state_changed."""
+
+    STOPPED = auto()
+    STARTING = auto()
+    READY = auto()
+    RESTARTING = auto()
+    FAILED = auto()
+
+
+class MediaMTXSupervisor:
+    """
+    Owns the MediaMTX process: start, readiness, log draining, health checks
+    and restart on crash.
+    """
+
+    # Listeners that must be open for the server to be ready
+    REQUIRED_LISTENERS = ("RTMP", "RTSP", "API")
+    START_TIMEOUT = 10.0
+    # Restart backoff: doubled on each crash, reset once the server stayed up
+    RESTART_DELAY = 1.0
+    MAX_RESTART_DELAY = 30.0
+    STABLE_UPTIME = 60.0
+    # API health check: restart after this many failed checks in a row
+    HEALTH_INTERVAL = 10.0
+    HEALTH_FAILURES = 3
+    # Output lines kept to report a failed start
+    LOG_TAIL = 50
+
+    def __init__(
+        self,
+        on_crash: Optional[Callable[[], None]] = None,
+        client: Optional[MediaMTXApiClient] = None,
+    ):
+        """
+        Args:
+            on_crash: Called from the watchdog when the server went down
+                unexpectedly, before it is restarted.
+            client: API client of the health checks.
+        """
+        self._on_crash = on_crash
+        self._client = client or MediaMTXApiClient.shared()
+        self._env: Dict[str, str] = {}
+        self._process: Optional[subprocess.Popen] = None
+        self._state = MediaMTXState.STOPPED
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        # Set by the output reader when the current process exits
+        self._exited = threading.Event()
+        self._stopping = threading.Event()
+        self._open_listeners = set()
+        self._log_tail = deque(maxlen=self.LOG_TAIL)
+        self._watchdog: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> MediaMTXState:
+        return self._state
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _set_state(self, state: MediaMTXState) -> None:
+        if state == self._state:
+            return
+        self._state = state
+        logger.info(f"MediaMTX {state.name.lower()}")
+        events.mediamtx_state_changed.emit(state.name)
+
+    def start(self, env: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Launch the server and wait until its listeners are open.
+
+        Args:
+            env: Variables added to the server environment (config overrides).
+
+        Returns:
+            bool: True once ready, False if it exited or timed out (the
+            server is then stopped).
+        """
+        with self._lock:
+            if self.is_running:
+                return True
+            self._env = dict(env or {})
+            self._stopping.clear()
+            self._set_state(MediaMTXState.STARTING)
+            try:
+                self._launch()
+            except OSError as e:
+                logger.error(f"Cannot launch MediaMTX: {str(e)}")
+                self._set_state(MediaMTXState.FAILED)
+                return False
+
+        if not self._wait_ready(self.START_TIMEOUT):
+            logger.error("MediaMTX failed to start:\n" + "\n".join(self._log_tail))
+            self.stop()
+            self._set_state(MediaMTXState.FAILED)
+            return False
+
+        self._set_state(MediaMTXState.READY)
+        self._watchdog = threading.Thread(
+            target=self._watch, name="MediaMTXWatchdog", daemon=True
+        )
+        self._watchdog.start()
+        return True
+
+    def stop(self) -> None:
+        """Terminate the server, it is not restarted."""
+        self._stopping.set()
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            logger.info("Terminating MediaMTX process")
+            process.terminate()
+            try:
+                process.wait(timeout=5.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if (
+            self._watchdog is not None
+            and self._watchdog is not threading.current_thread()
+        ):
+            self._watchdog.join(timeout=2.0)
+            self._watchdog = None
+        self._set_state(MediaMTXState.STOPPED)
+
+    def _launch(self) -> None:
+        """Start the process and its output reader."""
+        self._ready.clear()
+        self._exited.clear()
+        self._open_listeners.clear()
+        self._log_tail.clear()
+        self._process = subprocess.Popen(
+            ResourceManager.get_mediamtx_args(),
+            env={**os.environ, **self._env},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            # No console window on Windows, the flag does not exist elsewhere
+            creationflags=(
+                subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+            ),
+        )
+        threading.Thread(
+            target=self._read_output,
+            args=(self._process,),
+            name="MediaMTXOutput",
+            daemon=True,
+        ).start()
+
+    def _wait_ready(self, timeout: float) -> bool:
+        """Wait for the listeners, give up early if the process exits."""
+        deadline = time.monotonic() + timeout
+        process = self._process
+        while not self._ready.wait(0.1):
+            if process is None or process.poll() is not None:
+                return False
+            if time.monotonic() > deadline:
+                return False
+        return True
+
+    def _read_output(self, process: subprocess.Popen) -> None:
+        """Drain the server output until it exits."""
+        for line in process.stdout:
+            line = line.rstrip()
+            if not line:
+                continue
+            self._log_tail.append(line)
+            match = _LOG_LINE.match(line)
+            if match is None:
+                logger.info(f"MediaMTX: {line}")
+                continue
+            level, component, message = match.groups()
+            if level == "ERR":
+                logger.error(f"MediaMTX: {line}")
+            elif level == "WAR":
+                logger.warning(f"MediaMTX: {line}")
+            elif message.startswith("listener opened"):
+                logger.info(f"MediaMTX: {line}")
+                if process is self._process:
+                    self._open_listeners.add(component)
+                    if self._open_listeners.issuperset(self.REQUIRED_LISTENERS):
+                        self._ready.set()
+            else:
+                logger.debug(f"MediaMTX: {line}")
+        process.stdout.close()
+        if process is self._process:
+            self._exited.set()
+
+    def _watch(self) -> None:
+        """Restart the server when it exits or stops answering."""
+        delay = self.RESTART_DELAY
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            reason = self._wait_for_failure()
+            if reason is None:
+                return  # Stopped on purpose
+
+            logger.error(f"MediaMTX {reason}, restarting in {delay:.0f}s")
+            self._set_state(MediaMTXState.RESTARTING)
+            if self._on_crash is not None:
+                self._on_crash()
+            with self._lock:
+                if self._process is not None and self._process.poll() is None:
+                    self._process.kill()  # Hung
+                    self._process.wait()
+
+            if time.monotonic() - started >= self.STABLE_UPTIME:
+                delay = self.RESTART_DELAY
+            if self._stopping.wait(delay):
+                return
+            delay = min(delay * 2, self.MAX_RESTART_DELAY)
+
+            with self._lock:
+                if self._stopping.is_set():
+                    return
+                try:
+                    self._launch()
+                except OSError as e:
+                    logger.error(f"Cannot relaunch MediaMTX: {str(e)}")
+                    continue
+            if self._wait_ready(self.START_TIMEOUT):
+                self._set_state(MediaMTXState.READY)
+
+    def _wait_for_failure(self) -> Optional[str]:
+        """
+        Block while the server is healthy.
+
+        Returns:
+            str: Why it failed, None if it was stopped on purpose.
+        """
+        if not self._ready.is_set():
+            return "did not open its listeners"
+        failures = 0
+        while True:
+            exited = self._exited.wait(self.HEALTH_INTERVAL)
+            process = self._process
+            if self._stopping.is_set() or process is None:
+                return None
+            if exited:
+                return f"exited with code {process.wait()}"
+            try:
+                self._client.get("paths/list?itemsPerPage=1")
+                failures = 0
+            except (requests.RequestException, ValueError):
+                failures += 1
+                if failures >= self.HEALTH_FAILURES:
+                    return "is not answering its API"
@@ -0,0 +1,202 @@
+"""
+Stream availability detection.
+MediaMTX runs a command when a path becomes ready (a camera publishes) or
+not ready anymore (runOnReady / runOnNotReady). Those hooks post to a small
+HTTP listener on the loopback interface, so the application knows within
+milliseconds, without polling. The API is still read, through the pooled
+client, to learn the streams published before the hooks were installed and
+as a fallback when MediaMTX was not started by the application (no hooks).
+"""
+
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+import requests
+
+from src.core.logging_config import logger
+from src.core.streaming.mediamtx_api import MediaMTXApiClient
+
+
+class StreamHookServer:
+    """
+    Loopback HTTP listener receiving the MediaMTX path hooks:
+    POST /<token>/ready/<path> and POST /<token>/notready/<path>.
+    The random token keeps other local processes from faking a camera.
+    """
+
+    # Seconds curl waits for the listener: a hook must never hang MediaMTX
+    CURL_TIMEOUT = 2
+
+    def __init__(self, on_change: Callable[[str, bool], None]):
+        """
+        Args:
+            on_change: Called with (path name, ready) from the listener thread.
+        """
+        self._on_change = on_change
+        self._token = secrets.token_urlsafe(16)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Listen on an ephemeral loopback port."""
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="StreamHookServer", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Stream hook listener on port {self.port}")
+
+    def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def mediamtx_environment(self) -> Dict[str, str]:
+        """
+        Environment overriding the path hooks of mediamtx.yml for every path.
+        MediaMTX replaces $MTX_PATH itself, no shell is involved.
+        """
+        url = f"http://127.0.0.1:{self.port}/{self._token}"
+        command = f"curl -s -m {self.CURL_TIMEOUT} -X POST {url}"
+        return {
+            "MTX_PATHDEFAULTS_RUNONREADY": f"{command}/ready/$MTX_PATH",
+            "MTX_PATHDEFAULTS_RUNONNOTREADY": f"{command}/notready/$MTX_PATH",
+        }
+
+    def _handler_class(self):
+        token = self._token
+        on_change = self._on_change
+
+        class HookHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                parts = self.path.strip("/").split("/", 2)
+                if (
+                    len(parts) != 3
+                    or parts[0] != token
+                    or parts[1] not in ("ready", "notready")
+                ):
+                    self.send_error(404)
+                    return
+                on_change(parts[2], parts[1] == "ready")
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass  # One request per camera event, nothing worth logging
+
+        return HookHandler
+
+
+class StreamAvailabilityMonitor(threading.Thread):
+    """
+    Thread tracking which paths are ready, from the hooks and the API.
+    Calls on_available when the first path becomes ready and on_unavailable
+    when the last one goes away.
+    With hooks, the API is only read at start and every SAFETY_INTERVAL;
+    without, every POLL_INTERVAL. API errors are retried with exponential
+    backoff, the monitor never gives up while the server runs.
+    """
+
+    POLL_INTERVAL = 1.0
+    SAFETY_INTERVAL = 30.0
+    MAX_BACKOFF = 10.0
+
+    def __init__(
+        self,
+        on_available: Callable[[], None],
+        on_unavailable: Callable[[], None],
+        with_hooks: bool,
+        client: Optional[MediaMTXApiClient] = None,
+    ):
+        super().__init__(daemon=True)
+        self._on_available = on_available
+        self._on_unavailable = on_unavailable
+        self._with_hooks = with_hooks
+        self._client = client or MediaMTXApiClient.shared()
+        self._ready_paths = set()
+        # Monotonic time of the last hook of each path
+        self._hook_times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop the thread."""
+        self._stopped.set()
+
+    @property
+    def ready_paths(self) -> set:
+        with self._lock:
+            return set(self._ready_paths)
+
+    def notify(self, path: str, ready: bool) -> None:
+        """Hook callback: a path became ready or not ready."""
+        logger.info(f"Stream {path} {'ready' if ready else 'not ready'}")
+        with self._lock:
+            self._hook_times[path] = time.monotonic()
+            was_streaming = bool(self._ready_paths)
+            if ready:
+                self._ready_paths.add(path)
+            else:
+                self._ready_paths.discard(path)
+            self._publish(was_streaming)
+
+    def reset(self) -> None:
+        """The server went down: no path is ready anymore."""
+        with self._lock:
+            was_streaming = bool(self._ready_paths)
+            self._ready_paths.clear()
+            self._hook_times.clear()
+            self._publish(was_streaming)
+
+    def _sync(self, paths: set, requested: float) -> None:
+        """
+        Replace the ready paths with the ones the API reports, except the
+        paths a hook reported on after the request was sent.
+        """
+        with self._lock:
+            was_streaming = bool(self._ready_paths)
+            recent = {
+                path
+                for path, hook_time in self._hook_times.items()
+                if hook_time >= requested
+            }
+            self._ready_paths = (set(paths) - recent) | (self._ready_paths & recent)
+            self._publish(was_streaming)
+
+    def _publish(self, was_streaming: bool) -> None:
+        is_streaming = bool(self._ready_paths)
+        if is_streaming and not was_streaming:
+            logger.info("RTMP stream is available")
+            self._on_available()
+        elif was_streaming and not is_streaming:
+            logger.info("RTMP stream is no longer available")
+            self._on_unavailable()
+
+    def run(self):
+        interval = self.SAFETY_INTERVAL if self._with_hooks else self.POLL_INTERVAL
+        delay = 0.0  # First read right away
+        backoff = self.POLL_INTERVAL
+        while not self._stopped.wait(delay):
+            requested = time.monotonic()
+            try:
+                self._sync(set(self._client.ready_paths()), requested)
+                delay = interval
+                backoff = self.POLL_INTERVAL
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(
+                    f"Cannot read MediaMTX paths, retrying in {backoff:.1f}s: {e}"
+                )
+                delay = backoff
+                backoff = min(backoff * 2, self.MAX_BACKOFF)
@@ -0,0 +1,276 @@
+import threading
+from typing import Dict, List, Optional
+
+import av
+from PySide6.QtCore import QObject
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.video_processing.frame_queue import FrameQueue
+from src.core.video_processing.packet_buffer import PacketRingBuffer
+from src.utils.resource_manager import ResourceManager
+
+
+class StreamIngestThread(threading.Thread):
+    """
+    Thread reading one camera stream once and fanning its compressed packets
+    out to subscribers (recorder, in-app renderer, analysis taps).
+    Every subscriber owns a FrameQueue with its own size and drop policy, so
+    a slow consumer never stalls the others, and all of them see the same
+    packets with the same timestamps.
+    The most recent packets are kept in a pre-roll ring buffer.
+    Keep-alive subscribers (the recorder) keep the thread reconnecting when
+    it is asked to stop_when_idle because the camera went offline: a camera
+    drop-out becomes a gap in the recording instead of ending it.
+    """
+
+    # (open timeout, read timeout) in seconds
+    TIMEOUT = (10.0, 5.0)
+    # Seconds before reopening a lost stream, doubled on each failure
+    RECONNECT_DELAY = 0.5
+    MAX_RECONNECT_DELAY = 10.0
+
+    def __init__(
+        self,
+        stream_path: str,
+        input_url: str,
+        pre_roll_seconds: float = 10.0,
+        pre_roll_bytes: int = 32 * 1024 * 1024,
+    ):
+        super().__init__(daemon=True)
+        self.stream_path = stream_path
+        self._input_url = input_url
+        self._is_running = True
+        self._stopped = threading.Event()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._buffer = PacketRingBuffer(pre_roll_seconds, pre_roll_bytes)
+        self._subscribers: List[FrameQueue] = []
+        self._keep_alive: List[FrameQueue] = []
+        self._stop_when_idle = False
+        self._streams = []
+
+    @property
+    def is_ready(self) -> bool:
+        """True while the stream is open and being demuxed."""
+        return self._ready.is_set()
+
+    @property
+    def streams(self) -> list:
+        """Audio and video streams of the input."""
+        return self._streams
+
+    @property
+    def video_stream(self):
+        """Video stream of the input, None until the stream is open."""
+        return next((s for s in self._streams if s.type == "video"), None)
+
+    def stop(self):
+        """Stop the thread."""
+        self._is_running = False
+        self._stopped.set()
+
+    def stop_when_idle(self):
+        """
+        Stop now if no keep-alive subscriber is attached, else once the last
+        one unsubscribes. Until then, the lost stream keeps being reopened.
+        """
+        with self._lock:
+            self._stop_when_idle = True
+            idle = not self._keep_alive
+        if idle:
+            self.stop()
+
+    def resume(self) -> bool:
+        """
+        Cancel stop_when_idle.
+
+        Returns:
+            bool: False if the thread is already stopping.
+        """
+        with self._lock:
+            self._stop_when_idle = False
+            return self._is_running
+
+    def subscribe(
+        self, queue: FrameQueue, with_pre_roll: bool = False, keep_alive: bool = False
+    ) -> float:
+        """
+        Forward the stream packets to a queue.
+
+        Args:
+            queue: Queue receiving the packets. It is closed when the ingest
+                is stopped; reconnections are seen as packets of a new container.
+            with_pre_roll: Push the pre-roll packets first. The queue then
+                grows by the pre-roll size so it never pushes out live packets.
+            keep_alive: Keep the ingest reconnecting while subscribed, even
+                when asked to stop_when_idle.
+
+        Returns:
+            float: Duration of the pushed pre-roll in seconds.
+        """
+        with self._lock:
+            pre_roll = self._buffer.snapshot() if with_pre_roll else []
+            queue.maxsize += len(pre_roll)
+            for packet in pre_roll:
+                queue.put(packet)
+            self._subscribers.append(queue)
+            if keep_alive:
+                self._keep_alive.append(queue)
+        if len(pre_roll) < 2:
+            return 0.0
+        return float(
+            pre_roll[-1].dts * pre_roll[-1].time_base
+            - pre_roll[0].dts * pre_roll[0].time_base
+        )
+
+    def unsubscribe(self, queue: FrameQueue) -> None:
+        """Stop forwarding packets to a queue."""
+        with self._lock:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+            if queue in self._keep_alive:
+                self._keep_alive.remove(queue)
+            idle = self._stop_when_idle and not self._keep_alive
+        if idle:
+            self.stop()
+
+    def run(self):
+        """
+        Demux the stream until stopped. A lost stream is reopened with
+        exponential backoff; subscribers keep their queues and receive the
+        packets of the new connection (from a new container).
+        """
+        delay = self.RECONNECT_DELAY
+        try:
+            while self._is_running:
+                if self._demux():
+                    delay = self.RECONNECT_DELAY
+                if not self._is_running:
+                    break
+                logger.warning(f"Stream ingest lost, reconnecting in {delay:.1f}s")
+                self._stopped.wait(delay)
+                delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+        finally:
+            with self._lock:
+                # Subscribers finish consuming what they received
+                for queue in self._subscribers:
+                    queue.close()
+                self._subscribers.clear()
+                self._keep_alive.clear()
+                self._buffer.clear()
+            logger.info(f"Stream ingest closed: {self._input_url}")
+            events.stream_ingest_closed.emit(self.stream_path)
+
+    def _demux(self) -> bool:
+        """
+        Open the stream and forward its packets until it ends or is stopped.
+
+        Returns:
+            bool: True if the stream could be opened.
+        """
+        container = None
+        try:
+            container = av.open(self._input_url, timeout=self.TIMEOUT)
+            self._streams = [
+                stream
+                for stream in container.streams
+                if stream.type in ("video", "audio")
+            ]
+            self._ready.set()
+            logger.info(f"Stream ingest opened: {self._input_url}")
+            events.stream_ingest_ready.emit(self.stream_path)
+
+            for packet in container.demux(*self._streams):
+                if not self._is_running:
+                    break
+                # Flush packets carry no data
+                if packet.dts is None:
+                    continue
+                with self._lock:
+                    self._buffer.append(packet)
+                    for queue in self._subscribers:
+                        queue.put(packet)
+        except Exception as e:
+            logger.error(f"Stream ingest error: {str(e)}")
+        finally:
+            self._ready.clear()
+            with self._lock:
+                # The timestamps of the next connection start over
+                self._buffer.clear()
+            # Not closed explicitly: queued packets still reference its
+            # streams, the container is released with the last of them
+            opened = container is not None
+            container = None
+        return opened
+
+
+class StreamIngestService(QObject):
+    """
+    Service owning one StreamIngestThread per camera stream path.
+    Ingests of all the camera paths run while streaming is active; consumers
+    get them with get_ingest. When streaming stops (a camera went offline),
+    ingests feeding a recording keep reconnecting until the recording ends,
+    and are reused when streaming starts again.
+    """
+
+    DEFAULT_PRE_ROLL_SECONDS = 10.0  # 0 to disable the pre-roll
+    DEFAULT_PRE_ROLL_MB = 32
+
+    def __init__(
+        self,
+        pre_roll_seconds: float = DEFAULT_PRE_ROLL_SECONDS,
+        pre_roll_mb: float = DEFAULT_PRE_ROLL_MB,
+        stream_paths: Optional[List[str]] = None,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self._stream_paths = list(stream_paths or ResourceManager.STREAMING_PATHS)
+        self._pre_roll_seconds = pre_roll_seconds
+        self._pre_roll_bytes = int(pre_roll_mb * 1024 * 1024)
+        self._ingests: Dict[str, StreamIngestThread] = {}
+
+        events.streaming_started.connect(self.start_all)
+        events.streaming_stopped.connect(self._on_streaming_stopped)
+
+    def start_all(self):
+        """Start reading every camera stream path."""
+        for stream_path in self._stream_paths:
+            self.start_ingest(stream_path)
+
+    def start_ingest(self, stream_path: str = ResourceManager.STREAMING_PATH):
+        """Start reading a stream path, unless a running ingest still reads it."""
+        ingest = self._ingests.get(stream_path)
+        if ingest is not None and ingest.is_alive() and ingest.resume():
+            return
+        self.stop_ingest(stream_path)
+        ingest = StreamIngestThread(
+            stream_path,
+            ResourceManager.get_gopro_rtmp_url(stream_path),
+            self._pre_roll_seconds,
+            self._pre_roll_bytes,
+        )
+        self._ingests[stream_path] = ingest
+        ingest.start()
+
+    def stop_ingest(self, stream_path: str = ResourceManager.STREAMING_PATH):
+        """Stop reading a stream path."""
+        ingest = self._ingests.pop(stream_path, None)
+        if ingest is not None:
+            ingest.stop()
+
+    def get_ingest(
+        self, stream_path: str = ResourceManager.STREAMING_PATH
+    ) -> Optional[StreamIngestThread]:
+        """Get the ingest of a stream path, None if it is not running."""
+        return self._ingests.get(stream_path)
+
+    def _on_streaming_stopped(self):
+        """Stop the ingests, once the recordings they feed are stopped."""
+        for ingest in self._ingests.values():
+            ingest.stop_when_idle()
+
+    def cleanup(self):
+        """Stop all ingests."""
+        for stream_path in list(self._ingests):
+            self.stop_ingest(stream_path)
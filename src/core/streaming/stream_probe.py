@@ -0,0 +1,67 @@
+"""
+Live stream readiness probe.
+A path is playable once MediaMTX reports it ready with its tracks: the
+publisher has announced its codecs, so a reader gets them on connection.
+The probe polls the API on a worker thread, through the pooled client, and
+publishes live_stream_ready, so the live view starts playing as soon as
+there is something to show, without blocking the GUI. It opens no stream
+of its own: the camera connection stays with the live view and the ingest.
+"""
+
+import threading
+import time
+
+import requests
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.streaming.mediamtx_api import MediaMTXApiClient
+
+
+class StreamReadinessProbe(threading.Thread):
+    """
+    Thread waiting until a stream path is ready with tracks.
+    live_stream_ready is published then, or after TIMEOUT anyway (the player
+    then waits for the stream itself); nothing is published if the probe
+    is stopped.
+    """
+
+    TIMEOUT = 10.0
+    # Seconds between two API reads while the path has no tracks
+    API_INTERVAL = 0.1
+
+    def __init__(self, stream_path: str, client=None):
+        super().__init__(daemon=True)
+        self.stream_path = stream_path
+        self._client = client or MediaMTXApiClient.shared()
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop the thread, live_stream_ready is not published."""
+        self._stopped.set()
+
+    def run(self):
+        start = time.monotonic()
+        if self._wait_for_tracks(start + self.TIMEOUT):
+            logger.info(
+                f"Stream {self.stream_path} ready after "
+                f"{(time.monotonic() - start) * 1000:.0f} ms"
+            )
+        elif not self._stopped.is_set():
+            logger.warning(f"Stream {self.stream_path} not confirmed ready")
+        if not self._stopped.is_set():
+            events.live_stream_ready.emit(self.stream_path)
+
+    def _wait_for_tracks(self, deadline: float) -> bool:
+        """Wait until MediaMTX reports the path ready with tracks."""
+        while not self._stopped.is_set() and time.monotonic() < deadline:
+            try:
+                path = self._client.get(f"paths/get/{self.stream_path}")
+                if path.get("ready") and path.get("tracks"):
+                    return True
+            except requests.HTTPError:
+                pass  # 404 until the publisher connects
+            except (requests.RequestException, ValueError):
+                return False  # No API: the player waits for the stream
+            self._stopped.wait(self.API_INTERVAL)
+        return False
@@ -0,0 +1,165 @@
+"""
+Live stream telemetry.
+A collector samples the MediaMTX API every few seconds through the pooled
+client and turns the byte counters of each path into an ingest bitrate, a
+bitrate variation and a reader count. The API only exposes byte counters,
+so the variation is the smoothed change of the bitrate between samples,
+not the packet jitter of the stream.
+The bitrate itself is no health signal: it falls a lot on a static scene.
+A camera losing its Wi-Fi link stops delivering bytes seconds before
+MediaMTX drops the path, so a warning is published when a ready path
+receives nothing for a few samples, or when the app's readers of the path
+are gone while it stays ready.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.streaming.mediamtx_api import MediaMTXApiClient
+
+
+class _PathTelemetry:
+    """Byte counter history of one path."""
+
+    def __init__(self):
+        self.bytes_received = None
+        self.sample_time = None
+        self.bitrate = 0.0
+        self.bitrate_variation = 0.0
+        # Samples in a row without a received byte
+        self.stalled_samples = 0
+        self.readers = 0
+        self.readers_lost = False
+        self.warning = None
+
+    def update(self, bytes_received: int, now: float) -> None:
+        if self.bytes_received is not None and now > self.sample_time:
+            if bytes_received == self.bytes_received:
+                self.stalled_samples += 1
+            else:
+                self.stalled_samples = 0
+            if bytes_received >= self.bytes_received:
+                bitrate = (
+                    (bytes_received - self.bytes_received)
+                    * 8
+                    / (now - self.sample_time)
+                )
+                self.bitrate_variation += (
+                    abs(bitrate - self.bitrate) - self.bitrate_variation
+                ) / 16
+                self.bitrate = bitrate
+            # Else the counter was reset: the publisher reconnected
+        self.bytes_received = bytes_received
+        self.sample_time = now
+
+
+class StreamTelemetryCollector(threading.Thread):
+    """
+    Thread sampling the MediaMTX paths every SAMPLE_INTERVAL seconds.
+    Publishes stream_telemetry_updated with, for each path: ready,
+    bitrate and bitrate_variation (bit/s), readers and bytes_received.
+    Publishes stream_health_warning when a ready path stalls (no byte for
+    STALL_SAMPLES samples in a row) or loses all its readers, and once more
+    with an empty message when it is healthy again.
+    """
+
+    SAMPLE_INTERVAL = 2.0
+    STALL_SAMPLES = 2
+    # Seconds between two warnings for the same path
+    WARNING_REPEAT = 60.0
+
+    def __init__(self, client: Optional[MediaMTXApiClient] = None):
+        super().__init__(daemon=True)
+        self._client = client or MediaMTXApiClient.shared()
+        self._paths: Dict[str, _PathTelemetry] = {}
+        self._last_warnings: Dict[str, float] = {}
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop the thread."""
+        self._stopped.set()
+
+    def run(self):
+        while not self._stopped.wait(self.SAMPLE_INTERVAL):
+            try:
+                paths = self._client.list_items("paths/list")
+            except (requests.RequestException, ValueError) as e:
+                logger.debug(f"Cannot read stream telemetry: {e}")
+                continue
+            events.stream_telemetry_updated.emit(self._sample(paths))
+
+    def _sample(self, paths: list) -> dict:
+        """Update the history with an API sample and return the telemetry."""
+        now = time.monotonic()
+        telemetry = {}
+        names = set()
+        for path in paths:
+            name = path["name"]
+            names.add(name)
+            history = self._paths.get(name)
+            ready = bool(path.get("ready"))
+            readers = len(path.get("readers") or [])
+            if ready:
+                if history is None:
+                    self._paths[name] = history = _PathTelemetry()
+                history.update(path.get("bytesReceived", 0), now)
+                self._check_health(name, history, readers)
+            elif history is not None:
+                # The path is gone: MediaMTX and the stream monitor report it
+                self._set_warning(name, history, None)
+                del self._paths[name]
+                history = None
+            telemetry[name] = {
+                "ready": ready,
+                "bitrate": history.bitrate if history else 0.0,
+                "bitrate_variation": history.bitrate_variation if history else 0.0,
+                "readers": readers,
+                "bytes_received": path.get("bytesReceived", 0),
+            }
+        for name in set(self._paths) - names:
+            self._set_warning(name, self._paths.pop(name), None)
+        return telemetry
+
+    def _check_health(self, name: str, history: _PathTelemetry, readers: int) -> None:
+        if readers:
+            history.readers_lost = False
+        elif history.readers:
+            history.readers_lost = True
+        history.readers = readers
+
+        warning = None
+        if history.stalled_samples >= self.STALL_SAMPLES:
+            stalled = history.stalled_samples * self.SAMPLE_INTERVAL
+            warning = (
+                f"Stream {name}: nothing received for {stalled:.0f} s, "
+                "the camera may be about to drop out"
+            )
+        elif history.readers_lost:
+            warning = f"Stream {name}: the live view and ingest lost the stream"
+        self._set_warning(name, history, warning)
+
+    def _set_warning(
+        self, name: str, history: _PathTelemetry, warning: Optional[str]
+    ) -> None:
+        """
+        Publish the health of a path when it changes: a warning at most once
+        per WARNING_REPEAT, an empty message once healthy again.
+        """
+        if warning == history.warning:
+            return
+        now = time.monotonic()
+        if warning is not None:
+            last = self._last_warnings.get(name)
+            if last is not None and now - last < self.WARNING_REPEAT:
+                return
+            self._last_warnings[name] = now
+            logger.warning(warning)
+        elif history.warning is not None:
+            logger.info(f"Stream {name}: healthy again")
+        history.warning = warning
+        events.stream_health_warning.emit(name, warning or "")
@@ -1,68 +1,38 @@
-import requests
-import subprocess
 import socket
-import time
-import threading
 from typing import Optional
 
 from PySide6.QtCore import QObject
 
 from src.core.event_handler import events
 from src.core.logging_config import logger
+from src.core.streaming.mediamtx_supervisor import MediaMTXSupervisor
+from src.core.streaming.stream_availability import (
+    StreamAvailabilityMonitor,
+    StreamHookServer,
+)
+from src.core.streaming.stream_telemetry import StreamTelemetryCollector
 from src.utils.resource_manager import ResourceManager
 
 
-class StreamWaiterThread(threading.Thread):
-    """Thread to wait for stream availability without blocking UI."""
-
-    def __init__(self, parent=None):
-        super().__init__(daemon=True)
-        self._is_running = True
-        self._was_streaming = False
-        self._parent = parent
-
-    def stop(self):
-        """Stop the thread."""
-        self._is_running = False
-
-    def run(self):
-        """Wait for stream to be available."""
-        while self._is_running:
-            try:
-                response = requests.get("http://localhost:9997/v3/rtmpconns/list")
-                if response.status_code == 200:
-                    data = response.json()
-                    # Check if there are any active RTMP connections
-                    has_stream = data.get("itemCount", 0) > 0
-
-                    if has_stream and not self._was_streaming:
-                        logger.info("RTMP stream is available")
-                        self._was_streaming = True
-                        events.streaming_started.emit()
-                    elif not has_stream and self._was_streaming:
-                        logger.info("RTMP stream is no longer available")
-                        self._was_streaming = False
-                        events.streaming_stopped.emit()
-                else:
-                    logger.warning(f"API returned status code {response.status_code}")
-            except Exception as e:
-                logger.error(f"Error checking stream: {str(e)}")
-                events.streaming_error.emit(f"Error checking stream: {str(e)}")
-                return
-            time.sleep(0.5)  # Reduce check interval
-
-
 class StreamingService(QObject):
     """
     Service managing RTMP streaming with MediaMTX.
     Handles server lifecycle and stream availability monitoring.
+    The server it launches is supervised (restarted when it crashes) and
+    pushes availability through its path hooks; a server already running
+    is watched through its API.
+    While the server runs, a telemetry collector publishes the ingest
+    bitrate, bitrate variation and readers of each path, and warns when
+    a stream stalls.
     """
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.mediamtx_process: Optional[subprocess.Popen] = None
+        self.supervisor = MediaMTXSupervisor(on_crash=self._on_server_crash)
         self.is_streaming = False
-        self.stream_waiter: Optional[StreamWaiterThread] = None
+        self.stream_monitor: Optional[StreamAvailabilityMonitor] = None
+        self.telemetry: Optional[StreamTelemetryCollector] = None
+        self._hook_server = StreamHookServer(self._on_stream_hook)
 
     def _is_server_running(self) -> bool:
         """Check if MediaMTX server is running and responding."""
@@ -76,31 +46,38 @@ class StreamingService(QObject):
         except Exception:
             return False
 
-    def _wait_for_server(self, timeout: int = 5) -> bool:  # Reduce default timeout
-        """Wait for server to be ready with timeout."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            logger.info("Waiting for server to be ready")
-            if self._is_server_running():
-                logger.info("Server is now ready")
-                return True
-            time.sleep(0.5)  # Increase interval to reduce load
-        logger.error("Server failed to start within timeout period")
-        return False
-
-    def _start_waiting_for_stream(self):
+    def _start_waiting_for_stream(self, with_hooks: bool):
         """
-        Start waiting for stream in a separate thread.
+        Start monitoring stream availability in a separate thread.
         Used to wait for a stream to be available without blocking the UI thread.
-        """
-        if self.stream_waiter is not None:
-            self.stream_waiter.stop()
-            if self.stream_waiter.is_alive():
-                self.stream_waiter.join(timeout=2.0)
-            self.stream_waiter = None
 
-        self.stream_waiter = StreamWaiterThread(self)
-        self.stream_waiter.start()
+        Args:
+            with_hooks: The server reports its paths through the hook
+                listener, the API is only read as a safety net.
+        """
+        self._stop_waiting_for_stream()
+        self.stream_monitor = StreamAvailabilityMonitor(
+            self._on_stream_available, self._on_stream_stopped, with_hooks
+        )
+        self.stream_monitor.start()
+        self.telemetry = StreamTelemetryCollector()
+        self.telemetry.start()
+
+    def _stop_waiting_for_stream(self):
+        if self.stream_monitor is not None:
+            self.stream_monitor.stop()
+            if self.stream_monitor.is_alive():
+                self.stream_monitor.join(timeout=2.0)
+            self.stream_monitor = None
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            self.telemetry = None
+
+    def _on_stream_hook(self, path: str, ready: bool):
+        """Hook listener callback, from its thread."""
+        monitor = self.stream_monitor
+        if monitor is not None:
+            monitor.notify(path, ready)
 
     def _on_stream_available(self):
         """Handle stream becoming available."""
@@ -112,6 +89,11 @@ class StreamingService(QObject):
         self.is_streaming = False
         events.streaming_stopped.emit()
 
+    def _on_server_crash(self):
+        """The supervised server went down, the streams went with it."""
+        if self.stream_monitor is not None:
+            self.stream_monitor.reset()
+
     def _on_stream_error(self, error: str):
         """Handle stream error."""
         logger.error(f"Stream error: {error}")
@@ -122,7 +104,7 @@ class StreamingService(QObject):
     def start_mediamtx(self) -> bool:
         """Start the MediaMTX server."""
         try:
-            if self.mediamtx_process is not None:
+            if self.supervisor.is_running:
                 logger.info("MediaMTX process already running, skipping start")
                 return True
 
@@ -130,32 +112,19 @@ class StreamingService(QObject):
             # Check if process is already running
             if self._is_server_running():
                 logger.info("MediaMTX server is already running on port 1935")
-                self._start_waiting_for_stream()
+                self._start_waiting_for_stream(with_hooks=False)
                 return True
 
             logger.info("Launching MediaMTX")
-            self.mediamtx_process = subprocess.Popen(
-                ResourceManager.get_mediamtx_args(),
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-
-            # Wait for server to be ready
-            if not self._wait_for_server():
-                logger.error("MediaMTX server failed to start within timeout")
-                if self.mediamtx_process:
-                    stdout, stderr = self.mediamtx_process.communicate()
-                    logger.error(f"MediaMTX stdout: {stdout.decode()}")
-                    logger.error(f"MediaMTX stderr: {stderr.decode()}")
-                self.stop_mediamtx()
-                events.streaming_error.emit(
-                    "MediaMTX server failed to start within timeout"
-                )
+            self._hook_server.start()
+            # Returns as soon as the server logs its listeners as open
+            if not self.supervisor.start(self._hook_server.mediamtx_environment()):
+                self._hook_server.stop()
+                events.streaming_error.emit("MediaMTX server failed to start")
                 return False
 
             # Start waiting for stream in background
-            self._start_waiting_for_stream()
+            self._start_waiting_for_stream(with_hooks=True)
             return True
         except Exception as e:
             logger.error(f"Error starting MediaMTX: {str(e)}")
@@ -165,17 +134,11 @@ class StreamingService(QObject):
     def stop_mediamtx(self) -> bool:
         """Stop the MediaMTX server."""
         try:
-            if self.stream_waiter is not None:
-                self.stream_waiter.stop()
-                if self.stream_waiter.is_alive():
-                    self.stream_waiter.join(timeout=2.0)
-                self.stream_waiter = None
-
-            if self.mediamtx_process is not None:
-                logger.info("Terminating MediaMTX process")
-                self.mediamtx_process.terminate()
-                self.mediamtx_process.wait()
-                self.mediamtx_process = None
+            self._stop_waiting_for_stream()
+            self._hook_server.stop()
+
+            if self.supervisor.is_running:
+                self.supervisor.stop()
                 self.is_streaming = False
                 events.streaming_stopped.emit()
                 return True
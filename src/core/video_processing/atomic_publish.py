@@ -0,0 +1,43 @@
+"""
+Atomic publication of written files.
+Files are written under a partial name and published atomically under their
+final name, so readers never open a half-written file.
+"""
+
+import os
+import time
+from pathlib import Path
+
+PARTIAL_SUFFIX = ".part"
+
+
+def partial_path(path: Path) -> Path:
+    """
+    Path a file is written to before being published as path.
+    The extension is kept: writers pick the container format from it.
+    """
+    path = Path(path)
+    return path.with_name(path.stem + PARTIAL_SUFFIX + path.suffix)
+
+
+def is_partial(path: Path) -> bool:
+    """True for a file still being written (or left by a crash)."""
+    return Path(path).stem.endswith(PARTIAL_SUFFIX)
+
+
+def publish(partial: Path, path: Path, retries: int = 10) -> None:
+    """
+    Atomically replace path with partial.
+    On Windows, replacing a file a player holds open fails: retry a while.
+
+    Raises:
+        OSError: If the file cannot be replaced.
+    """
+    for attempt in range(retries):
+        try:
+            os.replace(partial, path)
+            return
+        except PermissionError:
+            if attempt == retries - 1:
+                raise
+            time.sleep(0.5)
@@ -0,0 +1,406 @@
+"""
+Disk side of the recorder: write-behind output file and disk monitor.
+The muxer writes into a WriteBehindFile, which hands large aligned chunks to
+a background thread, so a slow disk never stalls the writer stage directly.
+A DiskMonitor watches throughput and free space and warns before the disk
+becomes the reason frames are lost or a file is truncated.
+"""
+
+import os
+import shutil
+import threading
+import time
+import weakref
+from collections import deque
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+
+
+class WriteBehindFile:
+    """
+    Write-only binary file object with write-behind buffering.
+    Writes are accumulated and submitted to a writer thread in chunks
+    aligned on CHUNK_SIZE; the file is fsynced every fsync_interval seconds.
+    Seeks (the MP4 muxer patches its headers) flush the current chunk first,
+    chunks are written in submission order.
+    A write error (disk full...) is raised by the next call.
+    """
+
+    CHUNK_SIZE = 4 * 1024 * 1024
+    # Backlog beyond which writes block until the disk catches up
+    MAX_PENDING = 64 * 1024 * 1024
+
+    def __init__(
+        self,
+        path: Path,
+        fsync_interval: float = 5.0,
+        monitor: Optional["DiskMonitor"] = None,
+    ):
+        """
+        Args:
+            path: File to create (truncated if it exists).
+            fsync_interval: Seconds between two fsyncs, 0 to fsync only at close.
+            monitor: Disk monitor receiving the write timings.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(path, flags, 0o644)
+        self._fsync_interval = fsync_interval
+        self._monitor = monitor
+        self._buffer = bytearray()
+        self._buffer_offset = 0
+        self._position = 0
+        self._pending = deque()
+        self._pending_bytes = 0
+        self._condition = threading.Condition()
+        self._closing = False
+        self._error: Optional[OSError] = None
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return False
+
+    def write(self, data) -> int:
+        self._raise_error()
+        if self._position != self._buffer_offset + len(self._buffer):
+            self._submit_buffer()
+            self._buffer_offset = self._position
+        self._buffer += data
+        size = len(data)
+        self._position += size
+
+        # Submit every full chunk, the first one ending on an aligned offset
+        boundary = self.CHUNK_SIZE - self._buffer_offset % self.CHUNK_SIZE
+        while len(self._buffer) >= boundary:
+            chunk = bytes(self._buffer[:boundary])
+            del self._buffer[:boundary]
+            self._submit(self._buffer_offset, chunk)
+            self._buffer_offset += boundary
+            boundary = self.CHUNK_SIZE
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size()
+        self._position = offset
+        return offset
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        """Hand the buffered data to the writer thread (does not wait)."""
+        self._raise_error()
+        self._submit_buffer()
+
+    def close(self) -> None:
+        """Write everything, fsync and close. Raises the pending write error."""
+        if self._fd is None:
+            return
+        self._submit_buffer()
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self._thread.join()
+        try:
+            if self._error is None:
+                os.fsync(self._fd)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        self._raise_error()
+
+    @property
+    def backlog(self) -> int:
+        """Bytes accepted but not yet written to disk."""
+        return self._pending_bytes + len(self._buffer)
+
+    def _size(self) -> int:
+        """Logical file size, including data not yet written."""
+        with self._condition:
+            ends = [offset + len(data) for offset, data in self._pending]
+        ends.append(self._buffer_offset + len(self._buffer))
+        return max(max(ends), os.fstat(self._fd).st_size)
+
+    def _submit_buffer(self) -> None:
+        if self._buffer:
+            self._submit(self._buffer_offset, bytes(self._buffer))
+            self._buffer_offset += len(self._buffer)
+            self._buffer.clear()
+
+    def _submit(self, offset: int, data: bytes) -> None:
+        with self._condition:
+            if self._pending_bytes > self.MAX_PENDING:
+                stall_start = time.monotonic()
+                while self._pending_bytes > self.MAX_PENDING and self._error is None:
+                    self._condition.wait()
+                if self._monitor is not None:
+                    self._monitor.record_stall(time.monotonic() - stall_start)
+            self._pending.append((offset, data))
+            self._pending_bytes += len(data)
+            self._condition.notify_all()
+        if self._monitor is not None:
+            self._monitor.set_backlog(self.backlog)
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _write_loop(self) -> None:
+        last_fsync = time.monotonic()
+        while True:
+            with self._condition:
+                while not self._pending and not self._closing:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                offset, data = self._pending[0]
+
+            start = time.monotonic()
+            try:
+                os.lseek(self._fd, offset, os.SEEK_SET)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(self._fd, view) :]
+                if self._fsync_interval and start - last_fsync >= self._fsync_interval:
+                    os.fsync(self._fd)
+                    last_fsync = time.monotonic()
+            except OSError as e:
+                logger.error(f"Write-behind error: {str(e)}")
+                with self._condition:
+                    self._error = e
+                    self._pending.clear()
+                    self._pending_bytes = 0
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._pending.popleft()
+                self._pending_bytes -= len(data)
+                self._condition.notify_all()
+            if self._monitor is not None:
+                self._monitor.record_write(len(data), time.monotonic() - start)
+                self._monitor.set_backlog(self.backlog)
+
+
+class DiskMonitor(threading.Thread):
+    """
+    Thread watching the recording disk: free space, recording data rate and
+    sustained write throughput. Publishes recording_disk_warning when space
+    runs low or the disk cannot keep up, on state changes only: a message
+    when a condition starts, the remaining one or an empty message when it
+    ends. Calls on_critical once when space is about to run out so the
+    recording can be closed cleanly.
+    Cameras recorded together share the disk: the remaining recording time
+    is computed from the data rate of all the monitors of the directory.
+    A segmented recording is copied into its final file when it stops: the
+    space that copy needs is reserved, so recording stops while the stitch
+    still fits.
+    """
+
+    CHECK_INTERVAL = 2.0
+    # Warn when the free space holds less than this much recording time
+    WARNING_SECONDS = 10 * 60
+    # Stop the recording below this free space
+    CRITICAL_BYTES = 256 * 1024 * 1024
+    # Checks without a slow write before the slow disk warning ends
+    SLOW_CLEAR_CHECKS = 5
+
+    # Monitors running in this process
+    _running = weakref.WeakSet()
+
+    def __init__(
+        self,
+        directory: Path,
+        bytes_written: Callable[[], int],
+        on_critical: Optional[Callable[[], None]] = None,
+        reserved_bytes: Optional[Callable[[], int]] = None,
+    ):
+        """
+        Args:
+            directory: Directory the recording is written to.
+            bytes_written: Returns the bytes of the recording on disk so far.
+            on_critical: Called once when free space gets critical.
+            reserved_bytes: Returns the free space the recording still needs
+                once stopped (stitch copy of its fragments), 0 if None.
+        """
+        super().__init__(daemon=True)
+        self._directory = Path(directory)
+        self._bytes_written = bytes_written
+        self._on_critical = on_critical
+        self._reserved_bytes = reserved_bytes
+        self._is_running = True
+        self._lock = threading.Lock()
+        self._write_bytes = 0
+        self._write_seconds = 0.0
+        self._stall_seconds = 0.0
+        self._backlog = 0
+        self._free_bytes = None
+        self._data_rate = 0.0
+        self._critical = False
+        # Kind of the conditions in progress -> message
+        self._warnings = {}
+
+    def record_write(self, size: int, seconds: float) -> None:
+        """Account a chunk written to disk and the time it took."""
+        with self._lock:
+            self._write_bytes += size
+            self._write_seconds += seconds
+
+    def record_stall(self, seconds: float) -> None:
+        """Account time the writer was blocked by a full write-behind backlog."""
+        with self._lock:
+            self._stall_seconds += seconds
+
+    def set_backlog(self, size: int) -> None:
+        self._backlog = size
+
+    def stop(self) -> None:
+        self._is_running = False
+
+    def get_stats(self) -> dict:
+        """
+        Returns:
+            dict: disk_free (bytes), data_rate and write_throughput
+            (bytes/s), write_backlog (bytes), write_stall (seconds).
+        """
+        with self._lock:
+            throughput = (
+                self._write_bytes / self._write_seconds if self._write_seconds else 0.0
+            )
+            stall = self._stall_seconds
+        return {
+            "disk_free": self._free_bytes,
+            "data_rate": self._data_rate,
+            "write_throughput": throughput,
+            "write_backlog": self._backlog,
+            "write_stall": stall,
+        }
+
+    def run(self) -> None:
+        DiskMonitor._running.add(self)
+        try:
+            self._monitor()
+        finally:
+            DiskMonitor._running.discard(self)
+            if self._warnings:
+                self._warnings.clear()
+                events.recording_disk_warning.emit("")
+
+    def _monitor(self) -> None:
+        last_bytes = self._bytes_written()
+        last_time = time.monotonic()
+        stall_seen = 0.0
+        healthy_checks = 0
+        while self._is_running:
+            time.sleep(self.CHECK_INTERVAL)
+            if not self._is_running:
+                break
+
+            now = time.monotonic()
+            written = self._bytes_written()
+            if now > last_time and written >= last_bytes:
+                rate = (written - last_bytes) / (now - last_time)
+                # Smoothed: the muxer writes in bursts
+                self._data_rate = (
+                    rate
+                    if not self._data_rate
+                    else (0.7 * self._data_rate + 0.3 * rate)
+                )
+            last_bytes, last_time = written, now
+
+            try:
+                self._free_bytes = shutil.disk_usage(self._directory).free
+            except OSError as e:
+                logger.warning(f"Cannot read free disk space: {str(e)}")
+                continue
+
+            stats = self.get_stats()
+            self._check_space(stats)
+            throughput = stats["write_throughput"]
+            if (
+                stats["write_stall"] > stall_seen
+                or stats["write_backlog"] > WriteBehindFile.MAX_PENDING // 2
+                or (throughput and self._data_rate > 0.8 * throughput)
+            ):
+                stall_seen = stats["write_stall"]
+                healthy_checks = 0
+                self._warn(
+                    "slow",
+                    "The disk cannot keep up with the recording, "
+                    "frames may be dropped",
+                )
+            else:
+                healthy_checks += 1
+                if healthy_checks >= self.SLOW_CLEAR_CHECKS:
+                    self._clear_warning("slow")
+
+    def _check_space(self, stats: dict) -> None:
+        monitors = [
+            monitor
+            for monitor in list(DiskMonitor._running)
+            if monitor._directory == self._directory
+        ]
+        if self not in monitors:
+            monitors.append(self)
+        # Space promised to the stitch copies is not available to record
+        free = stats["disk_free"] - sum(monitor._reserved() for monitor in monitors)
+        if free < self.CRITICAL_BYTES:
+            if not self._critical:
+                self._critical = True
+                self._warn(
+                    "critical",
+                    f"Disk almost full ({stats['disk_free'] // (1024 * 1024)} MB "
+                    "left), stopping the recording",
+                )
+                if self._on_critical is not None:
+                    self._on_critical()
+            return
+
+        # A recording to stitch takes its data rate twice: fragments and copy
+        rate = sum(
+            monitor._data_rate * (2 if monitor._reserved() else 1)
+            for monitor in monitors
+        )
+        if rate > 0 and free / rate < self.WARNING_SECONDS:
+            self._warn(
+                "space",
+                f"Low disk space: about {int(free / rate / 60)} minutes "
+                "of recording left",
+            )
+        elif rate > 0:
+            self._clear_warning("space")
+
+    def _reserved(self) -> int:
+        if self._reserved_bytes is None:
+            return 0
+        try:
+            return self._reserved_bytes()
+        except OSError:
+            return 0
+
+    def _warn(self, kind: str, message: str) -> None:
+        """Publish a warning when a condition of this kind starts."""
+        if kind in self._warnings:
+            return
+        self._warnings[kind] = message
+        logger.warning(message)
+        events.recording_disk_warning.emit(message)
+
+    def _clear_warning(self, kind: str) -> None:
+        """Publish the end of a condition: the one still in progress, if any."""
+        if self._warnings.pop(kind, None) is None:
+            return
+        logger.info(f"Recording disk: {kind} warning cleared")
+        events.recording_disk_warning.emit(next(iter(self._warnings.values()), ""))
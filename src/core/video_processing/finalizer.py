@@ -0,0 +1,212 @@
+"""
+Recording finalization.
+Once a recording is published (see atomic_publish), a background finalizer
+moves the MP4 index (moov) to the front of the file by stream copy, so
+players can start without seeking to the end of the file, builds its frame
+index sidecar and its low-resolution proxy.
+Moving the index replaces the file, which fails on Windows while a player
+holds it open: it is deferred while the recording is loaded for review.
+"""
+
+import itertools
+import os
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import av
+from PySide6.QtCore import QObject
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.video_processing.atomic_publish import (
+    is_partial,
+    partial_path,
+    publish,
+)
+from src.core.video_processing.frame_index import build_frame_index, has_frame_index
+from src.core.video_processing.recorder_backends import add_copy_stream
+from src.core.video_processing.proxy import build_proxy, find_proxy
+from src.utils.resource_manager import ResourceManager
+
+
+def is_faststart(path: Path) -> bool:
+    """True if the MP4 index (moov box) comes before the media data (mdat)."""
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return False
+            size, kind = struct.unpack(">I4s", header)
+            if kind == b"moov":
+                return True
+            if kind == b"mdat":
+                return False
+            if size == 1:  # 64-bit size follows
+                size = struct.unpack(">Q", f.read(8))[0] - 8
+            elif size == 0:  # Box runs to the end of the file
+                return False
+            f.seek(size - 8, os.SEEK_CUR)
+
+
+def faststart(path: Path) -> bool:
+    """
+    Rewrite an MP4 file with its index first, by stream copy.
+    The new file is written under a partial name and published atomically,
+    with the modification time of the original (same media, so proxies
+    built from it stay valid).
+
+    Returns:
+        bool: True if the file was rewritten, False if already faststart.
+
+    Raises:
+        Exception: If the file cannot be read or written.
+    """
+    path = Path(path)
+    if is_faststart(path):
+        return False
+
+    stat = path.stat()
+    partial = partial_path(path)
+    try:
+        with av.open(str(path)) as source:
+            streams = [s for s in source.streams if s.type in ("video", "audio")]
+            output = av.open(
+                str(partial),
+                mode="w",
+                format="mp4",
+                options={"movflags": "faststart"},
+            )
+            try:
+                stream_map = {
+                    stream.index: add_copy_stream(output, stream) for stream in streams
+                }
+                for packet in source.demux(*streams):
+                    if packet.dts is None:
+                        continue
+                    packet.stream = stream_map[packet.stream.index]
+                    output.mux(packet)
+            finally:
+                output.close()
+        os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        publish(partial, path)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
+    return True
+
+
+class RecordingFinalizer(QObject):
+    """
+    Finalizes recordings in the background once recording_stopped is
+    received, one at a time: index moved to the front, frame index sidecar
+    built, then recording_finalized published. A recording loaded for review
+    gets its index moved once another video is loaded; if moving it fails,
+    the recording is finalized with its index at the end.
+    Videos of the recordings directory without an up-to-date sidecar are
+    indexed at a lower priority, frame_index_ready is published for each.
+    Proxies of new recordings and of videos loaded for review are encoded
+    last, proxy_ready is published for each.
+    """
+
+    # Queue priorities: fresh recordings go first
+    _FINALIZE = 0
+    _FASTSTART = 1
+    _INDEX = 2
+    _PROXY = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = queue.PriorityQueue()
+        self._counter = itertools.count()
+        # Video loaded for review, recordings waiting for it to be unloaded
+        self._loaded: Optional[Path] = None
+        self._deferred = set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        events.recording_stopped.connect(self.finalize)
+        events.media_loaded.connect(self._on_media_loaded)
+        self.index_legacy_videos(ResourceManager.get_app_data_paths("videos"))
+
+    def finalize(self, path: str) -> None:
+        """Queue a recording for finalization."""
+        self._put(self._FINALIZE, path)
+
+    def request_proxy(self, path: str) -> None:
+        """Queue the encoding of the proxy of a video, if it has none."""
+        if find_proxy(path) is None:
+            self._put(self._PROXY, path)
+
+    def _on_media_loaded(self, path: str) -> None:
+        """Move the index of the recordings that are no longer loaded."""
+        self.request_proxy(path)
+        with self._lock:
+            self._loaded = Path(path).resolve()
+            unloaded = [video for video in self._deferred if video != self._loaded]
+            self._deferred.difference_update(unloaded)
+        for video in unloaded:
+            self._put(self._FASTSTART, str(video))
+
+    def _faststart(self, path: str) -> None:
+        """
+        Move the index of a recording to the front, or defer it while the
+        recording is loaded. Errors are logged: the file stays playable.
+        """
+        with self._lock:
+            if Path(path).resolve() == self._loaded:
+                logger.info(f"{path} is loaded, index moved to the front later")
+                self._deferred.add(Path(path).resolve())
+                return
+        start = time.monotonic()
+        try:
+            if faststart(path):
+                logger.info(f"Finalized {path} in {time.monotonic() - start:.1f}s")
+        except PermissionError as e:
+            # Opened by a player meanwhile
+            logger.warning(f"Cannot move the index of {path} yet: {str(e)}")
+            with self._lock:
+                self._deferred.add(Path(path).resolve())
+        except Exception as e:
+            logger.error(f"Error moving the index of {path} to the front: {str(e)}")
+
+    def index_legacy_videos(self, video_dir: Path) -> None:
+        """Queue the videos of a directory that have no up-to-date sidecar."""
+        if not Path(video_dir).exists():
+            return
+        for path in Path(video_dir).glob("*.mp4"):
+            if not is_partial(path) and not has_frame_index(path):
+                self._put(self._INDEX, str(path))
+
+    def _put(self, priority: int, path: Optional[str]) -> None:
+        self._queue.put((priority, next(self._counter), path))
+
+    def _run(self):
+        while True:
+            priority, _, path = self._queue.get()
+            if path is None:
+                return
+            try:
+                if priority == self._PROXY:
+                    if find_proxy(path) is None:
+                        build_proxy(path)
+                        events.proxy_ready.emit(path)
+                    continue
+                if priority in (self._FINALIZE, self._FASTSTART):
+                    self._faststart(path)
+                build_frame_index(path)
+                events.frame_index_ready.emit(path)
+                if priority == self._FINALIZE:
+                    events.recording_finalized.emit(path)
+                    self.request_proxy(path)
+            except Exception as e:
+                logger.error(f"Error finalizing recording {path}: {str(e)}")
+
+    def cleanup(self):
+        """Stop the worker once the queued recordings are finalized."""
+        # After the queued recordings, before the legacy videos
+        self._put(self._FINALIZE + 0.5, None)
+        self._thread.join(timeout=10.0)
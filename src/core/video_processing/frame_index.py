@@ -0,0 +1,206 @@
+"""
+Frame index sidecars.
+A sidecar lists the presentation timestamps of every video frame of a file
+and the byte offset of every keyframe, so players find the keyframe to decode
+from, or the number of a frame, by binary search instead of asking the
+demuxer. Sidecars live in the "indexes" app data directory, one per video
+(named after its stem and a hash of its path), and are only used while the
+video keeps the size and mtime recorded in their header.
+
+Binary layout (little endian), memory-mapped when read:
+    header     magic "CKIX", version, time base, frame and keyframe counts,
+               source size and mtime
+    frames     frame_count x int64 pts, sorted
+    keyframes  keyframe_count x (int64 pts, int64 byte offset, int64 frame number)
+"""
+
+import bisect
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Optional, Tuple
+
+import av
+
+from src.core.logging_config import logger
+from src.utils.resource_manager import ResourceManager
+
+INDEX_SUFFIX = ".idx"
+
+_MAGIC = b"CKIX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHqqIIqd")
+
+
+def index_path(video_path: Path) -> Path:
+    """Path of the sidecar of a video."""
+    return ResourceManager.get_sidecar_path("indexes", video_path, INDEX_SUFFIX)
+
+
+def build_frame_index(video_path: Path) -> Path:
+    """
+    Write the sidecar of a video by demuxing it (no decoding).
+    The sidecar is replaced atomically.
+
+    Returns:
+        Path: The sidecar path.
+
+    Raises:
+        Exception: If the video cannot be read or has no video stream.
+    """
+    video_path = Path(video_path)
+    stat = video_path.stat()
+    frames = array("q")
+    keyframes = []  # (pts, byte offset)
+    with av.open(str(video_path)) as container:
+        stream = container.streams.video[0]
+        time_base = stream.time_base
+        for packet in container.demux(stream):
+            if packet.dts is None:
+                continue
+            pts = packet.pts if packet.pts is not None else packet.dts
+            frames.append(pts)
+            if packet.is_keyframe:
+                keyframes.append((pts, packet.pos if packet.pos is not None else -1))
+
+    frames = array("q", sorted(frames))
+    keyframe_data = array("q")
+    for pts, pos in sorted(keyframes):
+        keyframe_data.extend((pts, pos, bisect.bisect_left(frames, pts)))
+
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        0,
+        time_base.numerator,
+        time_base.denominator,
+        len(frames),
+        len(keyframes),
+        stat.st_size,
+        stat.st_mtime,
+    )
+    path = index_path(video_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(frames.tobytes())
+        f.write(keyframe_data.tobytes())
+    os.replace(tmp_path, path)
+    logger.info(f"Indexed {video_path.name}: {len(frames)} frames")
+    return path
+
+
+def has_frame_index(video_path: Path) -> bool:
+    """True if the video has an up-to-date sidecar."""
+    index = FrameIndex.open(video_path)
+    if index is None:
+        return False
+    index.close()
+    return True
+
+
+class FrameIndex:
+    """
+    Read-only, memory-mapped view of a sidecar.
+    Times are in seconds; lookups are binary searches.
+    """
+
+    def __init__(self, path: Path, video_path: Path):
+        self.video_path = Path(video_path)
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            _,
+            tb_num,
+            tb_den,
+            frame_count,
+            keyframe_count,
+            self.source_size,
+            self.source_mtime,
+        ) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"Not a frame index: {path}")
+        self.time_base = tb_num / tb_den
+
+        self._view = memoryview(self._map)
+        frames_end = _HEADER.size + frame_count * 8
+        keyframes_end = frames_end + keyframe_count * 24
+        self._frames = self._view[_HEADER.size : frames_end].cast("q")
+        self._keyframes = self._view[frames_end:keyframes_end].cast("q")
+        # Keyframe pts only, for bisect
+        self._keyframe_pts = self._keyframes[0::3]
+
+    @classmethod
+    def open(cls, video_path: Path) -> Optional["FrameIndex"]:
+        """Open the sidecar of a video, None if missing or stale."""
+        path = index_path(video_path)
+        try:
+            stat = Path(video_path).stat()
+            index = cls(path, video_path)
+        except (OSError, ValueError):
+            return None
+        if index.source_size != stat.st_size or index.source_mtime != stat.st_mtime:
+            index.close()
+            return None
+        return index
+
+    def close(self) -> None:
+        for view in (self._keyframe_pts, self._keyframes, self._frames, self._view):
+            view.release()
+        self._map.close()
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._frames)
+
+    @property
+    def keyframe_count(self) -> int:
+        return len(self._keyframe_pts)
+
+    @property
+    def duration(self) -> float:
+        """Time of the end of the last frame, from the first one."""
+        count = len(self._frames)
+        if count < 2:
+            return 0.0
+        last, first = self._frames[count - 1], self._frames[0]
+        # Last frame lasts as long as the average frame
+        return (last - first) * self.time_base * count / (count - 1)
+
+    @property
+    def start_time(self) -> float:
+        """Presentation time of the first frame."""
+        return self._frames[0] * self.time_base if len(self._frames) else 0.0
+
+    def frame_time(self, frame_number: int) -> float:
+        """Presentation time of a frame, from the first frame."""
+        frame_number = min(max(frame_number, 0), len(self._frames) - 1)
+        return (self._frames[frame_number] - self._frames[0]) * self.time_base
+
+    def frame_at(self, seconds: float) -> int:
+        """Number of the frame displayed at a time (from the first frame)."""
+        if not len(self._frames):
+            return 0
+        pts = self._frames[0] + seconds / self.time_base
+        return max(0, bisect.bisect_right(self._frames, pts) - 1)
+
+    def keyframe_before(self, seconds: float) -> Tuple[float, int, int]:
+        """
+        Last keyframe at or before a time: decoding must start there to
+        show that time.
+
+        Returns:
+            tuple: (time in seconds, byte offset or -1, frame number).
+        """
+        if not len(self._keyframe_pts):
+            return 0.0, -1, 0
+        pts = self._frames[0] + seconds / self.time_base
+        i = max(0, bisect.bisect_right(self._keyframe_pts, pts) - 1)
+        key_pts, pos, frame_number = self._keyframes[3 * i : 3 * i + 3]
+        return (key_pts - self._frames[0]) * self.time_base, pos, frame_number
@@ -0,0 +1,102 @@
+"""
+Bounded queue joining the capture and writer stages of the recorder.
+"""
+
+import threading
+from collections import deque
+from enum import Enum, auto
+
+
+class DropPolicy(Enum):
+    """What to do when the queue is full."""
+
+    DROP_OLDEST = auto()  # Discard the oldest queued item to make room
+    DROP_NEWEST = auto()  # Discard the incoming item
+    BLOCK = auto()  # Wait for the writer to make room
+
+
+class FrameQueue:
+    """
+    Thread-safe bounded FIFO with a configurable drop policy.
+    Keeps counters of queued and dropped items and of the max depth reached.
+    """
+
+    def __init__(self, maxsize: int, policy: DropPolicy = DropPolicy.DROP_OLDEST):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self.queued = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item) -> bool:
+        """
+        Add an item, applying the drop policy if the queue is full.
+
+        Returns:
+            bool: True if the item was queued, False if it was dropped or the
+            queue is closed.
+        """
+        with self._condition:
+            if self._closed:
+                return False
+
+            if len(self._items) >= self.maxsize:
+                if self.policy == DropPolicy.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.policy == DropPolicy.DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:  # BLOCK
+                    while len(self._items) >= self.maxsize and not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        return False
+
+            self._items.append(item)
+            self.queued += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify_all()
+            return True
+
+    def get(self, timeout: float = None):
+        """
+        Remove and return the oldest item.
+        Blocks until an item is available, the queue is closed and drained,
+        or the timeout expires.
+
+        Returns:
+            The item, or None if no item is available.
+        """
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Refuse new items and wake up waiting threads. Queued items stay readable."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def is_closed(self) -> bool:
+        return self._closed
+
+    def is_drained(self) -> bool:
+        """True once the queue is closed and every item has been read."""
+        with self._condition:
+            return self._closed and not self._items
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._items)
@@ -0,0 +1,49 @@
+"""
+Gap markers of recordings.
+A gap is a stream interruption the recorder reconnected from. The recording
+continues right after the media written before the gap, so a gap has a
+position on the media timeline ("at", seconds) and a real duration lost
+("duration", seconds). Gaps are stored next to the tags of the video, named
+like its other sidecars (stem and a hash of its path).
+Gap markers are shown on the review timeline only, when the video is
+loaded: the live view has no timeline. While recording, a gap is reported
+through recording_gap (logged, and forwarded by recording processes).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+from src.core.logging_config import logger
+from src.utils.resource_manager import ResourceManager
+
+
+def _gaps_file_path(video_path: Path) -> Path:
+    return ResourceManager.get_sidecar_path("tags", video_path, ".gaps.json")
+
+
+def save_gaps(video_path: Path, gaps: List[dict]) -> None:
+    """Write the gaps of a video atomically."""
+    path = _gaps_file_path(video_path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(gaps, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Error saving gaps: {e}")
+
+
+def load_gaps(video_path: Path) -> List[dict]:
+    """Gaps of a video, sorted by position. Empty if it has none."""
+    path = _gaps_file_path(video_path)
+    if not path.exists():
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return sorted(json.load(f), key=lambda gap: gap["at"])
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Error loading gaps: {e}")
+        return []
@@ -0,0 +1,149 @@
+"""
+Cache of decoded GOPs.
+Showing a frame means decoding from the keyframe before it, so scrubbing
+back and forth around the same seconds decodes the same GOPs over and over.
+The cache keeps the decoded frames of recently used GOPs, keyed by
+(video, GOP start frame), within a memory budget, evicting the least
+recently used GOP first. Frames are stored as planar YUV 4:2:0, half the
+size of RGB, and converted to RGB when served. They can also be stored
+downscaled to fit more GOPs.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import av
+import cv2
+import numpy as np
+
+from src.core.logging_config import logger
+
+
+class _Gop:
+    """Decoded frames of one GOP, by frame number."""
+
+    def __init__(self, frames: Dict[int, np.ndarray]):
+        self.frames = frames
+        self.start = min(frames)
+        self.end = max(frames)
+        self.nbytes = sum(image.nbytes for image in frames.values())
+
+
+class GopCache:
+    """
+    Thread-safe LRU cache of decoded GOPs.
+    Frames are put as returned by prepare and served as RGB24 numpy arrays;
+    a video is any hashable identifying the content, e.g. (path, mtime).
+    """
+
+    # Budget sized in GOPs: two-second 1080p GOPs at 30 fps in YUV 4:2:0
+    DEFAULT_MAX_GOPS = 4
+    DEFAULT_MAX_BYTES = DEFAULT_MAX_GOPS * 60 * 1920 * 1080 * 3 // 2
+
+    def __init__(
+        self, max_bytes: int = DEFAULT_MAX_BYTES, max_height: Optional[int] = None
+    ):
+        """
+        Args:
+            max_bytes: Memory budget of the cached frames.
+            max_height: Frames taller than this are stored downscaled, None
+                to store them at full size.
+        """
+        self.max_bytes = max_bytes
+        self.max_height = max_height
+        self._gops: "OrderedDict[tuple, _Gop]" = OrderedDict()
+        # Sorted GOP starts of each video, to find the GOP of a frame
+        self._starts: Dict[Hashable, list] = {}
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def prepare(self, frame: av.VideoFrame) -> np.ndarray:
+        """
+        Array of a decoded frame at the cache size and format: planar YUV
+        4:2:0, or RGB24 for odd sizes 4:2:0 cannot hold.
+        """
+        width, height = frame.width, frame.height
+        if self.max_height is not None and height > self.max_height:
+            width = max(2, int(width * self.max_height / height) & ~1)
+            height = self.max_height
+        if width % 2 or height % 2:
+            return frame.to_ndarray(width=width, height=height, format="rgb24")
+        return frame.to_ndarray(width=width, height=height, format="yuv420p")
+
+    @staticmethod
+    def to_rgb(image: np.ndarray) -> np.ndarray:
+        """RGB24 array of a frame returned by prepare."""
+        if image.ndim == 3:
+            return image
+        return cv2.cvtColor(image, cv2.COLOR_YUV2RGB_I420)
+
+    def get(self, video: Hashable, frame_number: int) -> Optional[np.ndarray]:
+        """A cached frame as RGB, None if its GOP is not cached."""
+        with self._lock:
+            starts = self._starts.get(video)
+            if starts:
+                i = bisect.bisect_right(starts, frame_number) - 1
+                if i >= 0:
+                    key = (video, starts[i])
+                    image = self._gops[key].frames.get(frame_number)
+                    if image is not None:
+                        self._gops.move_to_end(key)
+                        self.hits += 1
+                        return self.to_rgb(image)
+            self.misses += 1
+            return None
+
+    def put(self, video: Hashable, frames: Dict[int, np.ndarray]) -> None:
+        """
+        Cache the frames of a GOP, from its keyframe.
+        A GOP larger than the whole budget is not cached.
+        """
+        if not frames:
+            return
+        gop = _Gop(frames)
+        if gop.nbytes > self.max_bytes:
+            logger.warning(
+                f"GOP of {gop.nbytes / 1e6:.0f} MB exceeds the decoded frame "
+                f"cache ({self.max_bytes / 1e6:.0f} MB), set a max height"
+            )
+            return
+        key = (video, gop.start)
+        with self._lock:
+            self._remove(key)
+            self._gops[key] = gop
+            bisect.insort(self._starts.setdefault(video, []), gop.start)
+            self.nbytes += gop.nbytes
+            while self.nbytes > self.max_bytes:
+                self._remove(next(iter(self._gops)))
+
+    def discard(self, video: Hashable) -> None:
+        """Remove the GOPs of a video."""
+        with self._lock:
+            for start in list(self._starts.get(video, ())):
+                self._remove((video, start))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._gops.clear()
+            self._starts.clear()
+            self.nbytes = 0
+
+    def _remove(self, key: tuple) -> None:
+        """Remove a GOP if cached (lock held)."""
+        gop = self._gops.pop(key, None)
+        if gop is None:
+            return
+        self.nbytes -= gop.nbytes
+        video, start = key
+        starts = self._starts[video]
+        starts.remove(start)
+        if not starts:
+            del self._starts[video]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._gops)
@@ -0,0 +1,99 @@
+import threading
+from typing import Optional
+
+import av
+from PySide6.QtCore import QObject, Signal
+
+from src.core.logging_config import logger
+from src.core.streaming.stream_ingest import StreamIngestThread
+from src.core.video_processing.frame_queue import DropPolicy, FrameQueue
+
+
+class LiveRenderer(QObject):
+    """
+    In-app live view fed by a stream ingest instead of a second connection.
+    Decodes the ingest video packets on a worker thread and publishes RGB
+    frames scaled to the display size through frame_ready.
+    """
+
+    frame_ready = Signal(object)  # numpy array (height, width, 3), RGB24
+
+    # A short queue: the live view shows the newest frames or nothing
+    QUEUE_SIZE = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._ingest: Optional[StreamIngestThread] = None
+        self._queue: Optional[FrameQueue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._target_size = (1280, 720)
+
+    def set_target_size(self, width: int, height: int) -> None:
+        """Set the display size frames are scaled to."""
+        if width > 0 and height > 0:
+            self._target_size = (width, height)
+
+    def start(self, ingest: StreamIngestThread) -> None:
+        """Subscribe to an ingest and start decoding."""
+        self.stop()
+        stream = ingest.video_stream
+        if stream is None:
+            logger.warning("Live renderer: ingest has no video stream")
+            return
+
+        self._ingest = ingest
+        self._queue = FrameQueue(self.QUEUE_SIZE, DropPolicy.DROP_OLDEST)
+        self._thread = threading.Thread(
+            target=self._render_loop, args=(stream, self._queue), daemon=True
+        )
+        self._thread.start()
+        ingest.subscribe(self._queue)
+
+    def stop(self) -> None:
+        """Unsubscribe from the ingest and stop decoding."""
+        if self._ingest is not None:
+            self._ingest.unsubscribe(self._queue)
+            self._ingest = None
+        if self._queue is not None:
+            self._queue.close()
+            self._queue = None
+        self._thread = None
+
+    def _render_loop(self, stream, queue: FrameQueue):
+        """Decode video packets until the queue is drained."""
+        # Own decoder: other subscribers may decode the same stream
+        codec = av.CodecContext.create(stream.codec_context.name, "r")
+        codec.extradata = stream.codec_context.extradata
+        codec.thread_type = "AUTO"
+
+        dropped_seen = 0
+        waiting_for_keyframe = True
+        while not queue.is_drained():
+            packet = queue.get(timeout=0.5)
+            if packet is None or packet.stream.index != stream.index:
+                continue
+            if queue.dropped != dropped_seen:
+                dropped_seen = queue.dropped
+                waiting_for_keyframe = True
+            if waiting_for_keyframe:
+                if not packet.is_keyframe:
+                    continue
+                waiting_for_keyframe = False
+
+            try:
+                frames = codec.decode(packet)
+            except av.error.FFmpegError as e:
+                logger.warning(f"Live renderer decode error: {str(e)}")
+                waiting_for_keyframe = True
+                continue
+
+            for frame in frames:
+                width, height = _fit(frame.width, frame.height, *self._target_size)
+                image = frame.reformat(width, height, format="rgb24").to_ndarray()
+                self.frame_ready.emit(image)
+
+
+def _fit(width: int, height: int, max_width: int, max_height: int):
+    """Largest even size with the frame aspect ratio fitting in the target."""
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(2, int(width * scale) & ~1), max(2, int(height * scale) & ~1)
@@ -0,0 +1,182 @@
+"""
+Media probing.
+The duration and stream properties of a video are read from its container
+header (no packet is demuxed or decoded) and, when the video has a frame
+index sidecar, from the sidecar, which also knows the exact frame and
+keyframe counts. Probes run on worker threads and their results are cached
+per file content (path, mtime, size), so opening a video that was already
+probed, e.g. a recording probed when it was finalized, gives its duration
+at once.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import av
+from PySide6.QtCore import QObject, Signal
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.video_processing.frame_index import FrameIndex
+
+
+class MediaInfo:
+    """Properties of a video."""
+
+    def __init__(
+        self,
+        duration: float,
+        fps: float,
+        width: int,
+        height: int,
+        codec: str,
+        frame_count: Optional[int] = None,
+        keyframe_count: Optional[int] = None,
+        from_index: bool = False,
+    ):
+        """
+        Args:
+            duration: Seconds from the first frame to the end of the last.
+            fps: Average frame rate, 0 if unknown.
+            codec: Name of the video codec, e.g. "h264".
+            frame_count: Number of frames, None if the container does not
+                tell and there is no sidecar.
+            keyframe_count: Number of keyframes, None without a sidecar.
+            from_index: True if the counts and duration come from the sidecar.
+        """
+        self.duration = duration
+        self.fps = fps
+        self.width = width
+        self.height = height
+        self.codec = codec
+        self.frame_count = frame_count
+        self.keyframe_count = keyframe_count
+        self.from_index = from_index
+
+
+def probe_media(video_path: Path) -> MediaInfo:
+    """
+    Read the properties of a video from its header and sidecar.
+
+    Raises:
+        Exception: If the video cannot be read or has no video stream.
+    """
+    with av.open(str(video_path)) as container:
+        if not container.streams.video:
+            raise ValueError(f"No video stream in {video_path}")
+        stream = container.streams.video[0]
+        if stream.duration is not None:
+            duration = float(stream.duration * stream.time_base)
+        elif container.duration is not None:
+            duration = container.duration / av.time_base
+        else:
+            duration = 0.0
+        info = MediaInfo(
+            duration,
+            float(stream.average_rate or stream.guessed_rate or 0),
+            stream.codec_context.width,
+            stream.codec_context.height,
+            stream.codec_context.name,
+            frame_count=stream.frames or None,
+        )
+
+    index = FrameIndex.open(video_path)
+    if index is not None:
+        try:
+            info.duration = index.duration
+            info.frame_count = index.frame_count
+            info.keyframe_count = index.keyframe_count
+            info.from_index = True
+        finally:
+            index.close()
+    return info
+
+
+def _file_key(video_path) -> tuple:
+    """Cache key of the current content of a file."""
+    stat = os.stat(video_path)
+    return str(Path(video_path).resolve()), stat.st_mtime_ns, stat.st_size
+
+
+class MediaProbeService(QObject):
+    """
+    Probes videos on worker threads and caches the results.
+    Recordings are probed as soon as they are finalized, and probed again
+    when their sidecar is built.
+    """
+
+    probed = Signal(str, object)  # Path, MediaInfo or None if unreadable
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cache: "OrderedDict[tuple, MediaInfo]" = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+
+        events.recording_finalized.connect(self.request)
+        events.frame_index_ready.connect(self._on_frame_index_ready)
+
+    def cached(self, video_path) -> Optional[MediaInfo]:
+        """Cached properties of a video, None if not probed since it changed."""
+        try:
+            key = _file_key(video_path)
+        except OSError:
+            return None
+        with self._lock:
+            info = self._cache.get(key)
+            if info is not None:
+                self._cache.move_to_end(key)
+            return info
+
+    def request(self, video_path) -> Optional[MediaInfo]:
+        """
+        Get the properties of a video.
+
+        Returns:
+            MediaInfo: The cached properties, or None if the video is being
+            probed; probed is then emitted with the result.
+        """
+        info = self.cached(video_path)
+        if info is None:
+            self._start_probe(str(video_path))
+        return info
+
+    def _start_probe(self, video_path: str) -> None:
+        with self._lock:
+            if video_path in self._pending:
+                return
+            self._pending.add(video_path)
+        threading.Thread(
+            target=self._probe, args=(video_path,), name="MediaProbe", daemon=True
+        ).start()
+
+    def _probe(self, video_path: str) -> None:
+        info = None
+        try:
+            key = _file_key(video_path)
+            info = probe_media(video_path)
+            with self._lock:
+                self._cache[key] = info
+                while len(self._cache) > self.MAX_ENTRIES:
+                    self._cache.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"Cannot probe {video_path}: {str(e)}")
+        finally:
+            with self._lock:
+                self._pending.discard(video_path)
+        self.probed.emit(video_path, info)
+
+    def _on_frame_index_ready(self, video_path: str) -> None:
+        """A sidecar was built: probe again for its exact counts."""
+        try:
+            key = _file_key(video_path)
+        except OSError:
+            return
+        with self._lock:
+            self._cache.pop(key, None)
+        self._start_probe(video_path)
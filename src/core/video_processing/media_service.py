@@ -1,11 +1,18 @@
+import time
 from pathlib import Path
+from typing import Optional
 
-from PySide6.QtCore import QObject, QTimer
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QGuiApplication
 from PySide6.QtWidgets import QFileDialog
 
 from src.core.event_handler import events
 from src.core.logging_config import logger
+from src.core.video_processing.atomic_publish import is_partial
+from src.core.video_processing.frame_index import FrameIndex
+from src.core.video_processing.media_probe import MediaInfo, MediaProbeService
 from src.core.video_processing.player import Player
+from src.core.video_processing.proxy import find_proxy
 from src.utils.resource_manager import ResourceManager
 
 
@@ -13,9 +20,30 @@ class MediaService(QObject):
     """
     Media management service that handles file opening and playback logic.
     Separates business logic from the user interface.
+    When the media has a proxy, scrubbing (seeks in quick succession) plays
+    the proxy, and playback returns to the master once seeks settle.
+    Position updates follow the player's own time changes, at most once
+    per display refresh, and stop while paused, hidden or in live mode;
+    players that cannot report their time are polled while playing.
     """
 
-    def __init__(self, player: Player, parent=None):
+    # Seeks closer than this are scrubbing; the master comes back after
+    # this long without a seek
+    SCRUB_SETTLE_MS = 400
+    # Polling of the players that do not report their time
+    POLL_INTERVAL_MS = 100
+    # Used when the screen does not report its refresh rate
+    DEFAULT_REFRESH_RATE = 60.0
+
+    # Emitted from the player threads, handled in the GUI thread
+    _player_time_changed = Signal()
+
+    def __init__(
+        self,
+        player: Player,
+        parent=None,
+        probe_service: Optional[MediaProbeService] = None,
+    ):
         super().__init__(parent)
         self.player = player
         self.is_playing = False
@@ -23,13 +51,39 @@ class MediaService(QObject):
         self.current_video_path = None
         self.total_time = 0  # Store total time as class attribute
 
-        # Timer to update position
+        # Position updates, coalesced to one per display refresh
+        self._live_mode = False
+        self._view_visible = True
+        self._position_timer = QTimer(self)
+        self._position_timer.setSingleShot(True)
+        self._position_timer.setInterval(self._refresh_interval_ms())
+        self._position_timer.timeout.connect(self._update_position)
+        self._player_time_changed.connect(self._on_player_time_changed)
+        self._polled = not self.player.set_time_changed_callback(
+            self._player_time_changed.emit
+        )
         self.timer = QTimer(self)
-        self.timer.setInterval(100)
+        self.timer.setInterval(self.POLL_INTERVAL_MS)
         self.timer.timeout.connect(self._update_position)
-        self.timer.start()
+
+        # Proxy rendition of the current media, used while scrubbing
+        self._proxy_path = None
+        self._on_proxy = False
+        self._last_seek = 0.0
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(self.SCRUB_SETTLE_MS)
+        self._settle_timer.timeout.connect(self._return_to_master)
+
+        # Duration of the media without waiting for the player
+        if probe_service is None:
+            probe_service = MediaProbeService(self)
+        self.probe_service = probe_service
+        self.probe_service.probed.connect(self._on_media_probed)
 
         events.media_loaded.connect(self.load_media)
+        events.proxy_ready.connect(self._on_proxy_ready)
+        events.frame_index_ready.connect(self._on_frame_index_ready)
 
     def open_video_file(
         self, parent_widget=None, start_dir=ResourceManager.get_app_data_paths("videos")
@@ -61,18 +115,67 @@ class MediaService(QObject):
     def load_media(self, path):
         if self.player.load(path):
             self.current_video_path = path
-            # Start playing to ensure media is fully loaded
+            self._attach_frame_index()
+            self._settle_timer.stop()
+            self._on_proxy = False
+            self._proxy_path = find_proxy(path)
+            self.total_time = 0
+            info = self.probe_service.request(path)
+            if info is not None:
+                self._on_media_probed(path, info)
             self.play()
-            # Get total time after a short delay to ensure it's available
-            QTimer.singleShot(1000, self._get_total_time)
             return True
         else:
             self.pause()
             events.media_error.emit(f"Unable to load file: {path}")
             return False
 
+    def _attach_frame_index(self):
+        """Give the player the sidecar index of the current media, if any."""
+        previous = self.player.frame_index
+        self.player.set_frame_index(FrameIndex.open(self.current_video_path))
+        if previous is not None:
+            previous.close()
+
+    def _on_frame_index_ready(self, path: str):
+        """Use a sidecar built in the background for the current media."""
+        if self._is_current(path):
+            self._attach_frame_index()
+
+    def _on_proxy_ready(self, path: str):
+        """Use a proxy encoded in the background for the current media."""
+        if self._is_current(path):
+            self._proxy_path = find_proxy(path)
+
+    def _return_to_master(self):
+        """Scrubbing is over: resume on the master at the proxy position."""
+        if self._on_proxy:
+            current_time, _ = self.player.get_time()
+            self.player.switch_media(self.current_video_path, current_time)
+            self._on_proxy = False
+
+    def _is_current(self, path: str) -> bool:
+        return bool(self.current_video_path) and Path(path) == Path(
+            self.current_video_path
+        )
+
+    def _on_media_probed(self, path: str, info: Optional[MediaInfo]):
+        """Publish the duration of the current media once probed."""
+        if not self._is_current(path):
+            return
+        if info is None or info.duration <= 0:
+            # Not probed: ask the player once it plays
+            QTimer.singleShot(500, self._get_total_time)
+            return
+        if info.duration != self.total_time:
+            self.total_time = info.duration
+            events.media_loaded_total_time.emit(info.duration)
+            logger.info(f"Total time set: {info.duration}")
+
     def _get_total_time(self):
         """Get the total time after media is loaded and playing."""
+        if self.total_time > 0 or not self.current_video_path:
+            return
         _, total_time = self.player.get_time()
         if total_time > 0:
             self.total_time = total_time
@@ -85,11 +188,13 @@ class MediaService(QObject):
     def play(self):
         self.player.play()
         self.is_playing = True
+        self._update_polling()
         events.play_state_changed.emit(self.is_playing)
 
     def pause(self):
         self.player.pause()
         self.is_playing = False
+        self._update_polling()
         events.play_state_changed.emit(self.is_playing)
 
     def toggle_play(self, should_play: bool) -> None:
@@ -127,15 +232,99 @@ class MediaService(QObject):
         Args:
             position_percent (float) between 0 and 1
         """
-        self.player.seek(position_percent)
+        now = time.monotonic()
+        scrubbing = now - self._last_seek < self.SCRUB_SETTLE_MS / 1000
+        self._last_seek = now
+        switched = False
+        if scrubbing and self._proxy_path and not self._on_proxy:
+            # The proxy starts at the target position
+            switched = self.player.switch_media(
+                str(self._proxy_path), position_percent * self.total_time
+            )
+            self._on_proxy = switched
+        if not switched:
+            self.player.seek(position_percent)
+        if self._on_proxy:
+            self._settle_timer.start()
         self._update_position()
 
+    def seek_to_time(self, seconds: float, exact: bool = True) -> None:
+        """
+        Move to a time.
+        Args:
+            seconds (float): Time from the start of the media.
+            exact (bool): Show the frame at that time rather than the
+                keyframe before it.
+        """
+        self.player.seek_to_time(seconds, exact)
+        self._update_position()
+
+    def step_forward(self) -> None:
+        """Pause and show the next frame."""
+        if self.is_playing:
+            self.pause()
+        self.player.step_forward()
+        self._update_position()
+
+    def step_backward(self) -> None:
+        """Pause and show the previous frame."""
+        if self.is_playing:
+            self.pause()
+        self.player.step_backward()
+        self._update_position()
+
+    def get_frame_index(self) -> int:
+        """Return the number of the frame shown."""
+        return self.player.get_frame_index()
+
+    @staticmethod
+    def _refresh_interval_ms() -> int:
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return max(1, round(1000 / (rate or MediaService.DEFAULT_REFRESH_RATE)))
+
+    def _updates_suspended(self) -> bool:
+        return self._live_mode or not self._view_visible
+
+    def _on_player_time_changed(self):
+        """The player position moved: update once the refresh interval ends."""
+        if not self._updates_suspended() and not self._position_timer.isActive():
+            self._position_timer.start()
+
+    def _update_polling(self):
+        """Poll only the players that do not report their time, while useful."""
+        if self._polled and self.is_playing and not self._updates_suspended():
+            self.timer.start()
+        else:
+            self.timer.stop()
+
+    def set_live_mode(self, is_live_mode: bool) -> None:
+        """No position updates in live mode."""
+        self._live_mode = is_live_mode
+        self._on_suspension_changed()
+
+    def set_view_visible(self, visible: bool) -> None:
+        """No position updates while the replay view is hidden."""
+        self._view_visible = visible
+        self._on_suspension_changed()
+
+    def _on_suspension_changed(self):
+        self._update_polling()
+        if self._updates_suspended():
+            self._position_timer.stop()
+        elif self.current_video_path:
+            self._update_position()
+
     def _update_position(self):
         current_time, _ = self.player.get_time()
         events.position_changed.emit(current_time, self.total_time)
 
-        # If we are at the end of the media
-        if current_time >= self.total_time - 0.5 and self.total_time > 0:
+        # If we are at the end of the media (not stepping through it)
+        if (
+            self.is_playing
+            and current_time >= self.total_time - 0.5
+            and self.total_time > 0
+        ):
             if self.loop_enabled:
                 # Relaunch the playback from the beginning
                 self.player.seek(0)
@@ -144,6 +333,7 @@ class MediaService(QObject):
                 # Stop the playback
                 self.player.stop()
                 self.is_playing = False
+                self._update_polling()
                 events.play_state_changed.emit(self.is_playing)
                 events.media_ended.emit()
 
@@ -157,6 +347,7 @@ class MediaService(QObject):
 
     def cleanup(self):
         self.timer.stop()
+        self._position_timer.stop()
         self.player.cleanup()
 
     def get_current_time(self):
@@ -206,7 +397,7 @@ class MediaService(QObject):
         # Get all video files in the directory
         video_files = []
         for file in video_path.iterdir():
-            if file.suffix.lower() == ".mp4":
+            if file.suffix.lower() == ".mp4" and not is_partial(file):
                 video_files.append((file, file.stat().st_mtime))
 
         if not video_files:
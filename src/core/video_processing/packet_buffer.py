@@ -0,0 +1,65 @@
+"""
+Pre-roll ring buffer of compressed stream packets.
+"""
+
+from collections import deque
+from typing import List
+
+
+class PacketRingBuffer:
+    """
+    Keeps the most recent compressed packets of a live stream, bounded both
+    in duration and in memory. Compressed packets weigh a few MB per ten
+    seconds of 1080p, decoded frames would weigh gigabytes.
+    Not thread-safe: the owner serializes access.
+    """
+
+    def __init__(self, max_seconds: float = 10.0, max_bytes: int = 32 * 1024 * 1024):
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self._packets = deque()
+        self._bytes = 0
+
+    def append(self, packet) -> None:
+        """Add a packet and evict the oldest ones beyond the bounds."""
+        if self.max_seconds <= 0 or self.max_bytes <= 0:
+            return
+        self._packets.append(packet)
+        self._bytes += packet.size
+
+        newest = _packet_time(packet)
+        while self._packets and (
+            self._bytes > self.max_bytes
+            or newest - _packet_time(self._packets[0]) > self.max_seconds
+        ):
+            self._bytes -= self._packets.popleft().size
+
+    def snapshot(self) -> List:
+        """
+        Get the buffered packets, starting at the oldest video keyframe so
+        the result is decodable.
+        """
+        packets = list(self._packets)
+        for index, packet in enumerate(packets):
+            if packet.stream.type == "video" and packet.is_keyframe:
+                return packets[index:]
+        return []
+
+    def clear(self) -> None:
+        self._packets.clear()
+        self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def duration(self) -> float:
+        """Time span covered by the buffered packets, in seconds."""
+        if not self._packets:
+            return 0.0
+        return _packet_time(self._packets[-1]) - _packet_time(self._packets[0])
+
+
+def _packet_time(packet) -> float:
+    return float(packet.dts * packet.time_base)
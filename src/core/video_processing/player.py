@@ -1,13 +1,18 @@
+import os
 import sys
 import time
 import threading
 from abc import ABC, abstractmethod
 from typing import Optional
 
+import av
 import cv2
 import vlc
+from PySide6.QtCore import QObject, Signal
 
 from src.core.logging_config import logger
+from src.core.video_processing.frame_queue import DropPolicy, FrameQueue
+from src.core.video_processing.gop_cache import GopCache
 
 
 class Player(ABC):
@@ -16,6 +21,9 @@ class Player(ABC):
     Defines essential methods that any player must implement.
     """
 
+    # FrameIndex of the loaded media, None if it has no sidecar
+    frame_index = None
+
     @abstractmethod
     def load(self, media_path):
         """
@@ -97,6 +105,38 @@ class Player(ABC):
         """
         pass
 
+    @abstractmethod
+    def seek_to_time(self, seconds, exact=True):
+        """
+        Seek to a time.
+
+        Args:
+            seconds (float): Time from the start of the media.
+            exact (bool): Show the frame at that time; if False, the
+                keyframe before it may be shown instead (faster).
+        """
+        pass
+
+    @abstractmethod
+    def step_forward(self):
+        """Pause and show the next frame."""
+        pass
+
+    @abstractmethod
+    def step_backward(self):
+        """Pause and show the previous frame."""
+        pass
+
+    @abstractmethod
+    def get_frame_index(self):
+        """
+        Get the number of the frame shown.
+
+        Returns:
+            int: Frame number, from 0.
+        """
+        pass
+
     @abstractmethod
     def get_time(self):
         """
@@ -112,6 +152,45 @@ class Player(ABC):
         """Release player resources."""
         pass
 
+    def switch_media(self, media_path, seconds):
+        """
+        Replace the loaded media by another rendition of it (same timeline),
+        keeping the position and the play state.
+        This method is optional and can be implemented by child classes.
+
+        Args:
+            media_path (str): Path to the other rendition.
+            seconds (float): Position to resume at.
+
+        Returns:
+            bool: True if the media was switched.
+        """
+        return False
+
+    def set_time_changed_callback(self, callback):
+        """
+        Have the player report position changes instead of being polled.
+        This method is optional and can be implemented by child classes.
+
+        Args:
+            callback: Called without arguments, from any thread, when the
+                position changed or the end of the media was reached.
+
+        Returns:
+            bool: True if the player reports its position.
+        """
+        return False
+
+    def set_frame_index(self, frame_index):
+        """
+        Set the frame index of the loaded media, used to seek by time
+        instead of relying on the demuxer.
+
+        Args:
+            frame_index (FrameIndex): Index of the media, or None.
+        """
+        self.frame_index = frame_index
+
     def set_video_output(self, win_id):
         """
         Configure video output for the player.
@@ -128,8 +207,13 @@ class VLCPlayer(Player):
     Concrete implementation of a player using VLC.
     """
 
-    def __init__(self):
-        self.vlc_instance = vlc.Instance()
+    def __init__(self, instance_args=None):
+        """
+        Args:
+            instance_args (list): libvlc arguments, e.g. the ones of a live
+                view profile. They only apply at instance creation.
+        """
+        self.vlc_instance = vlc.Instance(list(instance_args or []))
         self.media_player = self.vlc_instance.media_player_new()
         self.media_player.audio_set_volume(0)
         self.playback_speed = 1.0
@@ -137,9 +221,16 @@ class VLCPlayer(Player):
         self.zoom_level = 0
         self.zoom_levels = [0, 2.0, 4.0]
 
-    def load(self, media_path):
+    def load(self, media_path, options=None):
+        """
+        Load a media file or stream.
+
+        Args:
+            media_path (str): Path or URL of the media.
+            options (list): Media options, e.g. ":network-caching=50".
+        """
         try:
-            media = self.vlc_instance.media_new(media_path)
+            media = self.vlc_instance.media_new(media_path, *(options or []))
             self.media_player.set_media(media)
             return True
         except Exception:
@@ -151,6 +242,44 @@ class VLCPlayer(Player):
     def pause(self):
         self.media_player.pause()
 
+    def switch_media(self, media_path, seconds):
+        was_playing = self.media_player.is_playing()
+        try:
+            media = self.vlc_instance.media_new(media_path)
+            # Set before playback starts: set_time is ignored until then
+            media.add_option(f":start-time={max(0.0, seconds):.3f}")
+            self.media_player.set_media(media)
+        except Exception:
+            return False
+        self.media_player.play()
+        if not was_playing:
+            self._pause_when_playing()
+        self.media_player.set_rate(self.playback_speed)
+        return True
+
+    def set_time_changed_callback(self, callback):
+        event_manager = self.media_player.event_manager()
+        for event_type in (
+            vlc.EventType.MediaPlayerTimeChanged,
+            vlc.EventType.MediaPlayerEndReached,
+        ):
+            event_manager.event_attach(event_type, lambda event: callback())
+        return True
+
+    def _pause_when_playing(self):
+        """Pause once VLC has started playing (it ignores pause before)."""
+        event_manager = self.media_player.event_manager()
+
+        def pause():
+            event_manager.event_detach(vlc.EventType.MediaPlayerPlaying)
+            self.media_player.set_pause(1)
+
+        def on_playing(event):
+            # libvlc must not be called from its own callbacks
+            threading.Thread(target=pause, daemon=True).start()
+
+        event_manager.event_attach(vlc.EventType.MediaPlayerPlaying, on_playing)
+
     def stop(self):
         self.media_player.stop()
         # Reset zoom to default when stopping
@@ -184,7 +313,38 @@ class VLCPlayer(Player):
         return self.set_speed(self.speed_levels[next_index])
 
     def seek(self, position):
-        self.media_player.set_position(position)
+        if self.frame_index is not None:
+            # Exact time from the index rather than a demuxer estimate
+            self.media_player.set_time(int(position * self.frame_index.duration * 1000))
+        else:
+            self.media_player.set_position(position)
+
+    def seek_to_time(self, seconds, exact=True):
+        # VLC seeks precisely by default, exact or not
+        self.media_player.set_time(int(max(0.0, seconds) * 1000))
+
+    def step_forward(self):
+        self.media_player.next_frame()
+
+    def step_backward(self):
+        # No backward stepping in VLC: seek one frame back while paused
+        self.media_player.set_pause(1)
+        frame_number = self.get_frame_index()
+        if frame_number <= 0:
+            return
+        if self.frame_index is not None:
+            self.seek_to_time(self.frame_index.frame_time(frame_number - 1))
+        else:
+            self.seek_to_time((frame_number - 1) / self._fps())
+
+    def get_frame_index(self):
+        current_time = self.media_player.get_time() / 1000.0
+        if self.frame_index is not None:
+            return self.frame_index.frame_at(current_time)
+        return int(current_time * self._fps())
+
+    def _fps(self):
+        return self.media_player.get_fps() or 30.0
 
     def get_time(self):
         current_time = self.media_player.get_time() / 1000.0
@@ -355,9 +515,49 @@ class OpenCVPlayer(Player):
         if self.cap is None:
             return
 
-        total_frames = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
-        frame_position = int(position * total_frames)
+        if self.frame_index is not None:
+            index = self.frame_index
+            frame_position = index.frame_at(position * index.duration)
+        else:
+            total_frames = self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+            frame_position = int(position * total_frames)
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_position)
+
+    def seek_to_time(self, seconds, exact=True):
+        if self.cap is None:
+            return
+
+        if self.frame_index is not None:
+            frame_position = self.frame_index.frame_at(seconds)
+        else:
+            frame_position = int(seconds * self.cap.get(cv2.CAP_PROP_FPS))
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, max(0, frame_position))
+
+    def step_forward(self):
+        if self.cap is None:
+            return
+
+        self.is_paused = True
+        ret, frame = self.cap.read()
+        if ret:
+            self.current_frame = frame
+            cv2.imshow(self.window_name, frame)
+
+    def step_backward(self):
+        if self.cap is None:
+            return
+
+        # The next read is the frame after the one shown
+        frame_position = self.cap.get(cv2.CAP_PROP_POS_FRAMES) - 2
+        if frame_position < 0:
+            return
         self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_position)
+        self.step_forward()
+
+    def get_frame_index(self):
+        if self.cap is None:
+            return 0
+        return max(0, int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1)
 
     def get_time(self):
         if self.cap is None:
@@ -380,3 +580,547 @@ class OpenCVPlayer(Player):
 
     def set_video_output(self, win_id):
         pass
+
+
+class _FrameEmitter(QObject):
+    """Carries the frames of a PyAVPlayer to the GUI thread."""
+
+    frame_ready = Signal(object)  # numpy array (height, width, 3), RGB24
+
+
+class PyAVPlayer(Player):
+    """
+    Player decoding with PyAV, for an embedded VideoSurface.
+    A worker thread decodes ahead (multi-threaded codec) into a bounded
+    queue; a presenter thread paces the frames on their timestamps and
+    publishes them through frame_ready, as RGB arrays a QImage can wrap.
+    Times are counted from the first frame, like in the frame index.
+    Stepping forward takes the next decoded frame from the queue. Stepping
+    backward decodes the GOP of the previous frame once, on a stepper
+    thread with its own container, which publishes the frame when decoded;
+    steps requested meanwhile only move its target. Decoded GOPs (stepped
+    through, or played from their keyframe) go to a GopCache, from which
+    steps and exact seeks in recently viewed regions are served without
+    decoding.
+    """
+
+    # Decoded frames queued ahead of the display
+    DECODE_AHEAD = 8
+    # Frames later than this (seconds) are dropped if newer ones are queued
+    MAX_LATENESS = 0.1
+
+    def __init__(self, gop_cache: Optional[GopCache] = None):
+        """
+        Args:
+            gop_cache: Cache of decoded GOPs, possibly shared with other
+                players; a default-sized one if None.
+        """
+        self._emitter = _FrameEmitter()
+        self.frame_ready = self._emitter.frame_ready
+        self._container = None
+        self._stream = None
+        self._start_pts = 0
+        self._duration = 0.0
+        self._frame_duration = 1 / 30
+        self.playback_speed = 1.0
+        self.speed_levels = [0.25, 0.5, 0.75, 1.0]
+
+        # Playback state, shared with the presenter thread
+        self._condition = threading.Condition()
+        self._playing = False
+        self._position = 0.0
+        # Media time shown at the monotonic clock origin
+        self._clock_origin = 0.0
+        self._clock_media = 0.0
+
+        self._stopped: Optional[threading.Event] = None
+        self._queue: Optional[FrameQueue] = None
+        self._threads = []
+        # Frames the presenter must show although paused
+        self._steps = 0
+        self._time_changed = None
+
+        # Backward stepping: frame the stepper thread must show, None if idle
+        self._media_path = None
+        self._step_target = None
+        self._stepper = None
+        self._stepper_stopped: Optional[threading.Event] = None
+        self._gop_cache = gop_cache if gop_cache is not None else GopCache()
+        self._cache_key = None
+        # A frame was shown from the cache: the queue does not follow it.
+        # Written by the stepper thread too, under _condition
+        self._displaced = False
+
+    def load(self, media_path):
+        self._stop_threads()
+        self._close()
+        try:
+            self._container = self._open(media_path)
+            self._stream = self._container.streams.video[0]
+        except (av.error.FFmpegError, OSError) as e:
+            logger.error(f"Cannot open {media_path}: {str(e)}")
+            self._close()
+            return False
+        self._media_path = str(media_path)
+        # Cached frames stay valid while the file is unchanged
+        self._cache_key = (self._media_path, os.stat(media_path).st_mtime_ns)
+        self._start_pts = self._stream.start_time or 0
+        if self._stream.average_rate:
+            self._frame_duration = float(1 / self._stream.average_rate)
+        if self._stream.duration is not None:
+            self._duration = float(self._stream.duration * self._stream.time_base)
+        elif self._container.duration is not None:
+            self._duration = self._container.duration / av.time_base
+        else:
+            self._duration = 0.0
+        with self._condition:
+            self._playing = False
+        self._start_threads(0.0)
+        self._start_stepper()
+        return True
+
+    @staticmethod
+    def _open(media_path):
+        """
+        Open a media for decoding.
+
+        Raises:
+            av.error.FFmpegError: If it cannot be opened or has no video.
+        """
+        container = av.open(str(media_path))
+        if not container.streams.video:
+            container.close()
+            raise av.error.InvalidDataError(0, "no video stream")
+        # Frame and slice threads, as many as the codec can use
+        codec_context = container.streams.video[0].codec_context
+        codec_context.thread_type = "AUTO"
+        codec_context.thread_count = 0
+        return container
+
+    def _close(self):
+        self._stop_stepper()
+        if self._container is not None:
+            self._container.close()
+        self._container = None
+        self._stream = None
+        self._cache_key = None
+        with self._condition:
+            self._displaced = False
+
+    def _frame_time(self, frame, previous: float) -> float:
+        """
+        Time of a decoded frame. Frames without pts (some raw H.264 muxes)
+        fall back to their dts, or to the frame after the previous time.
+        """
+        pts = frame.pts if frame.pts is not None else frame.dts
+        if pts is None:
+            return previous + self._frame_duration
+        return float((pts - self._start_pts) * self._stream.time_base)
+
+    def _frame_number(self, seconds) -> int:
+        """Number of the frame shown at a time."""
+        if self.frame_index is not None:
+            # Times computed from the index must map back to their frame
+            return self.frame_index.frame_at(seconds + 1e-6)
+        return int(round(seconds / self._frame_duration))
+
+    def _frame_start(self, frame_number) -> float:
+        """Time of a frame."""
+        if self.frame_index is not None:
+            return self.frame_index.frame_time(frame_number)
+        return frame_number * self._frame_duration
+
+    def _frame_count(self) -> int:
+        if self.frame_index is not None:
+            return self.frame_index.frame_count
+        return int(round(self._duration / self._frame_duration))
+
+    def _start_threads(self, seconds, exact=True):
+        """Decode and present from a time; the first frame is shown at once."""
+        self._stopped = threading.Event()
+        self._queue = FrameQueue(self.DECODE_AHEAD, DropPolicy.BLOCK)
+        with self._condition:
+            self._steps = 0
+            self._displaced = False
+        self._threads = [
+            threading.Thread(
+                target=self._decode_loop,
+                args=(seconds, exact, self._queue, self._stopped),
+                name="PyAVDecoder",
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._present_loop,
+                args=(self._queue, self._stopped),
+                name="PyAVPresenter",
+                daemon=True,
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _stop_threads(self):
+        if self._stopped is None:
+            return
+        self._stopped.set()
+        self._queue.close()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self._stopped = None
+        self._queue = None
+
+    def _seek_keyframe(self, container, seconds) -> float:
+        """
+        Seek a container to the keyframe at or before a time.
+
+        Returns:
+            float: Time of the keyframe, or the time sought without index.
+        """
+        if self.frame_index is not None:
+            seconds, _, _ = self.frame_index.keyframe_before(seconds)
+        container.seek(
+            self._start_pts + int(seconds / self._stream.time_base),
+            stream=container.streams.video[0],
+            backward=True,
+        )
+        return seconds
+
+    def _decode_loop(self, seconds, exact, queue: FrameQueue, stopped: threading.Event):
+        """
+        Decode from the keyframe before a time and queue the frames from that
+        time, or from the keyframe if not exact.
+        """
+        try:
+            frame_time = (
+                self._seek_keyframe(self._container, seconds) - self._frame_duration
+            )
+            first = seconds - self._frame_duration / 2 if exact else float("-inf")
+            # GOP being decoded, cached if all its frames were converted
+            gop = None
+            for frame in self._container.decode(self._stream):
+                if stopped.is_set():
+                    gop = None
+                    break
+                frame_time = self._frame_time(frame, frame_time)
+                if frame.key_frame:
+                    if gop:
+                        self._gop_cache.put(self._cache_key, gop)
+                    gop = {} if frame_time >= first else None
+                if frame_time < first:
+                    continue
+                image = frame.to_ndarray(format="rgb24")
+                if gop is not None:
+                    gop[self._frame_number(frame_time)] = self._gop_cache.prepare(frame)
+                if not queue.put((frame_time, image)):
+                    gop = None
+                    break
+            if gop:
+                self._gop_cache.put(self._cache_key, gop)
+        except av.error.FFmpegError as e:
+            logger.error(f"PyAV player decode error: {str(e)}")
+        except Exception as e:
+            # Logged, the queue is closed as at the end of the media
+            logger.error(f"PyAV player decoder failed: {str(e)}")
+        finally:
+            queue.close()
+
+    def _present_loop(self, queue: FrameQueue, stopped: threading.Event):
+        """Publish the queued frames at their time on the playback clock."""
+        show_next = True
+        pending = None
+        while not stopped.is_set():
+            if pending is None:
+                pending = queue.get(timeout=0.5)
+                if pending is None:
+                    if queue.is_drained():
+                        self._notify_time_changed()
+                        break  # End of media
+                    continue
+            frame_time, image = pending
+            with self._condition:
+                if stopped.is_set():
+                    break
+                if self._steps and not show_next:
+                    self._steps -= 1
+                    show_next = True
+                if not show_next:
+                    if not self._playing:
+                        self._condition.wait()
+                        continue
+                    delay = (
+                        self._clock_origin
+                        + (frame_time - self._clock_media) / self.playback_speed
+                        - time.monotonic()
+                    )
+                    if delay > 0:
+                        # Woken up early by a pause or a speed change
+                        self._condition.wait(delay)
+                        continue
+                    if -delay > self.MAX_LATENESS and len(queue):
+                        pending = None
+                        continue
+                self._position = frame_time
+                if show_next:
+                    self._anchor_clock()
+                    show_next = False
+            self.frame_ready.emit(image)
+            self._notify_time_changed()
+            pending = None
+
+    def set_time_changed_callback(self, callback):
+        self._time_changed = callback
+        return True
+
+    def _notify_time_changed(self):
+        if self._time_changed is not None:
+            self._time_changed()
+
+    def _anchor_clock(self):
+        """Restart the playback clock at the current position (lock held)."""
+        self._clock_origin = time.monotonic()
+        self._clock_media = self._position
+
+    def play(self):
+        if self._container is None:
+            return
+        self._cancel_step()
+        with self._condition:
+            displaced = self._displaced
+        if displaced:
+            # Resume after the frame shown from the cache
+            self._restart(self._position)
+        with self._condition:
+            if self._playing:
+                return
+            self._playing = True
+            self._anchor_clock()
+            self._condition.notify_all()
+
+    def pause(self):
+        with self._condition:
+            self._playing = False
+            self._condition.notify_all()
+
+    def stop(self):
+        self.pause()
+        if self._container is not None:
+            self._seek_time(0.0)
+
+    def _seek_time(self, seconds, exact=True):
+        """
+        Show a time, keeping the play state. A cached frame is shown at once;
+        decoding restarts there when playing, or on play or step if paused.
+        """
+        if self._container is None:
+            return
+        self._cancel_step()
+        duration = self._media_duration()
+        seconds = min(max(0.0, seconds), max(0.0, duration - self._frame_duration))
+        if exact:
+            frame_number = self._frame_number(seconds)
+            image = self._gop_cache.get(self._cache_key, frame_number)
+            if image is not None:
+                self._show_cached(frame_number, image)
+                if not self._playing:
+                    return
+                seconds = self._position
+        self._restart(seconds, exact)
+
+    def _restart(self, seconds, exact=True):
+        """Restart decoding and presenting at a time."""
+        self._stop_threads()
+        with self._condition:
+            self._position = seconds
+        self._start_threads(seconds, exact)
+
+    def seek_to_time(self, seconds, exact=True):
+        self._seek_time(seconds, exact)
+
+    def step_forward(self):
+        self.pause()
+        frame_number = self.get_frame_index() + 1
+        if self._container is None or frame_number >= self._frame_count():
+            return
+        self._cancel_step()
+        with self._condition:
+            displaced = self._displaced
+        image = self._gop_cache.get(self._cache_key, frame_number)
+        if image is not None:
+            self._show_cached(frame_number, image)
+        elif displaced or not self._threads[-1].is_alive():
+            # No presenter following the frame shown
+            self._restart(self._frame_start(frame_number))
+        else:
+            # Already decoded ahead: the presenter shows it
+            with self._condition:
+                self._steps += 1
+                self._condition.notify_all()
+
+    def step_backward(self):
+        self.pause()
+        frame_number = self.get_frame_index() - 1
+        if self._container is None or frame_number < 0:
+            return
+        image = self._gop_cache.get(self._cache_key, frame_number)
+        with self._condition:
+            if image is None or self._step_target is not None:
+                # Decoded (or shown after the pending step) by the stepper
+                self._step_target = frame_number
+                self._condition.notify_all()
+                return
+        self._show_cached(frame_number, image)
+
+    def _start_stepper(self):
+        self._stepper_stopped = threading.Event()
+        self._stepper = threading.Thread(
+            target=self._step_loop,
+            args=(self._media_path, self._cache_key, self._stepper_stopped),
+            name="PyAVStepper",
+            daemon=True,
+        )
+        self._stepper.start()
+
+    def _stop_stepper(self):
+        if self._stepper is None:
+            return
+        self._stepper_stopped.set()
+        with self._condition:
+            self._step_target = None
+            self._condition.notify_all()
+        self._stepper.join()
+        self._stepper = None
+        self._stepper_stopped = None
+
+    def _cancel_step(self):
+        """Drop the pending backward step, superseded by another command."""
+        with self._condition:
+            self._step_target = None
+
+    def _step_loop(self, media_path, cache_key, stopped: threading.Event):
+        """Show the frames requested by step_backward, decoding their GOP."""
+        container = None
+        try:
+            while True:
+                with self._condition:
+                    while self._step_target is None and not stopped.is_set():
+                        self._condition.wait()
+                    if stopped.is_set():
+                        return
+                    frame_number = self._step_target
+                image = self._gop_cache.get(cache_key, frame_number)
+                if image is None:
+                    if container is None:
+                        container = self._open_quietly(media_path)
+                    if container is not None:
+                        frames = self._decode_gop(
+                            container, cache_key, frame_number, stopped
+                        )
+                        if frame_number in frames:
+                            image = GopCache.to_rgb(frames[frame_number])
+                with self._condition:
+                    if self._step_target != frame_number:
+                        continue  # Stepped again, or superseded meanwhile
+                    self._step_target = None
+                    if image is None:
+                        continue
+                    self._position = self._frame_start(frame_number)
+                    self._steps = 0
+                    self._displaced = True
+                self.frame_ready.emit(image)
+                self._notify_time_changed()
+        finally:
+            if container is not None:
+                container.close()
+
+    def _open_quietly(self, media_path):
+        """Open a media for decoding, None if it cannot be opened."""
+        try:
+            return self._open(media_path)
+        except av.error.FFmpegError as e:
+            logger.error(f"Cannot open {media_path}: {str(e)}")
+            return None
+
+    def _decode_gop(self, container, cache_key, frame_number, stopped) -> dict:
+        """
+        Decode the whole GOP of a frame into the cache.
+
+        Returns:
+            dict: Frames of the GOP by number, also when too large to cache.
+        """
+        frames = {}
+        try:
+            frame_time = (
+                self._seek_keyframe(container, self._frame_start(frame_number))
+                - self._frame_duration
+            )
+            for frame in container.decode(container.streams.video[0]):
+                if stopped.is_set():
+                    return frames
+                if frame.key_frame and frames:
+                    break  # Next GOP
+                frame_time = self._frame_time(frame, frame_time)
+                number = self._frame_number(frame_time)
+                frames[number] = self._gop_cache.prepare(frame)
+        except av.error.FFmpegError as e:
+            logger.error(f"PyAV player decode error: {str(e)}")
+        except Exception as e:
+            logger.error(f"PyAV player decoder failed: {str(e)}")
+        self._gop_cache.put(cache_key, frames)
+        return frames
+
+    def _show_cached(self, frame_number, image):
+        """Show a cached frame, out of the decode-ahead queue."""
+        with self._condition:
+            self._position = self._frame_start(frame_number)
+            self._steps = 0
+            self._displaced = True
+        self.frame_ready.emit(image)
+        self._notify_time_changed()
+
+    def get_frame_index(self):
+        with self._condition:
+            if self._step_target is not None:
+                return self._step_target
+            return self._frame_number(self._position) + self._steps
+
+    def _media_duration(self) -> float:
+        if self.frame_index is not None:
+            return self.frame_index.duration
+        return self._duration
+
+    def rewind(self, seconds=10):
+        self._seek_time(self._position - seconds)
+
+    def forward(self, seconds=10):
+        self._seek_time(self._position + seconds)
+
+    def set_speed(self, speed):
+        if speed in self.speed_levels:
+            with self._condition:
+                self._anchor_clock()
+                self.playback_speed = speed
+                self._condition.notify_all()
+        return self.playback_speed
+
+    def decrease_speed(self):
+        try:
+            current_index = self.speed_levels.index(self.playback_speed)
+        except ValueError:
+            current_index = self.speed_levels.index(1.0)
+
+        next_index = (current_index - 1) % len(self.speed_levels)
+        return self.set_speed(self.speed_levels[next_index])
+
+    def seek(self, position):
+        self.seek_to_time(position * self._media_duration())
+
+    def get_time(self):
+        return self._position, self._media_duration()
+
+    def cleanup(self):
+        self.pause()
+        self._stop_threads()
+        self._close()
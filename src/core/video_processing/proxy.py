@@ -0,0 +1,100 @@
+"""
+Proxy renditions.
+A proxy is a low-resolution, short-GOP copy of a video: every seek lands
+close to a keyframe and decodes a small frame, so scrubbing stays fluid on
+slow machines. Proxies keep the timestamps of their master and live in the
+"proxies" app data directory, named after the master stem and a hash of its
+path.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import av
+
+from src.core.logging_config import logger
+from src.core.video_processing.atomic_publish import partial_path, publish
+from src.utils.resource_manager import ResourceManager
+
+PROXY_HEIGHT = 480
+PROXY_GOP = 15  # frames between keyframes
+# Encoder threads: the proxy is a background job, leave cores to the UI
+PROXY_THREADS = 2
+
+
+def proxy_path(video_path: Path) -> Path:
+    """Path of the proxy of a video."""
+    return ResourceManager.get_sidecar_path(
+        "proxies", video_path, Path(video_path).suffix
+    )
+
+
+def find_proxy(video_path: Path) -> Optional[Path]:
+    """Proxy of a video, None if missing or older than the video."""
+    path = proxy_path(video_path)
+    try:
+        if path.stat().st_mtime >= Path(video_path).stat().st_mtime:
+            return path
+    except OSError:
+        pass
+    return None
+
+
+def build_proxy(video_path: Path) -> Path:
+    """
+    Encode the proxy of a video (video only, the players are muted).
+    Written under a partial name and published atomically.
+
+    Returns:
+        Path: The proxy path.
+
+    Raises:
+        Exception: If the video cannot be decoded or the proxy written.
+    """
+    video_path = Path(video_path)
+    path = proxy_path(video_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = partial_path(path)
+    try:
+        with av.open(str(video_path)) as source:
+            in_stream = source.streams.video[0]
+            in_stream.thread_type = "AUTO"
+            in_stream.codec_context.thread_count = PROXY_THREADS
+
+            scale = min(1.0, PROXY_HEIGHT / in_stream.codec_context.height)
+            width = int(in_stream.codec_context.width * scale) & ~1
+            height = int(in_stream.codec_context.height * scale) & ~1
+
+            with av.open(str(partial), mode="w", format="mp4") as output:
+                out_stream = output.add_stream(
+                    "libx264",
+                    rate=in_stream.average_rate or 30,
+                    options={
+                        "preset": "veryfast",
+                        "crf": "28",
+                        "g": str(PROXY_GOP),
+                        "keyint_min": str(PROXY_GOP),
+                        "sc_threshold": "0",
+                    },
+                )
+                out_stream.width = width
+                out_stream.height = height
+                out_stream.pix_fmt = "yuv420p"
+                out_stream.time_base = in_stream.time_base
+                out_stream.codec_context.time_base = in_stream.time_base
+                out_stream.codec_context.thread_count = PROXY_THREADS
+
+                for frame in source.decode(in_stream):
+                    if frame.pts is None:
+                        continue
+                    proxy_frame = frame.reformat(width, height, format="yuv420p")
+                    proxy_frame.pts = frame.pts
+                    proxy_frame.time_base = in_stream.time_base
+                    output.mux(out_stream.encode(proxy_frame))
+                output.mux(out_stream.encode(None))
+        publish(partial, path)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        raise
+    logger.info(f"Proxy written: {path}")
+    return path
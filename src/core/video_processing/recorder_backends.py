@@ -0,0 +1,506 @@
+"""
+Recorder backends.
+A backend knows how to read media items from the live stream and how to
+write them to the output file. RecordingThread drives it.
+"""
+
+from abc import ABC, abstractmethod
+from fractions import Fraction
+from pathlib import Path
+from typing import Optional
+
+import av
+import cv2
+
+from src.core.logging_config import logger
+from src.core.video_processing.disk_writer import WriteBehindFile
+
+
+class RecorderBackend(ABC):
+    """
+    Abstract interface for a recorder backend.
+    An item is whatever the backend reads from the stream (a decoded frame,
+    a compressed packet...). It is only ever handed back to the same backend.
+    """
+
+    name = ""
+
+    # Default capacity of the queue between the capture and writer stages
+    QUEUE_SIZE = 64
+
+    # Source video frames written since the backend was created
+    frames_written = 0
+
+    # Output options set by RecordingThread: seconds between fsyncs of a
+    # write-behind output (None writes directly), DiskMonitor to report to
+    fsync_interval: Optional[float] = None
+    disk_monitor = None
+
+    @abstractmethod
+    def open_input(self, input_url: str) -> None:
+        """
+        Open the live stream.
+
+        Args:
+            input_url: URL of the stream to record.
+
+        Raises:
+            Exception: If the stream cannot be opened.
+        """
+        pass
+
+    @abstractmethod
+    def open_shared_input(self, streams: list) -> None:
+        """
+        Record packets demuxed by a StreamIngestThread instead of opening
+        the stream. Items are then pushed by the ingest, read is not called.
+
+        Args:
+            streams: Streams of the ingest input.
+
+        Raises:
+            NotImplementedError: If the backend cannot write shared packets.
+        """
+        pass
+
+    @abstractmethod
+    def open_output(self, output_file: Path) -> None:
+        """
+        Create the output file. Must be called after open_input.
+
+        Args:
+            output_file: Path of the file to write.
+
+        Raises:
+            Exception: If the file cannot be created.
+        """
+        pass
+
+    def reopen_input(self, input_url: str) -> None:
+        """
+        Open the stream again after it was lost. Items read afterwards are
+        reported by starts_new_input.
+
+        Raises:
+            Exception: If the stream cannot be opened.
+        """
+        self.close_input()
+        self.open_input(input_url)
+
+    @abstractmethod
+    def read(self):
+        """
+        Read the next item from the stream.
+
+        Returns:
+            The item, or None when the stream has ended or was lost.
+        """
+        pass
+
+    @abstractmethod
+    def write(self, item) -> None:
+        """Write an item previously returned by read."""
+        pass
+
+    @abstractmethod
+    def item_time(self, item) -> Optional[float]:
+        """
+        Get the stream time of an item.
+
+        Returns:
+            Optional[float]: Time in seconds, or None if the item carries no
+            usable time (e.g. an audio packet).
+        """
+        pass
+
+    @abstractmethod
+    def is_split_point(self, item) -> bool:
+        """True if a new output file can start with this item."""
+        pass
+
+    @property
+    @abstractmethod
+    def media_time(self) -> float:
+        """
+        Duration of media written to the current output file, in seconds,
+        measured on the stream timestamps of the written frames.
+        """
+        pass
+
+    def on_items_dropped(self) -> None:
+        """
+        Called by the writer before the next write when queued items were
+        dropped. Backends writing compressed data resynchronize here.
+        """
+        pass
+
+    @abstractmethod
+    def starts_new_input(self, item) -> bool:
+        """
+        True if the item is the first one of a reopened stream. Called by
+        the writer once per item, in order.
+        """
+        pass
+
+    @abstractmethod
+    def continue_timeline(self) -> None:
+        """
+        Called by the writer after starts_new_input: the next items are
+        written right after the media already in the output file, whatever
+        their stream timestamps.
+        """
+        pass
+
+    @abstractmethod
+    def close_output(self) -> None:
+        """Finalize and close the output file."""
+        pass
+
+    @abstractmethod
+    def close_input(self) -> None:
+        """Close the live stream."""
+        pass
+
+
+class OpenCVRecorderBackend(RecorderBackend):
+    """
+    Legacy backend: decodes every frame with OpenCV and re-encodes it as MP4V.
+    Video only, the audio track is lost.
+    VideoWriter has a constant frame rate, so frames are duplicated or
+    skipped according to their stream timestamp to keep the real timing.
+    """
+
+    name = "opencv"
+
+    # Decoded 1080p frames weigh ~6 MB each
+    QUEUE_SIZE = 30
+
+    def __init__(self):
+        self._cap = None
+        self._writer = None
+        self._fps = 0.0
+        # Output size, from the first opening: the writer opens fragments
+        # while the stream is being reopened
+        self._frame_size = None
+        self._frames_read = 0
+        # Frames in the output file, duplicates included
+        self._output_frames = 0
+        self._origin = None
+        # Frames of the output file before the current timeline started
+        self._base_frames = 0
+        # Number of times the stream was opened, tagged on every item
+        self._generation = 0
+        self._last_generation = None
+
+    def open_input(self, input_url: str) -> None:
+        cap = cv2.VideoCapture(input_url)
+        if not cap.isOpened():
+            cap.release()
+            raise Exception("Could not open video stream")
+        if self._frame_size is None:
+            self._frame_size = (
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            )
+        # Keep the fractional rate (29.97 must not become 29)
+        self._fps = self._fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self._frames_read = 0
+        self._generation += 1
+        self._cap = cap
+
+    def open_shared_input(self, streams: list) -> None:
+        # Items are decoded frames read from its own capture, not packets
+        raise NotImplementedError("opencv backend cannot share its input")
+
+    def open_output(self, output_file: Path) -> None:
+        if self._frame_size is None:
+            raise Exception("Video stream was never opened")
+
+        fourcc = cv2.VideoWriter_fourcc(*"mp4v")  # MP4V codec
+        self._writer = cv2.VideoWriter(
+            str(output_file), fourcc, self._fps, self._frame_size, True  # isColor
+        )
+        if not self._writer.isOpened():
+            raise Exception("Could not create video writer")
+        self._output_frames = 0
+        self._origin = None
+        self._base_frames = 0
+
+    def reopen_input(self, input_url: str) -> None:
+        # The lost capture is only replaced once the new one is open
+        lost = self._cap
+        self.open_input(input_url)
+        if lost is not None:
+            lost.release()
+
+    def read(self):
+        ret, frame = self._cap.read()
+        if not ret:
+            return None
+        self._frames_read += 1
+        timestamp = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if timestamp <= 0:
+            # No stream timestamp: assume a constant rate
+            timestamp = self._frames_read / self._fps
+        return frame, timestamp, self._generation
+
+    def write(self, item) -> None:
+        frame, timestamp, _ = item
+        if self._origin is None:
+            self._origin = timestamp
+        # Number of frames the file must hold once this one is shown
+        target = self._base_frames + max(
+            1, round((timestamp - self._origin) * self._fps) + 1
+        )
+        if target <= self._output_frames:
+            return  # Ahead of the stream timing
+        if (frame.shape[1], frame.shape[0]) != self._frame_size:
+            # Reopened stream of another size: VideoWriter would drop it
+            frame = cv2.resize(frame, self._frame_size)
+        for _ in range(target - self._output_frames):
+            self._writer.write(frame)
+        self._output_frames = target
+        self.frames_written += 1
+
+    def item_time(self, item) -> Optional[float]:
+        return item[1]
+
+    def starts_new_input(self, item) -> bool:
+        generation = item[2]
+        is_new = self._last_generation not in (None, generation)
+        self._last_generation = generation
+        return is_new
+
+    def continue_timeline(self) -> None:
+        self._origin = None
+        self._base_frames = self._output_frames
+
+    def is_split_point(self, item) -> bool:
+        return True
+
+    @property
+    def media_time(self) -> float:
+        if not self._fps:
+            return 0.0  # The stream was never opened
+        return self._output_frames / self._fps
+
+    def close_output(self) -> None:
+        if self._writer:
+            self._writer.release()
+            self._writer = None
+
+    def close_input(self) -> None:
+        if self._cap:
+            self._cap.release()
+            self._cap = None
+
+
+class PyAVRecorderBackend(RecorderBackend):
+    """
+    Stream-copy backend: remuxes the H.264/AAC packets of the live stream
+    into an MP4 container without decoding them.
+    Timestamps are rebased so the file starts at 0 on the first keyframe.
+    The muxer writes through a WriteBehindFile when fsync_interval is set.
+    """
+
+    name = "pyav"
+
+    # Compressed packets are small: several seconds of video and audio
+    QUEUE_SIZE = 512
+
+    # (open timeout, read timeout) in seconds
+    TIMEOUT = (10.0, 5.0)
+
+    def __init__(self):
+        self._input = None
+        self._output = None
+        self._file = None
+        self._demuxer = None
+        self._streams = []
+        self._stream_map = {}
+        self._origin = None
+        self._resync = False
+        self._video_start = None
+        self._video_end = 0.0
+        # Output time the current timeline starts at, in seconds
+        self._timeline_base = 0.0
+        self._last_container = None
+        self._last_dts = {}
+
+    def open_input(self, input_url: str) -> None:
+        self._input = av.open(input_url, timeout=self.TIMEOUT)
+        self._streams = [
+            stream
+            for stream in self._input.streams
+            if stream.type in ("video", "audio")
+        ]
+        if not any(stream.type == "video" for stream in self._streams):
+            raise Exception("No video track found in stream")
+        self._demuxer = self._input.demux(*self._streams)
+
+    def open_shared_input(self, streams: list) -> None:
+        if not any(stream.type == "video" for stream in streams):
+            raise Exception("No video track found in stream")
+        self._streams = streams
+
+    def open_output(self, output_file: Path) -> None:
+        if self.fsync_interval is None:
+            self._output = av.open(str(output_file), mode="w", format="mp4")
+        else:
+            self._file = WriteBehindFile(
+                output_file, self.fsync_interval, self.disk_monitor
+            )
+            self._output = av.open(self._file, mode="w", format="mp4")
+        self._stream_map = {
+            stream.index: add_copy_stream(self._output, stream)
+            for stream in self._streams
+        }
+        self._origin = None
+        self._resync = False
+        self._video_start = None
+        self._video_end = 0.0
+        self._timeline_base = 0.0
+        self._last_dts = {}
+
+    def reopen_input(self, input_url: str) -> None:
+        # Queued packets still reference the old input: it is released
+        # with the last of them instead of being closed here
+        self._input = None
+        self._demuxer = None
+        self.open_input(input_url)
+
+    def read(self):
+        try:
+            for packet in self._demuxer:
+                # Flush packets carry no data
+                if packet.dts is not None:
+                    return packet
+        except av.error.EOFError:
+            pass
+        except (av.error.FFmpegError, OSError) as e:
+            logger.warning(f"Recording stream read error: {str(e)}")
+        return None
+
+    def write(self, item) -> None:
+        packet = item
+        if self._origin is None:
+            # Start the file on a keyframe so it is decodable from frame 0
+            if packet.stream.type != "video" or not packet.is_keyframe:
+                return
+            self._origin = packet.dts * packet.time_base - Fraction(self._timeline_base)
+        elif self._resync:
+            # Packets were dropped: wait for the next keyframe to keep the
+            # video decodable, audio goes through
+            if packet.stream.type == "video":
+                if not packet.is_keyframe:
+                    return
+                self._resync = False
+
+        offset = int(self._origin / packet.time_base)
+        out_index = self._stream_map[packet.stream.index].index
+        last_dts = self._last_dts.get(out_index)
+        if packet.dts - offset < 0 or (
+            last_dts is not None and packet.dts - offset <= last_dts
+        ):
+            # Audio captured before the first keyframe, or overlapping the
+            # previous timeline
+            return
+        self._last_dts[out_index] = packet.dts - offset
+
+        # Packets may be shared with the pre-roll buffer: mux a copy
+        # instead of rebasing them in place
+        out_packet = av.Packet(packet)
+        out_packet.dts = packet.dts - offset
+        if packet.pts is not None:
+            out_packet.pts = packet.pts - offset
+        out_packet.duration = packet.duration
+        out_packet.time_base = packet.time_base
+        out_packet.is_keyframe = packet.is_keyframe
+        out_packet.stream = self._stream_map[packet.stream.index]
+
+        if packet.stream.type == "video":
+            # Media clock: presentation span of the written frames
+            pts = out_packet.pts if packet.pts is not None else out_packet.dts
+            start = float(pts * packet.time_base)
+            if self._video_start is None or start < self._video_start:
+                self._video_start = start
+            end = float((pts + (packet.duration or 0)) * packet.time_base)
+            self._video_end = max(self._video_end, end)
+            self.frames_written += 1
+
+        self._output.mux(out_packet)
+
+    def item_time(self, item) -> Optional[float]:
+        if item.stream.type != "video":
+            return None
+        return float(item.dts * item.time_base)
+
+    def is_split_point(self, item) -> bool:
+        return item.stream.type == "video" and item.is_keyframe
+
+    def starts_new_input(self, item) -> bool:
+        container = item.stream.container
+        is_new = self._last_container not in (None, container)
+        self._last_container = container
+        return is_new
+
+    def continue_timeline(self) -> None:
+        self._origin = None
+        self._resync = False
+        self._timeline_base = self._video_end
+
+    @property
+    def media_time(self) -> float:
+        if self._video_start is None:
+            return 0.0
+        return self._video_end - self._video_start
+
+    def on_items_dropped(self) -> None:
+        self._resync = True
+
+    def close_output(self) -> None:
+        if self._output:
+            try:
+                self._output.close()
+            except Exception as e:
+                logger.error(f"Error closing output container: {str(e)}")
+            self._output = None
+        if self._file:
+            file, self._file = self._file, None
+            # Raises the write-behind error (disk full...) so it is reported
+            file.close()
+
+    def close_input(self) -> None:
+        if self._input:
+            self._input.close()
+            self._input = None
+            self._demuxer = None
+
+
+def add_copy_stream(output, template):
+    """Add an output stream copying the codec parameters of template."""
+    if hasattr(output, "add_stream_from_template"):  # PyAV >= 14
+        return output.add_stream_from_template(template)
+    return output.add_stream(template=template)
+
+
+RECORDER_BACKENDS = {
+    OpenCVRecorderBackend.name: OpenCVRecorderBackend,
+    PyAVRecorderBackend.name: PyAVRecorderBackend,
+}
+
+
+def create_recorder_backend(name: str) -> RecorderBackend:
+    """
+    Instantiate a recorder backend by name.
+
+    Args:
+        name: One of RECORDER_BACKENDS keys ("pyav" or "opencv").
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    try:
+        return RECORDER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown recorder backend: {name}") from None
@@ -0,0 +1,247 @@
+"""
+Recorder running in a child process.
+The recording pipeline then has its own interpreter and GIL, so frame
+copies and file writes no longer compete with Qt painting and voice
+recognition. Control and status messages flow over a pipe:
+
+    parent -> child: ("stop", None)
+    child -> parent: ("started", path), ("stats", dict),
+                     ("reconnecting", bool), ("gap", (at, duration)),
+                     ("disk_warning", message), ("disk_full", stream path),
+                     ("stopped", path), ("error", message)
+"""
+
+import multiprocessing
+import threading
+import time
+from typing import Optional
+
+from PySide6.QtCore import Qt
+
+from src.core.event_handler import events
+from src.core.logging_config import logger
+from src.core.video_processing.frame_queue import DropPolicy
+from src.utils.resource_manager import ResourceManager
+
+# Seconds between two stats messages from the child
+STATS_INTERVAL = 0.25
+
+
+class RecordingProcess:
+    """
+    Parent side of a recorder child process, with the RecordingThread
+    interface so RecordingService drives both the same way.
+    Child messages are turned back into recording_started, recording_stopped
+    and recording_error events by a listener thread.
+    """
+
+    def __init__(
+        self,
+        backend: str = "pyav",
+        queue_size: Optional[int] = None,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        segment_duration: Optional[float] = None,
+        fsync_interval: Optional[float] = 5.0,
+        stream_path: str = ResourceManager.STREAMING_PATH,
+    ):
+        self.stream_path = stream_path
+        self._args = (
+            backend,
+            queue_size,
+            drop_policy,
+            segment_duration,
+            fsync_interval,
+            stream_path,
+        )
+        self._process = None
+        self._conn = None
+        self._listener = None
+        self._output_file = None
+        self._start_time = None
+        self._stats = {}
+        self._stats_time = None
+        self._gaps = []
+
+    def start_recording(self, ingest=None, output_file=None, start_barrier=None):
+        """
+        Start the child process without blocking the caller.
+
+        Args:
+            ingest: Ignored. An ingest cannot be shared across processes,
+                the child opens the stream itself (no pre-roll).
+            output_file: Recording path, timestamped by the child if None.
+            start_barrier: Barrier of the session, created from
+                multiprocessing_context().
+        """
+        self._output_file = output_file
+        context = multiprocessing_context()
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=run_recorder_process,
+            args=(child_conn, *self._args, output_file, start_barrier),
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._listener = threading.Thread(target=self._listen, daemon=True)
+        self._listener.start()
+
+    def _listen(self):
+        """Forward child messages until its final event or its exit."""
+        try:
+            while True:
+                kind, value = self._conn.recv()
+                if kind == "stats":
+                    self._stats = value
+                    self._stats_time = time.monotonic()
+                elif kind == "started":
+                    self._output_file = value
+                    self._start_time = time.monotonic()
+                    events.recording_started.emit(value)
+                elif kind == "reconnecting":
+                    events.recording_reconnecting.emit(value)
+                elif kind == "disk_warning":
+                    events.recording_disk_warning.emit(value)
+                elif kind == "disk_full":
+                    events.recording_disk_full.emit(value)
+                elif kind == "gap":
+                    self._gaps.append({"at": value[0], "duration": value[1]})
+                    events.recording_gap.emit(*value)
+                elif kind == "stopped":
+                    events.recording_stopped.emit(value)
+                    return
+                elif kind == "error":
+                    events.recording_error.emit(value)
+                    return
+        except (EOFError, OSError):
+            logger.error("Recording process exited unexpectedly")
+            events.recording_error.emit("Recording process exited unexpectedly")
+        finally:
+            self._process.join(timeout=5.0)
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def stop_recording(self):
+        """Ask the child to stop, without blocking the caller."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.send(("stop", None))
+        except (OSError, ValueError):
+            pass  # Child already gone
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for the child to finish writing.
+
+        Returns:
+            bool: True if the child exited within the timeout.
+        """
+        if self._process is None:
+            return True
+        self._process.join(timeout)
+        return not self._process.is_alive()
+
+    def get_stats(self) -> dict:
+        """Latest pipeline counters reported by the child."""
+        return dict(self._stats)
+
+    def get_gaps(self) -> list:
+        """Gaps reported by the child: dicts with media time "at" and "duration"."""
+        return list(self._gaps)
+
+    def get_media_time(self) -> float:
+        """
+        Media time of the recording in seconds, extrapolated from the last
+        stats message (at most two intervals ahead).
+        """
+        media_time = self._stats.get("media_time", 0.0)
+        if self._stats_time is None:
+            return media_time
+        elapsed = time.monotonic() - self._stats_time
+        return media_time + min(elapsed, 2 * STATS_INTERVAL)
+
+    def get_recording_duration(self) -> float:
+        """Get the current recording duration in seconds (wall clock)."""
+        if self._start_time is None:
+            return 0
+        return time.monotonic() - self._start_time
+
+
+def multiprocessing_context():
+    """Context of the recorder processes and of their synchronization objects."""
+    # spawn everywhere: forking a process running Qt threads is unsafe
+    return multiprocessing.get_context("spawn")
+
+
+def run_recorder_process(
+    conn,
+    backend,
+    queue_size,
+    drop_policy,
+    segment_duration,
+    fsync_interval,
+    stream_path,
+    output_file,
+    start_barrier,
+) -> None:
+    """Child process entry point: record until asked to stop."""
+    from src.core.video_processing.recording_service import RecordingThread
+
+    send_lock = threading.Lock()
+    finished = threading.Event()
+
+    def send(kind, value):
+        with send_lock:
+            try:
+                conn.send((kind, value))
+            except (OSError, ValueError):
+                pass  # Parent gone, the recording is still finalized
+
+    def on_finished(kind, value):
+        send(kind, value)
+        finished.set()
+
+    # No event loop in the child: the slots must run in the emitting thread
+    direct = Qt.ConnectionType.DirectConnection
+    events.recording_started.connect(lambda path: send("started", path), direct)
+    events.recording_stopped.connect(lambda path: on_finished("stopped", path), direct)
+    events.recording_error.connect(lambda error: on_finished("error", error), direct)
+    events.recording_reconnecting.connect(
+        lambda state: send("reconnecting", state), direct
+    )
+    events.recording_gap.connect(
+        lambda at, duration: send("gap", (at, duration)), direct
+    )
+    events.recording_disk_warning.connect(
+        lambda message: send("disk_warning", message), direct
+    )
+    events.recording_disk_full.connect(
+        lambda stream_path: send("disk_full", stream_path), direct
+    )
+
+    recorder = RecordingThread(
+        backend,
+        queue_size,
+        drop_policy,
+        segment_duration,
+        fsync_interval,
+        stream_path,
+    )
+    recorder.start_recording(output_file=output_file, start_barrier=start_barrier)
+    parent_alive = True
+    while not finished.is_set():
+        if parent_alive and conn.poll(STATS_INTERVAL):
+            try:
+                kind, _ = conn.recv()
+            except (EOFError, OSError):
+                logger.warning("Recording parent process exited, stopping")
+                parent_alive = False
+                kind = "stop"
+            if kind == "stop":
+                recorder.stop_recording()
+        elif not parent_alive:
+            finished.wait(STATS_INTERVAL)
+        send("stats", recorder.get_stats())
+    recorder.wait()
@@ -1,99 +1,478 @@
+import shutil
 import threading
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+from enum import Enum, auto
 from pathlib import Path
+from typing import List, Optional
 
-import cv2
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, QTimer
 
 from src.core.event_handler import events
 from src.core.logging_config import logger
+from src.core.streaming.stream_ingest import StreamIngestService, StreamIngestThread
+from src.core.video_processing.atomic_publish import partial_path, publish
+from src.core.video_processing.disk_writer import DiskMonitor
+from src.core.video_processing.finalizer import RecordingFinalizer
+from src.core.video_processing.frame_queue import DropPolicy, FrameQueue
+from src.core.video_processing.gap_markers import save_gaps
+from src.core.video_processing.recorder_backends import create_recorder_backend
+from src.core.video_processing.recording_process import (
+    RecordingProcess,
+    multiprocessing_context,
+)
+from src.core.video_processing.recording_session import RecordingSession
+from src.core.video_processing.segments import (
+    STITCH_MARGIN_BYTES,
+    SegmentManifest,
+    find_interrupted_recordings,
+    recover_segmented_recordings,
+    stitch_recording,
+)
 from src.utils.resource_manager import ResourceManager
 
 
+class RecordingState(Enum):
+    """Possible recording states, published through recording_status_changed."""
+
+    IDLE = auto()
+    STARTING = auto()
+    RECORDING = auto()
+    STOPPING = auto()
+
+
 class RecordingThread(threading.Thread):
     """
     Thread handling the recording process.
-    Manages FFmpeg process and file operations asynchronously.
+    The thread itself is the capture stage: it reads items from the stream
+    and pushes them to a bounded FrameQueue. A writer thread pops them and
+    writes them through the recorder backend, so a disk stall never backs up
+    into the network reader.
+    The output is written under a partial name and published under its
+    final name once complete.
+    With a segment duration, the writer rotates fixed-duration fragments
+    listed in a manifest and stitches them into the output file at stop.
+    With an fsync interval, backends that support it write through a
+    write-behind buffer; a DiskMonitor warns when the disk gets full or
+    slow, and stops the recording cleanly before the disk is full.
+    A lost stream is reopened with exponential backoff and the recording
+    continues, with a gap marker at the media time of the interruption.
+    With a start barrier, capture only starts once every recorder of the
+    session has opened its stream and file, so cameras start together.
     """
 
-    def __init__(self, parent=None):
+    # Seconds before the first reconnection attempt, doubled up to the max
+    RECONNECT_DELAY = 0.5
+    MAX_RECONNECT_DELAY = 10.0
+    # Seconds to wait for the other recorders of the session to be open
+    START_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        backend: str = "pyav",
+        queue_size: Optional[int] = None,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        segment_duration: Optional[float] = None,
+        fsync_interval: Optional[float] = 5.0,
+        stream_path: str = ResourceManager.STREAMING_PATH,
+        parent=None,
+    ):
         super().__init__(daemon=True)
+        self.stream_path = stream_path
         self._is_running = True
         self._output_file = None
-        self._cap = None
-        self._writer = None
+        self._backend = create_recorder_backend(backend)
+        self._backend.fsync_interval = fsync_interval
+        self._queue = FrameQueue(queue_size or self._backend.QUEUE_SIZE, drop_policy)
+        self._writer_thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._written = 0
+        self._segment_duration = segment_duration
+        self._manifest: Optional[SegmentManifest] = None
+        self._segment_start = None
+        self._ingest: Optional[StreamIngestThread] = None
         self._start_time = None
+        self._start_barrier = None
+        # Wall clock (epoch) of the first recorded media
+        self._start_timestamp = None
+        self._disk_monitor: Optional[DiskMonitor] = None
+        self._gaps = []
+        self._last_write = None
+        # Media time of the closed fragments and last value of the clock
+        self._closed_media_time = 0.0
+        self._media_time = 0.0
+        self._clock_lock = threading.Lock()
+
+    def start_recording(
+        self,
+        ingest: Optional[StreamIngestThread] = None,
+        output_file: Optional[Path] = None,
+        start_barrier=None,
+    ):
+        """
+        Start the recording process without blocking the caller.
+        The stream and output file are opened on the recording thread, which
+        emits recording_started or recording_error.
+
+        Args:
+            ingest: Running stream ingest to record from, with its pre-roll.
+                If None or not ready, the backend opens the stream itself.
+            output_file: Recording path, timestamped in the videos
+                directory if None.
+            start_barrier: Barrier shared by the recorders of a session.
+                It is aborted if this recorder fails to open.
+        """
+        self._ingest = ingest
+        self._start_barrier = start_barrier
 
-    def start_recording(self):
-        """Start the recording process."""
-        try:
-            # Create output directory if it doesn't exist
-            video_path = ResourceManager.get_app_data_paths("videos")
-            video_path.mkdir(parents=True, exist_ok=True)
+        # Create output directory if it doesn't exist
+        video_path = ResourceManager.get_app_data_paths("videos")
+        video_path.mkdir(parents=True, exist_ok=True)
 
+        if output_file is None:
             # Generate output filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self._output_file = video_path / f"recording_{timestamp}.mp4"
-            # Open RTMP stream
-            logger.info(f"Opening RTMP stream: {ResourceManager.get_gopro_rtmp_url()}")
-            self._cap = cv2.VideoCapture(ResourceManager.get_gopro_rtmp_url())
-            if not self._cap.isOpened():
-                raise Exception("Could not open video stream")
-
-            # Get video properties
-            width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = int(self._cap.get(cv2.CAP_PROP_FPS))
-
-            # Create video writer with MP4V codec
-            fourcc = cv2.VideoWriter_fourcc(*"mp4v")  # MP4V codec
-            self._writer = cv2.VideoWriter(
-                str(self._output_file), fourcc, fps, (width, height), True  # isColor
+            output_file = video_path / f"recording_{timestamp}.mp4"
+        self._output_file = Path(output_file)
+        self._disk_monitor = DiskMonitor(
+            video_path,
+            self._bytes_written,
+            on_critical=self._on_disk_full,
+            reserved_bytes=self._stitch_bytes,
+        )
+        self._backend.disk_monitor = self._disk_monitor
+        self.start()
+
+    def _open(self) -> bool:
+        """Open the stream and the output file, return True on success."""
+        try:
+            shared_input = self._ingest is not None and self._ingest.is_ready
+            if shared_input:
+                logger.info("Recording from the running stream ingest")
+                self._backend.open_shared_input(self._ingest.streams)
+            else:
+                self._ingest = None
+                # Open RTMP stream
+                input_url = ResourceManager.get_gopro_rtmp_url(self.stream_path)
+                logger.info(
+                    f"Opening RTMP stream with {self._backend.name} backend: "
+                    f"{input_url}"
+                )
+                self._backend.open_input(input_url)
+            if self._segment_duration:
+                self._manifest = SegmentManifest.create(
+                    self._output_file, self._segment_duration
+                )
+                self._backend.open_output(self._manifest.new_segment())
+            else:
+                self._backend.open_output(partial_path(self._output_file))
+            return True
+
+        except Exception as e:
+            logger.error(f"Error starting recording: {str(e)}")
+            if self._start_barrier is not None:
+                self._start_barrier.abort()  # The other cameras do not start
+            self._abort_open()
+            events.recording_error.emit(f"Error starting recording: {str(e)}")
+            return False
+
+    def _wait_session_start(self) -> bool:
+        """
+        Wait until every recorder of the session is open.
+
+        Returns:
+            bool: False if another recorder failed: this one is discarded.
+        """
+        if self._start_barrier is None:
+            return True
+        try:
+            self._start_barrier.wait(self.START_TIMEOUT)
+            return True
+        except threading.BrokenBarrierError:
+            logger.error(f"Recording session aborted, discarding {self.stream_path}")
+            self._abort_open()
+            self._discard_output()
+            events.recording_error.emit(
+                "Recording session aborted: a camera failed to start"
             )
+            return False
+
+    def _abort_open(self):
+        """Close what _open opened, nothing was recorded."""
+        self._queue.close()
+        self._backend.close_output()
+        self._backend.close_input()
 
-            if not self._writer.isOpened():
-                raise Exception("Could not create video writer")
+    def _discard_output(self):
+        """Remove the empty files of a recording that never started."""
+        if self._manifest is not None:
+            shutil.rmtree(self._manifest.directory, ignore_errors=True)
+        elif self._output_file is not None:
+            partial_path(self._output_file).unlink(missing_ok=True)
 
-            self._start_time = datetime.now()
-            self.start()  # Start the thread
+    def run(self):
+        """
+        Open the recording, then run the capture stage: read stream items
+        and queue them for the writer.
+        """
+        if not self._open() or not self._wait_session_start():
+            return
+
+        self._start_time = datetime.now()
+        self._start_timestamp = time.time()
+        self._writer_thread.start()
+        self._disk_monitor.start()
+        if self._ingest is not None:
+            # The ingest is the capture stage, it pushes the pre-roll first
+            pre_roll = self._ingest.subscribe(
+                self._queue, with_pre_roll=True, keep_alive=True
+            )
+            self._start_time -= timedelta(seconds=pre_roll)
+            self._start_timestamp -= pre_roll
+            logger.info(f"Recording includes {pre_roll:.1f}s of pre-roll")
             events.recording_started.emit(str(self._output_file))
+            if not self._is_running:
+                self.stop_recording()  # Stopped while starting
+            return
+
+        events.recording_started.emit(str(self._output_file))
+        while self._is_running:
+            item = self._backend.read()
+            if item is None:
+                if not self._reconnect():
+                    break
+                continue
+            self._queue.put(item)
+        self._queue.close()
+
+    def _reconnect(self) -> bool:
+        """
+        Reopen the lost stream with exponential backoff until it succeeds
+        or the recording is stopped.
+
+        Returns:
+            bool: True if the stream is back.
+        """
+        if not self._is_running:
+            return False
+        logger.warning("Recording stream lost, reconnecting")
+        events.recording_reconnecting.emit(True)
+        delay = self.RECONNECT_DELAY
+        while self._is_running:
+            try:
+                self._backend.reopen_input(
+                    ResourceManager.get_gopro_rtmp_url(self.stream_path)
+                )
+                logger.info("Recording stream reconnected")
+                events.recording_reconnecting.emit(False)
+                return True
+            except Exception as e:
+                logger.warning(f"Reconnection failed, retrying in {delay:.1f}s: {e}")
+            deadline = time.monotonic() + delay
+            while self._is_running and time.monotonic() < deadline:
+                time.sleep(0.1)
+            delay = min(delay * 2, self.MAX_RECONNECT_DELAY)
+        events.recording_reconnecting.emit(False)
+        return False
+
+    def _close_input(self):
+        """
+        Close the stream once the capture stage is over. Queued packets
+        reference the input streams, so the writer does it after draining.
+        """
+        if self.is_alive():
+            self.join()
+        self._backend.close_input()
 
+    def _write_loop(self):
+        """Writer stage: write queued items until the queue is drained."""
+        dropped_seen = 0
+        try:
+            while not self._queue.is_drained():
+                item = self._queue.get(timeout=0.5)
+                if item is None:
+                    continue
+                if self._queue.dropped != dropped_seen:
+                    dropped_seen = self._queue.dropped
+                    self._backend.on_items_dropped()
+                if self._backend.starts_new_input(item):
+                    self._mark_gap()
+                if self._manifest is not None:
+                    self._rotate_segment_if_due(item)
+                self._backend.write(item)
+                self._written += 1
+                self._last_write = time.monotonic()
+            self._backend.close_output()
         except Exception as e:
-            logger.error(f"Error starting recording: {str(e)}")
-            events.recording_error.emit(f"Error starting recording: {str(e)}")
-            if self._cap:
-                self._cap.release()
-            if self._writer:
-                self._writer.release()
+            logger.error(f"Error writing recording: {str(e)}")
+            self._is_running = False
+            self._queue.close()
+            try:
+                self._backend.close_output()
+            except Exception:
+                pass  # Already reported
+            self._close_input()
+            self._disk_monitor.stop()
+            events.recording_error.emit(f"Error writing recording: {str(e)}")
+            return
+
+        self._close_input()
+        self._disk_monitor.stop()
+        logger.info(f"Recording stats: {self.get_stats()}")
+        if self._manifest is not None:
+            self._manifest.close_segment(self._backend.media_time)
+            try:
+                stitch_recording(self._manifest)
+            except Exception as e:
+                logger.error(f"Error stitching segments: {str(e)}")
+                events.recording_error.emit(
+                    f"Error stitching segments: {str(e)}. "
+                    f"The recording plays from {self._manifest.playlist_file}"
+                )
+                return
+        elif partial_path(self._output_file).exists():
+            try:
+                publish(partial_path(self._output_file), self._output_file)
+            except OSError as e:
+                logger.error(f"Error publishing recording: {str(e)}")
+        if self._output_file and Path(self._output_file).exists():
+            events.recording_stopped.emit(str(self._output_file))
+        else:
+            events.recording_error.emit("Recording produced no file")
+
+    def _rotate_segment_if_due(self, item):
+        """Close the current fragment and open the next one once it is full."""
+        item_time = self._backend.item_time(item)
+        if item_time is None:
+            return
+        if self._segment_start is None:
+            self._segment_start = item_time
+            return
+
+        elapsed = item_time - self._segment_start
+        if elapsed >= self._segment_duration and self._backend.is_split_point(item):
+            self._next_segment()
+            self._segment_start = item_time
+
+    def _next_segment(self):
+        """Close the current fragment and open the next one."""
+        with self._clock_lock:
+            duration = self._backend.media_time
+            self._backend.close_output()
+            self._manifest.close_segment(duration)
+            self._backend.open_output(self._manifest.new_segment())
+            self._closed_media_time += duration
+
+    def _mark_gap(self):
+        """
+        The stream was reopened: record a gap at the current media time and
+        continue the same recording (in a new fragment when segmented).
+        The media clock does not advance during the gap.
+        """
+        at = self.get_media_time()
+        duration = time.monotonic() - self._last_write if self._last_write else 0.0
+        self._gaps.append({"at": round(at, 3), "duration": round(duration, 3)})
+        save_gaps(self._output_file, self._gaps)
+        logger.warning(f"Recording gap of {duration:.1f}s at {at:.1f}s")
+        events.recording_gap.emit(at, duration)
+
+        if self._manifest is not None:
+            self._next_segment()
+            self._segment_start = None
+        else:
+            self._backend.continue_timeline()
 
-    def run(self):
-        """Main thread function that records frames."""
-        while self._is_running and self._cap is not None and self._writer is not None:
-            ret, frame = self._cap.read()
-            if ret:
-                self._writer.write(frame)
-            else:
-                break
+    def get_gaps(self) -> list:
+        """Gaps of the recording: dicts with media time "at" and "duration"."""
+        return list(self._gaps)
 
     def stop_recording(self):
-        """Stop the recording process cleanly."""
+        """
+        Stop the recording process without blocking the caller.
+        The capture stage ends, the writer finishes the queued items, closes
+        the file and emits recording_stopped.
+        """
         self._is_running = False
-        if self.is_alive():
-            self.join(timeout=2.0)
+        if self._ingest is not None:
+            self._ingest.unsubscribe(self._queue)
+            self._queue.close()
 
-        if self._writer:
-            self._writer.release()
-            self._writer = None
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Wait for the capture and writer stages to finish.
 
-        if self._cap:
-            self._cap.release()
-            self._cap = None
+        Returns:
+            bool: True if both stages finished within the timeout.
+        """
+        for thread in (self, self._writer_thread):
+            if thread.is_alive():
+                thread.join(timeout)
+        return not self.is_alive() and not self._writer_thread.is_alive()
 
-        if self._output_file and Path(self._output_file).exists():
-            events.recording_stopped.emit(str(self._output_file))
+    def get_stats(self) -> dict:
+        """
+        Get pipeline counters.
+
+        Returns:
+            dict: queued, written and dropped item counts, current and max
+            queue depth, video frames and bytes written, media time, wall
+            clock of the first recorded media (epoch), and the DiskMonitor
+            figures (free space, data rate, write throughput...).
+        """
+        return {
+            "queued": self._queue.queued,
+            "written": self._written,
+            "dropped": self._queue.dropped,
+            "queue_depth": len(self._queue),
+            "max_queue_depth": self._queue.max_depth,
+            "frames": self._backend.frames_written,
+            "bytes": self._bytes_written(),
+            "media_time": self.get_media_time(),
+            "start_timestamp": self._start_timestamp,
+            **(self._disk_monitor.get_stats() if self._disk_monitor else {}),
+        }
+
+    def _on_disk_full(self):
+        """Free space is critical: stop, the session stops the other cameras."""
+        self.stop_recording()
+        events.recording_disk_full.emit(self.stream_path)
+
+    def _stitch_bytes(self) -> int:
+        """Free space the stitch of the fragments will need, 0 for a single file."""
+        if self._manifest is None:
+            return 0
+        return self._bytes_written() + STITCH_MARGIN_BYTES
+
+    def _bytes_written(self) -> int:
+        """Size on disk of the files written so far."""
+        if self._manifest is not None:
+            files = list(self._manifest.directory.glob("*.mp4"))
+        elif self._output_file is not None:
+            files = [partial_path(self._output_file), Path(self._output_file)]
+        else:
+            files = []
+        size = 0
+        for file in files:
+            try:
+                size += file.stat().st_size
+            except OSError:
+                pass  # Not created yet, or stitched and removed
+        return size
+
+    def get_media_time(self) -> float:
+        """
+        Get the media time of the recording in seconds: the duration of the
+        frames actually written, measured on their stream timestamps.
+        Unlike the wall clock, it matches positions in the recorded file
+        (pre-roll, dropped frames and stream stalls included) and never
+        goes backwards.
+        """
+        with self._clock_lock:
+            media_time = self._closed_media_time + self._backend.media_time
+            self._media_time = max(self._media_time, media_time)
+            return self._media_time
 
     def get_recording_duration(self) -> float:
-        """Get the current recording duration in seconds."""
+        """Get the current recording duration in seconds (wall clock)."""
         if self._start_time is None:
             return 0
         return (datetime.now() - self._start_time).total_seconds()
@@ -104,111 +483,359 @@ class RecordingService(QObject):
     Service managing video recording.
     Centralizes recording state and notifies concerned sections.
     Handles RTMP stream recording when streaming is active.
+    Every camera stream path has its own recorder pipeline (capture, queue,
+    writer, disk monitor). Pipelines are started and stopped together as a
+    RecordingSession: a shared session id in the file names, capture
+    released by a barrier once every camera is open (cameras start together
+    or not at all), and a session manifest with their start timestamps.
+    A failing camera stops the whole session.
+    The recorder backend is either "pyav" (stream copy, keeps audio) or
+    "opencv" (legacy decode and re-encode path). Stream copy does not decode,
+    so four 1080p pipelines fit on an 8-core machine; isolated, each
+    pipeline also gets its own process and GIL.
+    With a segment duration, recordings are written as crash-safe fragments.
+    With the pyav backend and armed (default), recordings are fed by the
+    shared stream ingests, which keep the live streams opened and probed
+    while streaming is active, so a recording starts instantly and includes
+    the ingest pre-roll.
+    Start and stop never block the caller: progress is published as
+    RecordingState names through recording_status_changed.
+    Stopped recordings are finalized in the background (index moved to the
+    front) and announced through recording_finalized.
+    Isolated, the recorders run in child processes (without the ingest
+    pre-roll). In both modes, live stats, totals and per camera, are
+    published through recording_stats_updated while recording.
     """
 
-    def __init__(self, parent=None):
+    DEFAULT_BACKEND = "pyav"
+    DEFAULT_SEGMENT_DURATION = 60.0  # seconds, None for a single file
+    DEFAULT_FSYNC_INTERVAL = 5.0  # seconds, None for direct writes
+    STATS_INTERVAL_MS = 1000
+    # Counters summed over the cameras in the published stats
+    TOTAL_STATS = ("queued", "written", "dropped", "frames", "bytes")
+
+    def __init__(
+        self,
+        backend: str = DEFAULT_BACKEND,
+        queue_size: Optional[int] = None,
+        drop_policy: DropPolicy = DropPolicy.DROP_OLDEST,
+        segment_duration: Optional[float] = DEFAULT_SEGMENT_DURATION,
+        fsync_interval: Optional[float] = DEFAULT_FSYNC_INTERVAL,
+        ingest_service: Optional[StreamIngestService] = None,
+        armed: bool = True,
+        isolated: bool = False,
+        stream_paths: Optional[List[str]] = None,
+        parent=None,
+    ):
         super().__init__(parent)
-        self._is_recording = False
-        self._recording_thread = None
-        self._setup_recording_thread()
-
-    def _setup_recording_thread(self):
-        """Setup a new recording thread and connect its Signals."""
-        if self._recording_thread is not None:
-            # Disconnect old Signals
-            try:
-                events.recording_started.disconnect()
-                events.recording_stopped.disconnect()
-                events.recording_error.disconnect()
-            except (TypeError, RuntimeError):
-                pass  # Ignore if Signals were already disconnected
-
-            # Stop and clean up old thread
-            if self._recording_thread.is_alive():
-                self._recording_thread.stop_recording()
-            self._recording_thread = None
-
-        # Create new thread
-        self._recording_thread = RecordingThread()
+        self._backend = backend
+        self._queue_size = queue_size
+        self._drop_policy = drop_policy
+        self._segment_duration = segment_duration
+        self._fsync_interval = fsync_interval
+        self._stream_paths = list(stream_paths or ResourceManager.STREAMING_PATHS)
+        self._ingest_service = ingest_service or StreamIngestService(
+            stream_paths=self._stream_paths, parent=self
+        )
+        self._finalizer = RecordingFinalizer(parent=self)
+        self._armed = armed
+        self._isolated = isolated
+        self._state = RecordingState.IDLE
+        # Stream path -> (monotonic time, frames, bytes) at the last publication
+        self._last_stats = {}
+        self._stats_timer = QTimer(self)
+        self._stats_timer.setInterval(self.STATS_INTERVAL_MS)
+        self._stats_timer.timeout.connect(self._publish_stats)
+        # Recorder of each stream path, RecordingThread or RecordingProcess
+        self._pipelines = {}
+        self._session: Optional[RecordingSession] = None
+        # Kept for the session: child processes attach to it after start
+        self._start_barrier = None
+        self._connect_signals()
+        self._setup_pipelines()
+        self._recover_interrupted_recordings()
+
+    def _recover_interrupted_recordings(self):
+        """Stitch, in the background, the recordings a previous crash left as segments."""
+        interrupted = find_interrupted_recordings(
+            ResourceManager.get_app_data_paths("videos")
+        )
+        if interrupted:
+            logger.info(f"Recovering {len(interrupted)} interrupted recording(s)")
+            threading.Thread(
+                target=recover_segmented_recordings, args=(interrupted,), daemon=True
+            ).start()
+
+    def _connect_signals(self):
         events.recording_started.connect(self._on_recording_started)
         events.recording_stopped.connect(self._on_recording_stopped)
         events.recording_error.connect(self._on_recording_error)
+        events.recording_disk_full.connect(self._on_disk_full)
+
+    def _disconnect_signals(self):
+        try:
+            events.recording_started.disconnect(self._on_recording_started)
+            events.recording_stopped.disconnect(self._on_recording_stopped)
+            events.recording_error.disconnect(self._on_recording_error)
+            events.recording_disk_full.disconnect(self._on_disk_full)
+        except (TypeError, RuntimeError):
+            pass  # Ignore if Signals were already disconnected
+
+    def _setup_pipelines(self):
+        """Setup a new recorder for every camera stream path."""
+        for recorder in self._pipelines.values():
+            # Stop and clean up old recorders
+            if recorder.is_alive():
+                recorder.stop_recording()
+
+        # Create new threads, or child process handles
+        recorder_class = RecordingProcess if self._isolated else RecordingThread
+        self._pipelines = {
+            stream_path: recorder_class(
+                self._backend,
+                self._queue_size,
+                self._drop_policy,
+                self._segment_duration,
+                self._fsync_interval,
+                stream_path,
+            )
+            for stream_path in self._stream_paths
+        }
+
+    @property
+    def backend(self) -> str:
+        """Name of the recorder backend used for new recordings."""
+        return self._backend
+
+    def set_backend(self, backend: str) -> None:
+        """
+        Select the recorder backend used for the next recording.
+
+        Args:
+            backend: "pyav" or "opencv".
+        """
+        if backend == self._backend:
+            return
+        self._backend = backend
+        if self._state == RecordingState.IDLE:
+            self._setup_pipelines()
+
+    @property
+    def stream_paths(self) -> List[str]:
+        """Camera stream paths recorded together, the first one is primary."""
+        return list(self._stream_paths)
+
+    def get_recording_stats(self) -> dict:
+        """
+        Get the capture/writer counters of the current recording.
+
+        Returns:
+            dict: TOTAL_STATS summed over the cameras, and "cameras": the
+            counters of each stream path (see RecordingThread.get_stats).
+        """
+        cameras = {
+            stream_path: recorder.get_stats()
+            for stream_path, recorder in self._pipelines.items()
+        }
+        stats = {
+            key: sum(camera.get(key, 0) for camera in cameras.values())
+            for key in self.TOTAL_STATS
+        }
+        stats["cameras"] = cameras
+        return stats
+
+    def _publish_stats(self):
+        """
+        Publish the live recording stats, with the frame rate and byte rate
+        of each camera since last time, and their totals.
+        """
+        stats = self.get_recording_stats()
+        now = time.monotonic()
+        stats["fps"] = stats["byte_rate"] = 0.0
+        for stream_path, camera in stats["cameras"].items():
+            frames, size = camera.get("frames", 0), camera.get("bytes", 0)
+            camera["fps"] = camera["byte_rate"] = 0.0
+            last = self._last_stats.get(stream_path)
+            if last is not None and now > last[0]:
+                camera["fps"] = (frames - last[1]) / (now - last[0])
+                camera["byte_rate"] = max(0.0, (size - last[2]) / (now - last[0]))
+            self._last_stats[stream_path] = (now, frames, size)
+            stats["fps"] += camera["fps"]
+            stats["byte_rate"] += camera["byte_rate"]
+        events.recording_stats_updated.emit(stats)
+
+    @property
+    def state(self) -> RecordingState:
+        """Current recording state."""
+        return self._state
 
     @property
     def is_recording(self) -> bool:
         """Indicates if recording is in progress."""
-        return self._is_recording
+        return self._state == RecordingState.RECORDING
 
     @property
     def current_recording_path(self) -> str:
-        """Get the path of the current recording file."""
-        if self._recording_thread and self._is_recording:
-            return str(self._recording_thread._output_file)
+        """Get the path of the current recording file (primary camera)."""
+        if self._session and self.is_recording:
+            return str(self._session.primary_file)
         return None
 
+    @property
+    def current_recording_paths(self) -> dict:
+        """Get the recording file of each camera stream path."""
+        if self._session and self.is_recording:
+            return {
+                stream_path: str(path)
+                for stream_path, path in self._session.output_files.items()
+            }
+        return {}
+
+    def _set_state(self, state: RecordingState) -> None:
+        """Change the recording state and notify observers."""
+        if state == self._state:
+            return
+        self._state = state
+        if state == RecordingState.RECORDING:
+            self._last_stats = {}
+            self._stats_timer.start()
+        else:
+            self._stats_timer.stop()
+        events.recording_status_changed.emit(state.name)
+
     def _on_recording_started(self, output_file: str):
-        """Handle recording started event from thread."""
+        """Handle a camera started event, the session starts with the last one."""
+        if self._session is None or not self._session.owns(output_file):
+            return
         logger.info(f"Recording started: {output_file}")
-        self._is_recording = True
+        if not self._session.mark_started(output_file):
+            return
+        if self._state == RecordingState.STOPPING:
+            return  # Stopped while starting, recording_stopped follows
+        self._set_state(RecordingState.RECORDING)
         events.recording_state_changed.emit(True)
 
     def _on_recording_stopped(self, output_file: str):
-        """Handle recording stopped event from thread."""
+        """Handle a camera stopped event, the session ends with the last one."""
+        if self._session is None or not self._session.owns(output_file):
+            return
         logger.info(f"Recording stopped and saved to: {output_file}")
-        self._is_recording = False
-        events.recording_state_changed.emit(False)
-        # Reset thread after recording is stopped
-        self._setup_recording_thread()
+        if self._session.mark_finished():
+            self._end_session()
 
     def _on_recording_error(self, error: str):
-        """Handle recording error event from thread."""
+        """Handle a camera error: the other cameras of the session are stopped."""
+        if self._session is None:
+            return
         logger.error(f"Recording error: {error}")
-        self._is_recording = False
+        self._stop_pipelines()
+        if self._session.mark_finished():
+            self._end_session()
+
+    def _on_disk_full(self, stream_path: str):
+        """Handle a camera out of disk space: the cameras share the disk, all stop."""
+        if self._session is None:
+            return
+        logger.warning(f"Disk full while recording {stream_path}, stopping the session")
+        self._stop_pipelines()
+
+    def _end_session(self):
+        """All cameras are finished: save the session and get ready for the next."""
+        start_timestamps = {
+            stream_path: recorder.get_stats().get("start_timestamp")
+            for stream_path, recorder in self._pipelines.items()
+        }
+        self._session.save(start_timestamps)
+        self._session = None
+        self._start_barrier = None
+        self._set_state(RecordingState.IDLE)
         events.recording_state_changed.emit(False)
-        # Reset thread after error
-        self._setup_recording_thread()
+        # Reset pipelines after recording is stopped
+        self._setup_pipelines()
 
     def start_recording(self):
-        """Start the recording process."""
-        if not self._is_recording:
-            self._recording_thread.start_recording()
+        """Start the recording of every camera. Returns immediately."""
+        if self._state != RecordingState.IDLE:
+            return
+        self._set_state(RecordingState.STARTING)
+        self._session = RecordingSession(self._stream_paths)
+        self._start_barrier = None
+        if len(self._pipelines) > 1:
+            # Released once every camera has opened its stream and file
+            if self._isolated:
+                self._start_barrier = multiprocessing_context().Barrier(
+                    len(self._pipelines)
+                )
+            else:
+                self._start_barrier = threading.Barrier(len(self._pipelines))
+        for stream_path, recorder in self._pipelines.items():
+            ingest = None
+            if self._backend == "pyav" and self._armed and not self._isolated:
+                ingest = self._ingest_service.get_ingest(stream_path)
+            recorder.start_recording(
+                ingest, self._session.output_files[stream_path], self._start_barrier
+            )
 
     def stop_recording(self):
-        """Stop the recording process."""
-        if self._is_recording and self._recording_thread:
-            self._recording_thread.stop_recording()
+        """Stop the recording of every camera, or cancel it while starting. Returns immediately."""
+        self._stop_pipelines()
+
+    def _stop_pipelines(self):
+        if self._state in (RecordingState.STARTING, RecordingState.RECORDING):
+            self._set_state(RecordingState.STOPPING)
+            # Every camera is asked before any of them finishes: they stop together
+            for recorder in self._pipelines.values():
+                recorder.stop_recording()
+
+    def _primary_recorder(self):
+        return self._pipelines.get(self._stream_paths[0])
+
+    def get_media_time(self) -> float:
+        """
+        Get the media time of the current recording in seconds, 0 if not
+        recording. This is the clock tags are placed on (primary camera).
+        """
+        if self._state != RecordingState.RECORDING:
+            return 0.0
+        return self._primary_recorder().get_media_time()
+
+    def get_gaps(self) -> list:
+        """Gaps of the current or last recording of the primary camera (see gap_markers)."""
+        recorder = self._primary_recorder()
+        if recorder is None:
+            return []
+        return recorder.get_gaps()
 
     def toggle_recording(self) -> None:
         """
         Toggle recording state.
         """
-        if self._is_recording:
-            self.stop_recording()
-        else:
+        if self._state == RecordingState.IDLE:
             self.start_recording()
+        else:
+            self.stop_recording()
 
     def cleanup(self):
         """Clean up resources before application exit."""
-        if self._recording_thread:
-            try:
-                # Disconnect Signals first
-                try:
-                    events.recording_started.disconnect()
-                    events.recording_stopped.disconnect()
-                    events.recording_error.disconnect()
-                except (TypeError, RuntimeError):
-                    pass  # Ignore if Signals were already disconnected
-
-                # Stop recording if active
-                if self._is_recording:
-                    self._recording_thread.stop_recording()
-
-                # Wait for thread to finish
-                if self._recording_thread.is_alive():
-                    self._recording_thread.join(timeout=2.0)
-                self._recording_thread = None
+        try:
+            # Disconnect Signals first
+            self._disconnect_signals()
+
+            # Stop recording if active
+            if self._state != RecordingState.IDLE:
+                for recorder in self._pipelines.values():
+                    recorder.stop_recording()
+
+            # Let the writers finalize the files before exiting
+            for stream_path, recorder in self._pipelines.items():
+                if not recorder.wait(timeout=5.0):
+                    logger.warning(
+                        f"Recording of {stream_path} did not finish writing before exit"
+                    )
+            self._pipelines = {}
 
-            except Exception as e:
-                logger.error(f"Error during cleanup: {str(e)}")
-            finally:
-                self._is_recording = False
+        except Exception as e:
+            logger.error(f"Error during cleanup: {str(e)}")
+        finally:
+            self._state = RecordingState.IDLE
+        self._finalizer.cleanup()
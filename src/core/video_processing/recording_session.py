@@ -0,0 +1,111 @@
+"""
+Recording sessions.
+A session is one press of the record button: every camera stream path is
+recorded by its own pipeline into its own file, all files sharing the
+session id in their name. Once the session ends, a manifest in the
+"sessions" app data directory lists the files and the wall clock their
+first media was captured at, so the cameras can be played back in sync.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core.logging_config import logger
+from src.utils.resource_manager import ResourceManager
+
+
+class RecordingSession:
+    """
+    Files and progress of the pipelines of a session.
+    The session is started once every pipeline has started, and finished
+    once every pipeline has stopped or failed.
+    """
+
+    def __init__(self, stream_paths: List[str]):
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.stream_paths = list(stream_paths)
+        video_dir = ResourceManager.get_app_data_paths("videos")
+        self.output_files: Dict[str, Path] = {
+            stream_path: video_dir / self._file_name(stream_path)
+            for stream_path in self.stream_paths
+        }
+        self._started = set()
+        self._finished = 0
+
+    def _file_name(self, stream_path: str) -> str:
+        if len(self.stream_paths) == 1:
+            return f"recording_{self.session_id}.mp4"
+        camera = stream_path.strip("/").replace("/", "_")
+        return f"recording_{self.session_id}_{camera}.mp4"
+
+    @property
+    def primary_file(self) -> Path:
+        """File of the first camera, the one tags are placed on."""
+        return self.output_files[self.stream_paths[0]]
+
+    def owns(self, output_file: str) -> bool:
+        """True if a file belongs to this session."""
+        return Path(output_file) in self.output_files.values()
+
+    def mark_started(self, output_file: str) -> bool:
+        """Record a started pipeline, True once all of them are started."""
+        self._started.add(Path(output_file))
+        return len(self._started) == len(self.output_files)
+
+    def mark_finished(self) -> bool:
+        """Record a stopped or failed pipeline, True once all of them are."""
+        self._finished += 1
+        return self._finished >= len(self.output_files)
+
+    def save(self, start_timestamps: Dict[str, Optional[float]]) -> Optional[Path]:
+        """
+        Write the session manifest, listing the files that were recorded.
+
+        Args:
+            start_timestamps: Wall clock (epoch) of the first media of each
+                stream path, None if it never recorded.
+
+        Returns:
+            Path: The manifest path, None if no file was recorded.
+        """
+        cameras = [
+            (stream_path, self.output_files[stream_path], start_timestamps[stream_path])
+            for stream_path in self.stream_paths
+            if self.output_files[stream_path].exists()
+            and start_timestamps.get(stream_path) is not None
+        ]
+        if not cameras:
+            return None
+
+        # All cameras have media from the latest first capture on
+        common_start = max(start for _, _, start in cameras)
+        data = {
+            "session_id": self.session_id,
+            "start_time": common_start,
+            "cameras": [
+                {
+                    "stream_path": stream_path,
+                    "file": output_file.name,
+                    "start_time": start,
+                    # Position of the common start in the file, in seconds
+                    "offset": round(common_start - start, 3),
+                }
+                for stream_path, output_file, start in cameras
+            ],
+        }
+        path = ResourceManager.get_app_data_paths("sessions") / (
+            f"session_{self.session_id}.json"
+        )
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Error saving recording session: {e}")
+            return None
+        return path
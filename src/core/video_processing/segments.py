@@ -0,0 +1,326 @@
+"""
+Segmented recording support.
+A segmented recording is a directory of fixed-duration MP4 fragments plus a
+JSON manifest. Every closed fragment is a complete, playable file, so a crash
+loses at most the fragment being written. At stop, the fragments are stitched
+into the final MP4 by stream copy, which needs as much free space again as
+the fragments take. When it does not fit (or stitching fails), the fragments
+are kept with an M3U playlist next to the output file, which plays them in
+order; stitching is retried at the next launches, a few times only.
+"""
+
+import errno
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import List, Optional
+
+import av
+
+from src.core.logging_config import logger
+from src.core.video_processing.atomic_publish import partial_path, publish
+from src.core.video_processing.recorder_backends import add_copy_stream
+
+SEGMENTS_DIR_SUFFIX = ".segments"
+PLAYLIST_SUFFIX = ".m3u"
+# Free space kept on top of the stitched file (index, file system overhead)
+STITCH_MARGIN_BYTES = 64 * 1024 * 1024
+# Failed stitches after which interrupted recordings are no longer recovered
+MAX_STITCH_ATTEMPTS = 3
+
+
+class SegmentManifest:
+    """
+    Manifest of a segmented recording, stored next to its fragments.
+    Rewritten atomically after each change.
+    """
+
+    FILE_NAME = "manifest.json"
+
+    def __init__(self, directory: Path, output_file: Path, segment_duration: float):
+        self.directory = Path(directory)
+        self.output_file = Path(output_file)
+        self.segment_duration = segment_duration
+        self.segments: List[dict] = []
+        self.complete = False
+        self.stitch_failures = 0
+
+    @classmethod
+    def create(cls, output_file: Path, segment_duration: float) -> "SegmentManifest":
+        """
+        Create the segments directory of a recording and its manifest.
+
+        Args:
+            output_file: Path of the final stitched file.
+            segment_duration: Target duration of a fragment in seconds.
+        """
+        output_file = Path(output_file)
+        directory = output_file.with_name(output_file.stem + SEGMENTS_DIR_SUFFIX)
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = cls(directory, output_file, segment_duration)
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, directory: Path) -> "SegmentManifest":
+        """
+        Load the manifest of a segments directory.
+
+        Raises:
+            OSError, ValueError: If the manifest cannot be read.
+        """
+        directory = Path(directory)
+        with open(directory / cls.FILE_NAME, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        manifest = cls(
+            directory, directory.parent / data["output"], data["segment_duration"]
+        )
+        manifest.segments = data["segments"]
+        manifest.complete = data["complete"]
+        manifest.stitch_failures = data.get("stitch_failures", 0)
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest atomically (readers see the old or new version)."""
+        data = {
+            "output": self.output_file.name,
+            "segment_duration": self.segment_duration,
+            "segments": self.segments,
+            "complete": self.complete,
+            "stitch_failures": self.stitch_failures,
+        }
+        tmp_file = self.directory / (self.FILE_NAME + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.directory / self.FILE_NAME)
+
+    def new_segment(self) -> Path:
+        """Register a new open fragment and return its path."""
+        name = f"segment_{len(self.segments):05d}.mp4"
+        self.segments.append({"file": name, "duration": None, "closed": False})
+        self.save()
+        return self.directory / name
+
+    def close_segment(self, duration: Optional[float] = None) -> None:
+        """Mark the last fragment as closed (fully written)."""
+        if self.segments and not self.segments[-1]["closed"]:
+            self.segments[-1]["closed"] = True
+            self.segments[-1]["duration"] = duration
+            self.save()
+
+    def closed_segments(self) -> List[Path]:
+        """Paths of the fragments that were closed cleanly."""
+        return [
+            self.directory / segment["file"]
+            for segment in self.segments
+            if segment["closed"]
+        ]
+
+    def mark_complete(self) -> None:
+        """Mark the recording as stitched into its output file."""
+        self.complete = True
+        self.save()
+
+    @property
+    def playlist_file(self) -> Path:
+        """Playlist of the fragments, next to the output file."""
+        return self.output_file.with_suffix(PLAYLIST_SUFFIX)
+
+    def write_playlist(self) -> Path:
+        """Write the M3U playlist of the closed fragments, in order."""
+        lines = ["#EXTM3U"]
+        for segment in self.segments:
+            if segment["closed"]:
+                duration = segment["duration"] or self.segment_duration
+                lines.append(f"#EXTINF:{duration:.3f},")
+                lines.append(f"{self.directory.name}/{segment['file']}")
+        tmp_file = self.playlist_file.with_name(self.playlist_file.name + ".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_file, self.playlist_file)
+        return self.playlist_file
+
+    def stitch_bytes(self) -> int:
+        """Free space needed to stitch the closed fragments."""
+        size = STITCH_MARGIN_BYTES
+        for segment_file in self.closed_segments():
+            try:
+                size += segment_file.stat().st_size
+            except OSError:
+                pass  # Lost fragment, skipped when stitching
+        return size
+
+
+def concat_segments(
+    segment_files: List[Path], output_file: Path, faststart: bool = True
+) -> None:
+    """
+    Stitch MP4 fragments into one file by stream copy (no re-encoding).
+    With faststart, the index is written at the front of the file.
+    Each fragment starts at 0, so its timestamps are shifted to make its
+    first video frame follow the last video frame of the previous one. The
+    result has the same duration as the recorder media clock counted, so
+    tag times stay valid. Audio overlapping a fragment boundary is trimmed.
+
+    Raises:
+        Exception: If no fragment can be read or the output cannot be written.
+    """
+    if not segment_files:
+        raise Exception("No segment to stitch")
+
+    options = {"movflags": "faststart"} if faststart else {}
+    output = av.open(str(output_file), mode="w", format="mp4", options=options)
+    out_streams = {}
+    last_dts = {}  # Last muxed dts per stream type
+    offset = 0  # Seconds, as a Fraction once the first fragment is read
+    try:
+        for segment_file in segment_files:
+            try:
+                segment = av.open(str(segment_file))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable segment {segment_file}: {e}")
+                continue
+
+            with segment:
+                streams = [s for s in segment.streams if s.type in ("video", "audio")]
+                if not out_streams:
+                    for stream in streams:
+                        out_streams[stream.type] = add_copy_stream(output, stream)
+
+                # Presentation of the fragment starts at its first video frame
+                video = next((s for s in streams if s.type == "video"), None)
+                start = 0
+                if video is not None and video.start_time is not None:
+                    start = video.start_time * video.time_base
+
+                segment_end = offset
+                for packet in segment.demux(*streams):
+                    kind = packet.stream.type
+                    if packet.dts is None or kind not in out_streams:
+                        continue
+                    shift = int((offset - start) / packet.time_base)
+                    if kind == "video":
+                        pts = packet.pts if packet.pts is not None else packet.dts
+                        end = (pts + (packet.duration or 0)) * packet.time_base
+                        segment_end = max(segment_end, offset + end - start)
+                    packet.dts += shift
+                    if packet.pts is not None:
+                        packet.pts += shift
+                    if kind in last_dts and packet.dts <= last_dts[kind]:
+                        continue
+                    last_dts[kind] = packet.dts
+                    packet.stream = out_streams[kind]
+                    output.mux(packet)
+                offset = segment_end
+    finally:
+        output.close()
+
+    if not out_streams:
+        raise Exception("No readable segment to stitch")
+
+
+def stitch_recording(manifest: SegmentManifest, keep_segments: bool = False) -> Path:
+    """
+    Stitch the closed fragments of a recording into its output file, with
+    the index first. The file is published atomically once complete.
+    If the disk cannot hold the stitched copy, or stitching fails, the
+    fragments are kept with their playlist and the failure is counted in
+    the manifest.
+
+    Args:
+        manifest: Manifest of the recording.
+        keep_segments: Keep the fragments directory after stitching.
+
+    Returns:
+        Path: The stitched output file.
+
+    Raises:
+        OSError: ENOSPC if the stitched file does not fit on the disk.
+        Exception: If the fragments cannot be stitched.
+    """
+    partial = partial_path(manifest.output_file)
+    try:
+        needed = manifest.stitch_bytes()
+        free = shutil.disk_usage(manifest.directory).free
+        if free < needed:
+            raise OSError(
+                errno.ENOSPC,
+                f"Stitching needs {needed / 1e6:.0f} MB, "
+                f"{free / 1e6:.0f} MB free; segments kept",
+            )
+        concat_segments(manifest.closed_segments(), partial)
+        publish(partial, manifest.output_file)
+    except Exception:
+        partial.unlink(missing_ok=True)
+        manifest.stitch_failures += 1
+        try:
+            manifest.save()
+            manifest.write_playlist()
+        except OSError as e:
+            logger.error(f"Cannot write the playlist of {manifest.output_file}: {e}")
+        raise
+    manifest.mark_complete()
+    manifest.playlist_file.unlink(missing_ok=True)
+    if not keep_segments:
+        shutil.rmtree(manifest.directory, ignore_errors=True)
+    logger.info(
+        f"Stitched {len(manifest.segments)} segments into {manifest.output_file}"
+    )
+    return manifest.output_file
+
+
+def find_interrupted_recordings(video_dir: Path) -> List[SegmentManifest]:
+    """
+    Find segmented recordings left unfinished by a crash, or whose stitching
+    failed, and that were not given up after MAX_STITCH_ATTEMPTS.
+
+    Args:
+        video_dir: Directory containing the recordings.
+
+    Returns:
+        List[SegmentManifest]: Manifests of the recordings to recover.
+    """
+    manifests = []
+    if not Path(video_dir).exists():
+        return manifests
+
+    for directory in Path(video_dir).glob(f"*{SEGMENTS_DIR_SUFFIX}"):
+        try:
+            manifest = SegmentManifest.load(directory)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Invalid segments manifest in {directory}: {e}")
+            continue
+        if manifest.complete:
+            continue
+        if manifest.stitch_failures >= MAX_STITCH_ATTEMPTS:
+            logger.warning(
+                f"Not stitching {manifest.output_file} again after "
+                f"{manifest.stitch_failures} failures, play {manifest.playlist_file}"
+            )
+            continue
+        manifests.append(manifest)
+    return manifests
+
+
+def recover_segmented_recordings(manifests: List[SegmentManifest]) -> List[Path]:
+    """
+    Stitch interrupted recordings found by find_interrupted_recordings.
+
+    Returns:
+        List[Path]: The recovered output files.
+    """
+    recovered = []
+    for manifest in manifests:
+        # The fragment open at crash time has no index; try it anyway,
+        # concat_segments skips it if it is unreadable
+        for segment in manifest.segments:
+            segment["closed"] = True
+        try:
+            recovered.append(stitch_recording(manifest))
+            logger.info(f"Recovered interrupted recording: {manifest.output_file}")
+        except Exception as e:
+            logger.error(f"Could not recover recording {manifest.output_file}: {e}")
+    return recovered
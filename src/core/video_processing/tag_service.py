@@ -10,6 +10,7 @@ from typing import List, Optional, Tuple
 
 from src.core.event_handler import events
 from src.core.logging_config import logger
+from src.core.video_processing.gap_markers import load_gaps
 from src.utils.resource_manager import ResourceManager
 
 
@@ -58,6 +59,8 @@ class TagService:
             self._tags = []
 
         events.tags_updated.emit(self._sorted_tags())
+        # Stream interruptions of the recording, shown with the tags
+        events.gaps_updated.emit(load_gaps(video_path))
 
     def save_tags(self) -> None:
         """
@@ -0,0 +1,554 @@
+"""
+Glass-to-glass latency benchmark, without a camera.
+A stand-in camera publishes a test pattern to the local MediaMTX over RTMP,
+like the GoPro does. Every frame carries the wall-clock time it was sent,
+drawn as a grid of black and white cells in its top-left corner. Each
+consumer decodes that timecode from the frames it gets, and the difference
+with the time it got them is its latency:
+    - vlc: the live view, VLC configured by a live view profile, timed when
+      VLC hands the picture to the display;
+    - recorder: the stream ingest the recorder (and the in-app live view)
+      read, timed when a packet reaches the subscriber queue the recorder
+      writes from.
+Run from the repository root, e.g.:
+    python -m src.tools.latency_benchmark --duration 30 --profile smooth
+"""
+
+import argparse
+import ctypes
+import json
+import sys
+import threading
+import time
+import zlib
+from fractions import Fraction
+from typing import Callable, Dict, List, Optional
+
+import av
+import numpy as np
+import requests
+
+from src.core.logging_config import logger
+from src.core.streaming.mediamtx_api import MediaMTXApiClient
+from src.core.streaming.mediamtx_supervisor import MediaMTXSupervisor
+from src.core.streaming.stream_ingest import StreamIngestThread
+from src.core.video_processing.frame_queue import DropPolicy, FrameQueue
+from src.core.video_processing.live_profiles import (
+    DEFAULT_LIVE_VIEW_PROFILE,
+    LIVE_VIEW_PROFILES,
+)
+from src.utils.resource_manager import ResourceManager
+
+CONSUMERS = ("vlc", "recorder")
+
+# Called with (consumer name, reception wall-clock time, gray image)
+FrameCallback = Callable[[str, float, np.ndarray], None]
+
+
+class Timecode:
+    """
+    Wall-clock time in milliseconds drawn as a grid of cells: 40 bits of time
+    and an 8-bit checksum, large enough to survive the H.264 encoding.
+    """
+
+    COLUMNS = 8
+    ROWS = 6
+    CELL = 24
+    TIME_BITS = 40
+    # Border around the grid, so the cells do not bleed into the picture
+    MARGIN = 8
+
+    @classmethod
+    def size(cls):
+        """(width, height) of the area the timecode covers."""
+        return (
+            cls.COLUMNS * cls.CELL + 2 * cls.MARGIN,
+            cls.ROWS * cls.CELL + 2 * cls.MARGIN,
+        )
+
+    @classmethod
+    def _bits(cls, milliseconds: int) -> List[int]:
+        value = milliseconds % (1 << cls.TIME_BITS)
+        data = value.to_bytes(cls.TIME_BITS // 8, "big")
+        value = (value << 8) | (zlib.crc32(data) & 0xFF)
+        count = cls.TIME_BITS + 8
+        return [(value >> (count - 1 - i)) & 1 for i in range(count)]
+
+    @classmethod
+    def draw(cls, image: np.ndarray, milliseconds: int) -> None:
+        """Draw a timecode on an RGB or gray image, in place."""
+        width, height = cls.size()
+        image[:height, :width] = 128
+        for i, bit in enumerate(cls._bits(milliseconds)):
+            y = cls.MARGIN + (i // cls.COLUMNS) * cls.CELL
+            x = cls.MARGIN + (i % cls.COLUMNS) * cls.CELL
+            image[y : y + cls.CELL, x : x + cls.CELL] = 255 if bit else 0
+
+    @classmethod
+    def read(cls, gray: np.ndarray) -> Optional[int]:
+        """
+        Read the timecode of a gray image.
+
+        Returns:
+            int: Milliseconds modulo 2**TIME_BITS, None if unreadable.
+        """
+        width, height = cls.size()
+        if gray.shape[0] < height or gray.shape[1] < width:
+            return None
+        # Center of each cell: the edges are blurred by the encoding
+        inset = cls.CELL // 3
+        value = 0
+        for i in range(cls.TIME_BITS + 8):
+            y = cls.MARGIN + (i // cls.COLUMNS) * cls.CELL + inset
+            x = cls.MARGIN + (i % cls.COLUMNS) * cls.CELL + inset
+            cell = gray[y : y + cls.CELL - 2 * inset, x : x + cls.CELL - 2 * inset]
+            value = (value << 1) | int(cell.mean() > 128)
+        milliseconds, checksum = value >> 8, value & 0xFF
+        data = milliseconds.to_bytes(cls.TIME_BITS // 8, "big")
+        if zlib.crc32(data) & 0xFF != checksum:
+            return None
+        return milliseconds
+
+    @classmethod
+    def latency(cls, milliseconds: int, received: float) -> float:
+        """Milliseconds between a timecode and a reception time."""
+        modulo = 1 << cls.TIME_BITS
+        return float((int(received * 1000) - milliseconds) % modulo)
+
+
+class PatternPublisher(threading.Thread):
+    """
+    Stand-in camera: encodes a test pattern in H.264 and publishes it over
+    RTMP at a steady frame rate, stamping each frame right before encoding.
+    The pattern is a moving gradient, or the frames of a video file (looped).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        width: int = 1280,
+        height: int = 720,
+        fps: int = 30,
+        bitrate: int = 4_000_000,
+        source: Optional[str] = None,
+    ):
+        super().__init__(daemon=True)
+        self._url = url
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.bitrate = bitrate
+        self._source = source
+        self.frames_sent = 0
+        self.error: Optional[str] = None
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """Stop the thread."""
+        self._stopped.set()
+
+    def run(self):
+        try:
+            with av.open(self._url, "w", format="flv") as output:
+                stream = output.add_stream("libx264", rate=self.fps)
+                stream.width = self.width
+                stream.height = self.height
+                stream.pix_fmt = "yuv420p"
+                stream.bit_rate = self.bitrate
+                # Like the camera: one keyframe per second, no B-frames
+                stream.codec_context.gop_size = self.fps
+                stream.options = {"preset": "ultrafast", "tune": "zerolatency"}
+                self._publish(output, stream)
+                for packet in stream.encode():
+                    output.mux(packet)
+        except (av.error.FFmpegError, OSError) as e:
+            self.error = str(e)
+            logger.error(f"Pattern publisher error: {self.error}")
+
+    def _publish(self, output, stream) -> None:
+        images = self._images()
+        start = time.monotonic()
+        while not self._stopped.is_set():
+            # Paced on the frame rate, late frames are sent right away
+            delay = start + self.frames_sent / self.fps - time.monotonic()
+            if delay > 0 and self._stopped.wait(delay):
+                break
+            image = next(images)
+            Timecode.draw(image, time.time_ns() // 1_000_000)
+            frame = av.VideoFrame.from_ndarray(image, format="rgb24")
+            frame.pts = self.frames_sent
+            frame.time_base = Fraction(1, self.fps)
+            for packet in stream.encode(frame):
+                output.mux(packet)
+            self.frames_sent += 1
+
+    def _images(self):
+        """Endless RGB images of the publisher size."""
+        if self._source is None:
+            ramp = np.linspace(0, 255, self.width, dtype=np.uint8)
+            index = 0
+            while True:
+                image = np.empty((self.height, self.width, 3), np.uint8)
+                # Moving gradient: the encoder gets motion to work on
+                image[:] = np.roll(ramp, index * 8)[None, :, None]
+                image[..., 1] = 255 - image[..., 1]
+                index += 1
+                yield image
+        while True:
+            with av.open(self._source) as container:
+                for frame in container.decode(video=0):
+                    yield frame.to_ndarray(
+                        width=self.width, height=self.height, format="rgb24"
+                    )
+
+
+class IngestConsumer:
+    """
+    Recorder side: subscribes to a stream ingest like the recorder does and
+    decodes the packets to read their timecode.
+    """
+
+    name = "recorder"
+
+    def __init__(self, stream_path: str, on_frame: FrameCallback):
+        self._on_frame = on_frame
+        self._ingest = StreamIngestThread(
+            stream_path,
+            ResourceManager.get_gopro_rtsp_url(stream_path),
+            pre_roll_seconds=0,
+        )
+        self._queue = FrameQueue(256, DropPolicy.BLOCK)
+        self._thread = threading.Thread(target=self._decode_loop, daemon=True)
+
+    def start(self) -> None:
+        self._ingest.subscribe(self._queue)
+        self._ingest.start()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._ingest.stop()
+        self._queue.close()
+        self._thread.join(timeout=5.0)
+
+    def _decode_loop(self) -> None:
+        codec = None
+        container = None
+        while not self._queue.is_drained():
+            packet = self._queue.get(timeout=0.5)
+            if packet is None or packet.stream.type != "video":
+                continue
+            received = time.time()
+            if packet.stream.container is not container:
+                # New connection: new decoder
+                container = packet.stream.container
+                codec = av.CodecContext.create(packet.stream.codec_context.name, "r")
+                codec.extradata = packet.stream.codec_context.extradata
+            try:
+                frames = codec.decode(packet)
+            except av.error.FFmpegError:
+                continue
+            for frame in frames:
+                self._on_frame(self.name, received, frame.to_ndarray(format="gray"))
+
+
+class VLCConsumer:
+    """
+    Live view side: plays the RTSP stream in VLC with a live view profile and
+    reads the pictures VLC would display, through the libvlc video callbacks.
+    """
+
+    name = "vlc"
+
+    def __init__(
+        self,
+        stream_path: str,
+        profile_name: str,
+        width: int,
+        height: int,
+        on_frame: FrameCallback,
+    ):
+        # libvlc is only needed by this consumer
+        import vlc
+
+        from src.core.video_processing.player import VLCPlayer
+
+        self._url = ResourceManager.get_gopro_rtsp_url(stream_path)
+        self._profile = LIVE_VIEW_PROFILES[profile_name]
+        self._width = width
+        self._height = height
+        self._on_frame = on_frame
+        self._buffer = (ctypes.c_ubyte * (width * height * 4))()
+        self.player = VLCPlayer(self._profile.instance_args)
+
+        # Kept referenced: libvlc calls them until the player is released
+        self._lock_callback = vlc.CallbackDecorators.VideoLockCb(self._lock)
+        self._display_callback = vlc.CallbackDecorators.VideoDisplayCb(self._display)
+        self.player.media_player.video_set_callbacks(
+            self._lock_callback, None, self._display_callback, None
+        )
+        self.player.media_player.video_set_format("RV32", width, height, width * 4)
+
+    def start(self) -> None:
+        self.player.load(self._url, self._profile.media_options)
+        self.player.play()
+
+    def stop(self) -> None:
+        self.player.cleanup()
+
+    def _lock(self, opaque, planes):
+        planes[0] = ctypes.addressof(self._buffer)
+        return None
+
+    def _display(self, opaque, picture):
+        received = time.time()
+        image = np.frombuffer(self._buffer, np.uint8).reshape(
+            self._height, self._width, 4
+        )
+        # The timecode is gray: the green channel is its luma
+        self._on_frame(self.name, received, image[..., 1].copy())
+
+
+class LatencyBenchmark:
+    """Runs the publisher and the consumers, and collects the latencies."""
+
+    # Seconds the stream must become ready in
+    READY_TIMEOUT = 15.0
+
+    def __init__(
+        self,
+        stream_path: str,
+        consumers=CONSUMERS,
+        profile: str = DEFAULT_LIVE_VIEW_PROFILE,
+        warmup: float = 2.0,
+        **publisher_options,
+    ):
+        self.stream_path = stream_path
+        self.consumer_names = tuple(consumers)
+        self.profile = profile
+        self.warmup = warmup
+        self.publisher = PatternPublisher(
+            ResourceManager.get_gopro_rtmp_url(stream_path), **publisher_options
+        )
+        self._client = MediaMTXApiClient.shared()
+        self._lock = threading.Lock()
+        self._measuring = False
+        self.latencies: Dict[str, List[float]] = {n: [] for n in self.consumer_names}
+        self.unreadable: Dict[str, int] = {n: 0 for n in self.consumer_names}
+
+    def run(self, duration: float) -> dict:
+        """
+        Publish the pattern, measure for duration seconds after the warm-up
+        and return the report (see report).
+
+        Raises:
+            RuntimeError: If MediaMTX or the stream could not be started.
+        """
+        supervisor = None
+        if not self._server_running():
+            supervisor = MediaMTXSupervisor()
+            if not supervisor.start():
+                raise RuntimeError("MediaMTX failed to start")
+
+        consumers = []
+        self.publisher.start()
+        try:
+            self._wait_for_stream()
+            consumers = self._create_consumers()
+            for consumer in consumers:
+                consumer.start()
+            time.sleep(self.warmup)
+            self._measuring = True
+            time.sleep(duration)
+            self._measuring = False
+        finally:
+            for consumer in consumers:
+                consumer.stop()
+            self.publisher.stop()
+            self.publisher.join(timeout=5.0)
+            if supervisor is not None:
+                supervisor.stop()
+        return self.report(duration)
+
+    def _server_running(self) -> bool:
+        try:
+            self._client.get("paths/list?itemsPerPage=1")
+            return True
+        except (requests.RequestException, ValueError):
+            return False
+
+    def _wait_for_stream(self) -> None:
+        deadline = time.monotonic() + self.READY_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.publisher.error is not None:
+                raise RuntimeError(f"Cannot publish: {self.publisher.error}")
+            try:
+                path = self._client.get(f"paths/get/{self.stream_path}")
+                if path.get("ready") and path.get("tracks"):
+                    return
+            except (requests.RequestException, ValueError):
+                pass
+            time.sleep(0.05)
+        raise RuntimeError(f"Stream {self.stream_path} did not become ready")
+
+    def _create_consumers(self) -> list:
+        consumers = []
+        for name in self.consumer_names:
+            if name == "vlc":
+                consumers.append(
+                    VLCConsumer(
+                        self.stream_path,
+                        self.profile,
+                        self.publisher.width,
+                        self.publisher.height,
+                        self._on_frame,
+                    )
+                )
+            elif name == "recorder":
+                consumers.append(IngestConsumer(self.stream_path, self._on_frame))
+        return consumers
+
+    def _on_frame(self, consumer: str, received: float, gray: np.ndarray) -> None:
+        if not self._measuring:
+            return
+        milliseconds = Timecode.read(gray)
+        with self._lock:
+            if milliseconds is None:
+                self.unreadable[consumer] += 1
+            else:
+                self.latencies[consumer].append(
+                    Timecode.latency(milliseconds, received)
+                )
+
+    def report(self, duration: float) -> dict:
+        """
+        Latency distribution of each consumer, in milliseconds: frames,
+        unreadable, fps, min, mean, p50, p90, p99 and max.
+        """
+        consumers = {}
+        for name in self.consumer_names:
+            samples = np.array(self.latencies[name])
+            stats = {
+                "frames": int(samples.size),
+                "unreadable": self.unreadable[name],
+                "fps": samples.size / duration if duration > 0 else 0.0,
+            }
+            if samples.size:
+                p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+                stats.update(
+                    min=float(samples.min()),
+                    mean=float(samples.mean()),
+                    p50=float(p50),
+                    p90=float(p90),
+                    p99=float(p99),
+                    max=float(samples.max()),
+                )
+            consumers[name] = stats
+        return {
+            "stream_path": self.stream_path,
+            "profile": self.profile,
+            "duration": duration,
+            "publisher": {
+                "width": self.publisher.width,
+                "height": self.publisher.height,
+                "fps": self.publisher.fps,
+                "bitrate": self.publisher.bitrate,
+                "frames_sent": self.publisher.frames_sent,
+            },
+            "consumers": consumers,
+        }
+
+
+def format_report(report: dict) -> str:
+    """Human readable table of a report."""
+    publisher = report["publisher"]
+    lines = [
+        f"Stream {report['stream_path']}, profile {report['profile']}, "
+        f"{publisher['width']}x{publisher['height']} @ {publisher['fps']} fps, "
+        f"{publisher['frames_sent']} frames sent",
+        f"{'consumer':<10}{'frames':>8}{'bad':>6}{'min':>8}{'p50':>8}"
+        f"{'p90':>8}{'p99':>8}{'max':>8}  (ms)",
+    ]
+    for name, stats in report["consumers"].items():
+        if not stats["frames"]:
+            lines.append(f"{name:<10}{0:>8}{stats['unreadable']:>6}  no frames")
+            continue
+        lines.append(
+            f"{name:<10}{stats['frames']:>8}{stats['unreadable']:>6}"
+            + "".join(
+                f"{stats[key]:>8.0f}" for key in ("min", "p50", "p90", "p99", "max")
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure the live latency with a synthetic camera."
+    )
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--path", default="bench/latency", help="MediaMTX path")
+    parser.add_argument(
+        "--consumers", default=",".join(CONSUMERS), help="vlc and/or recorder"
+    )
+    parser.add_argument(
+        "--profile",
+        default=DEFAULT_LIVE_VIEW_PROFILE,
+        choices=list(LIVE_VIEW_PROFILES),
+    )
+    parser.add_argument("--source", help="Video file looped instead of the pattern")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--bitrate", type=int, default=4_000_000)
+    parser.add_argument("--json", help="Write the report to this file")
+    parser.add_argument(
+        "--max-p50",
+        type=float,
+        help="Fail (exit 1) if a consumer's median latency exceeds this (ms)",
+    )
+    args = parser.parse_args(argv)
+
+    consumers = [name for name in args.consumers.split(",") if name]
+    unknown = set(consumers) - set(CONSUMERS)
+    if unknown:
+        parser.error(f"Unknown consumers: {', '.join(sorted(unknown))}")
+
+    benchmark = LatencyBenchmark(
+        args.path,
+        consumers,
+        profile=args.profile,
+        warmup=args.warmup,
+        width=args.width,
+        height=args.height,
+        fps=args.fps,
+        bitrate=args.bitrate,
+        source=args.source,
+    )
+    try:
+        report = benchmark.run(args.duration)
+    except RuntimeError as e:
+        logger.error(f"Latency benchmark failed: {str(e)}")
+        return 2
+
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    for name, stats in report["consumers"].items():
+        if not stats["frames"]:
+            logger.error(f"No readable frame from {name}")
+            failed = True
+        elif args.max_p50 is not None and stats["p50"] > args.max_p50:
+            logger.error(
+                f"{name}: median latency {stats['p50']:.0f} ms "
+                f"over {args.max_p50:.0f} ms"
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import time
 
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPainter
+from PySide6.QtGui import QColor, QIcon, QPainter, QPen
 from PySide6.QtWidgets import QLabel, QSlider, QStyle, QStyleOptionSlider, QWidget
 
 from src.core.event_handler import events
@@ -11,11 +11,12 @@ from src.utils.resource_manager import ResourceManager
 
 
 class ProgressSlider(QSlider):
-    """Custom slider with support for tag markers."""
+    """Custom slider with support for tag and gap markers."""
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.tag_positions = []
+        self.gap_positions = []
         self.tag_icon = QIcon(str(ResourceManager.get_icon_path("tag.svg")))
         self.tag_icon_size = 20
         self.tag_pixmap = self.tag_icon.pixmap(self.tag_icon_size, self.tag_icon_size)
@@ -31,6 +32,11 @@ class ProgressSlider(QSlider):
         self.tag_positions.clear()
         self.update()
 
+    def set_gap_markers(self, positions):
+        """Show stream interruptions at the specified positions (0-1)."""
+        self.gap_positions = [p for p in positions if 0 <= p <= 1]
+        self.update()
+
     def paintEvent(self, event):
         """
         Draw the slider with tag markers.
@@ -38,7 +44,7 @@ class ProgressSlider(QSlider):
         """
         super().paintEvent(event)
 
-        if not self.tag_positions:
+        if not self.tag_positions and not self.gap_positions:
             return
 
         opt = QStyleOptionSlider()
@@ -52,6 +58,11 @@ class ProgressSlider(QSlider):
 
         painter = QPainter(self)
 
+        painter.setPen(QPen(QColor("#d32f2f"), 2))
+        for position in self.gap_positions:
+            x = groove_rect.x() + int(position * groove_rect.width())
+            painter.drawLine(x, groove_rect.top() - 4, x, groove_rect.bottom() + 4)
+
         half_marker = self.tag_icon_size // 2
         for position in self.tag_positions:
             x = groove_rect.x() + int(position * groove_rect.width())
@@ -184,7 +195,24 @@ class MediaControls(QWidget):
             except (ValueError, TypeError):
                 continue
 
+    def on_gaps_changed(self, gaps: list[dict]):
+        """
+        Handle recording gaps changes and update markers.
+
+        Args:
+            gaps: List of dicts with the media time "at" of each gap
+        """
+        self.current_gaps = gaps
+        if self.total_time <= 0:
+            self.progress_slider.set_gap_markers([])
+            return
+        self.progress_slider.set_gap_markers(
+            [gap["at"] / self.total_time for gap in gaps]
+        )
+
     def update_total_time(self, total_time):
         self.total_time = total_time
         if hasattr(self, "current_tags"):
             self.on_tags_changed(self.current_tags)
+        if hasattr(self, "current_gaps"):
+            self.on_gaps_changed(self.current_gaps)
@@ -1,12 +1,23 @@
 import time
 
-from PySide6.QtCore import Qt, QUrl
+import vlc
+from PySide6.QtCore import Qt, QUrl, Signal
 from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PySide6.QtWidgets import QFrame, QLabel
 
+from src.core.event_handler import events
 from src.core.logging_config import logger
+from src.core.streaming.stream_ingest import StreamIngestThread
+from src.core.streaming.stream_probe import StreamReadinessProbe
+from src.core.video_processing.live_profiles import (
+    DEFAULT_LIVE_VIEW_PROFILE,
+    LIVE_VIEW_PROFILES,
+    next_live_view_profile,
+)
+from src.core.video_processing.live_renderer import LiveRenderer
 from src.core.video_processing.player import VLCPlayer
 from src.ui.utils.layouts import create_vbox_layout
+from src.ui.widgets.video_surface import VideoSurface
 from src.utils.resource_manager import ResourceManager
 
 
@@ -14,22 +25,37 @@ class MediaLiveSection(QFrame):
     """
     MediaPlayer section dedicated to live mode.
     Displays either RTMP stream or connection instructions.
+    The stream is shown by the in-app LiveRenderer fed by the shared stream
+    ingest, so the camera is pulled once for the live view and the
+    recordings. With LIVE_VIEW_SOURCE "vlc", VLC opens its own RTSP
+    connection instead, once a readiness probe found the stream ready;
+    its options come from a live view profile (see live_profiles), which
+    can be switched while the stream plays.
+    The time from the stream start to the first frame is published through
+    live_first_frame.
     """
 
+    # "ingest" or "vlc"
+    LIVE_VIEW_SOURCE = "ingest"
+
+    # Emitted on the VLC thread, handled on the GUI thread
+    _vlc_first_frame = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("media_live_section")
         self.is_rtmp_connected = False
-
-        # Initialiser le lecteur VLC
-        self.player = VLCPlayer()
-        self.player.media_player.options = [
-            "--rtsp-udp",
-            "--no-rtsp-tcp",
-            "--network-caching=50",  # 50 ms de buffer réseau
-            "--no-drop-late-frames",
-            "--no-skip-frames",
-        ]
+        self.live_renderer = None
+        self._probe = None
+        # Monotonic time the stream appeared, until its first frame is shown
+        self._stream_started_at = None
+        self._vlc_first_frame.connect(self._on_first_frame)
+
+        # Initialiser le lecteur VLC avec le profil de latence
+        self.live_profile = LIVE_VIEW_PROFILES[DEFAULT_LIVE_VIEW_PROFILE]
+        self.player = None
+        if self.LIVE_VIEW_SOURCE == "vlc":
+            self.player = VLCPlayer(self.live_profile.instance_args)
 
         # audio player
         self.audio_player = QMediaPlayer()
@@ -51,6 +77,17 @@ class MediaLiveSection(QFrame):
         )
         self.recording_indicator.raise_()
 
+        if self.LIVE_VIEW_SOURCE == "ingest":
+            self.video_surface = VideoSurface()
+            self.video_frame.setLayout(
+                create_vbox_layout(
+                    widgets=[self.video_surface], spacing=0, margins=(0, 0, 0, 0)
+                )
+            )
+            self.live_renderer = LiveRenderer(self)
+            self.live_renderer.frame_ready.connect(self.video_surface.set_frame)
+            self.live_renderer.frame_ready.connect(self._on_first_frame)
+
         # Add instructions label for RTMP connection
         self.instructions_label = QLabel(self.video_frame)
         self.instructions_label.setObjectName("instructions_label")
@@ -68,25 +105,113 @@ class MediaLiveSection(QFrame):
         self.setLayout(main_layout)
 
     def on_streaming_started(self):
-        """Handle streaming start."""
-        time.sleep(3)  # buffer
+        """Handle streaming start: play once the stream is ready."""
         self.is_rtmp_connected = True
         self._update_display()
+        self._stream_started_at = time.monotonic()
+        if self.live_renderer is not None:
+            # Frames come from the ingest once it is ready, see attach_ingest
+            return
 
         logger.info("on_streaming_started")
-        self.player.load(ResourceManager.get_gopro_rtsp_url())
+        self._stop_probe()
+        self._probe = StreamReadinessProbe(ResourceManager.STREAMING_PATH)
+        self._probe.start()
+
+    def on_live_stream_ready(self, stream_path: str):
+        """Start VLC on a stream the probe found ready."""
+        if stream_path != ResourceManager.STREAMING_PATH or not self.is_rtmp_connected:
+            return
+        self._probe = None
+        self._play_stream()
+
+    def _play_stream(self):
+        """Play the live stream in VLC with the current profile."""
+        self.player.load(
+            ResourceManager.get_gopro_rtsp_url(), self.live_profile.media_options
+        )
+        self.player.media_player.event_manager().event_attach(
+            vlc.EventType.MediaPlayerVout, self._on_vlc_vout
+        )
         if self.video_frame.winId():
             self.player.set_video_output(self.video_frame.winId())
             self.player.play()
 
+    def set_live_profile(self, name: str):
+        """
+        Switch the live view profile, restarting VLC on the stream if it is
+        playing (instance arguments only apply to a new instance).
+        """
+        profile = LIVE_VIEW_PROFILES.get(name)
+        if profile is None:
+            logger.error(f"Unknown live view profile: {name}")
+            return
+        if profile is self.live_profile:
+            return
+        self.live_profile = profile
+        logger.info(f"Live view profile: {name}")
+        events.live_profile_changed.emit(name)
+        if self.live_renderer is not None:
+            return  # Rendered in-app, no VLC buffering
+
+        playing = self.is_rtmp_connected and self._probe is None
+        self._reset_player()
+        if playing:
+            self._stream_started_at = time.monotonic()
+            self._play_stream()
+
+    def cycle_live_profile(self):
+        """Switch to the next live view profile."""
+        self.set_live_profile(next_live_view_profile(self.live_profile.name))
+
+    def _reset_player(self):
+        """Replace the VLC player by a new one configured by the profile."""
+        self.player.stop()
+        self.player.media_player.release()
+        self.player.vlc_instance.release()
+        self.player = VLCPlayer(self.live_profile.instance_args)
+
+    def _on_vlc_vout(self, event):
+        """VLC created its video output: the first frame is being shown."""
+        self._vlc_first_frame.emit()
+
+    def _on_first_frame(self, *args):
+        """Publish the time to first frame, once per stream start."""
+        started_at, self._stream_started_at = self._stream_started_at, None
+        if started_at is None:
+            return
+        seconds = time.monotonic() - started_at
+        logger.info(f"Live view time to first frame: {seconds * 1000:.0f} ms")
+        events.live_first_frame.emit(seconds)
+
+    def _stop_probe(self):
+        if self._probe is not None:
+            self._probe.stop()
+            self._probe = None
+
+    def attach_ingest(self, ingest: StreamIngestThread):
+        """Render the live view from a ready stream ingest."""
+        if self.live_renderer is None or ingest is None:
+            return
+        self.live_renderer.set_target_size(
+            self.video_frame.width(), self.video_frame.height()
+        )
+        self.live_renderer.start(ingest)
+        self.video_surface.raise_()
+        self.recording_indicator.raise_()
+
     def on_streaming_stopped(self):
         """Handle streaming stop."""
         self.is_rtmp_connected = False
+        self._stream_started_at = None
+        self._stop_probe()
         self._update_display()
-        self.player.stop()
+        if self.live_renderer is not None:
+            self.live_renderer.stop()
+            self.video_surface.clear()
+            return
         # Reset player state
-        self.player.media_player.release()
-        self.player = VLCPlayer()
+        self._reset_player()
 
     def on_streaming_error(self, error: str):
         """Handle streaming error."""
@@ -110,5 +235,10 @@ class MediaLiveSection(QFrame):
     def resizeEvent(self, event):
         """Resize video widget when window is resized."""
         super().resizeEvent(event)
+        if self.live_renderer is not None:
+            self.live_renderer.set_target_size(
+                self.video_frame.width(), self.video_frame.height()
+            )
+            return
         if self.is_rtmp_connected and hasattr(self.video_frame, "winId"):
             self.player.set_video_output(self.video_frame.winId())
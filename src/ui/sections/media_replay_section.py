@@ -1,7 +1,9 @@
+from PySide6.QtCore import Signal
 from PySide6.QtWidgets import QFrame
 
 from src.ui.sections.media_controls_section import MediaControls
 from src.ui.utils.layouts import create_vbox_layout
+from src.ui.widgets.video_surface import VideoSurface
 from src.utils.resource_manager import ResourceManager
 
 
@@ -11,6 +13,9 @@ class MediaReplaySection(QFrame):
     Displays video with controls.
     """
 
+    # Shown or hidden, by the mode or by minimizing the window
+    visibility_changed = Signal(bool)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setObjectName("media_replay_section")
@@ -29,6 +34,22 @@ class MediaReplaySection(QFrame):
 
         self.setLayout(main_layout)
 
+    def add_video_surface(self) -> VideoSurface:
+        """
+        Paint the video in-app instead of giving the frame to a native
+        player window.
+
+        Returns:
+            VideoSurface: The surface filling the video frame.
+        """
+        self.video_surface = VideoSurface()
+        self.video_frame.setLayout(
+            create_vbox_layout(
+                widgets=[self.video_surface], spacing=0, margins=(0, 0, 0, 0)
+            )
+        )
+        return self.video_surface
+
     def on_play_state_changed(self, is_playing):
         if is_playing:
             self.controls.play_pause_btn._setup_icon(
@@ -46,3 +67,11 @@ class MediaReplaySection(QFrame):
         if total_time > 0:
             position_percent = (current_time / total_time) * 100
             self.controls.update_slider_position(position_percent)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
@@ -114,6 +114,37 @@ class ActionButtonsSection(QWidget):
         for button in self.buttons.values():
             button.setFixedWidth(max_width)
 
+    def on_recording_reconnecting(self, is_reconnecting: bool) -> None:
+        """
+        Signale que le flux est perdu et que l'enregistrement tente de se
+        reconnecter.
+        """
+        button = self.buttons["start_recording_btn"]
+        button.setText("Reconnexion..." if is_reconnecting else "Stop")
+
+    def on_recording_stats_updated(self, stats: dict) -> None:
+        """
+        Affiche les statistiques de l'enregistrement en cours dans l'infobulle
+        du bouton d'enregistrement.
+        """
+        lines = [self._format_recording_stats(stats)]
+        cameras = stats.get("cameras", {})
+        if len(cameras) > 1:
+            lines += [
+                f"{stream_path} : {self._format_recording_stats(camera)}"
+                for stream_path, camera in cameras.items()
+            ]
+        self.buttons["start_recording_btn"].setToolTip("\n".join(lines))
+
+    @staticmethod
+    def _format_recording_stats(stats: dict) -> str:
+        return (
+            f"{stats.get('fps', 0.0):.1f} images/s - "
+            f"{stats.get('byte_rate', 0.0) * 8 / 1_000_000:.1f} Mbit/s - "
+            f"{stats.get('bytes', 0) / (1024 * 1024):.1f} Mo - "
+            f"{stats.get('dropped', 0)} perdues"
+        )
+
     def update_recording_state(self, is_recording: bool) -> None:
         """
         Met à jour l'apparence du bouton d'enregistrement en fonction de l'état.
@@ -123,6 +154,17 @@ class ActionButtonsSection(QWidget):
             button.setText("Stop")
         else:
             button.setText("Enregistrer")
+            button.setToolTip("")
+
+    def on_recording_status_changed(self, status: str) -> None:
+        """
+        Affiche la progression du démarrage et de l'arrêt de l'enregistrement.
+        """
+        button = self.buttons["start_recording_btn"]
+        if status == "STARTING":
+            button.setText("Démarrage...")
+        elif status == "STOPPING":
+            button.setText("Finalisation...")
 
     def on_live_mode_changed(self, is_live_mode: bool) -> None:
         """
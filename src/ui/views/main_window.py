@@ -8,6 +8,7 @@ from src.core.event_handler import events
 from src.ui.utils.layouts import create_hbox_layout
 from src.ui.views.sidebar import Sidebar
 from src.ui.views.media_player import MediaPlayer
+from src.ui.widgets.status_indicator import StatusIndicator
 from src.utils.resource_manager import ResourceManager
 
 
@@ -43,6 +44,10 @@ class MainWindow(QMainWindow):
         central_widget.setLayout(content_layout)
         self.setCentralWidget(central_widget)
 
+        # Warnings that must not interrupt the operator (stream health...)
+        self.status_indicator = StatusIndicator()
+        self.statusBar().addPermanentWidget(self.status_indicator, 1)
+
     def closeEvent(self, event):
         """
         Handle application close event.
@@ -0,0 +1,67 @@
+import time
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QLabel
+
+
+class StatusIndicator(QLabel):
+    """
+    Non-modal warning indicator, shown in the status bar of the main window.
+    Each source (a stream path, the recording disk...) holds at most one
+    message, shown until the source clears it. The text is refreshed at most
+    once per REFRESH_INTERVAL so a flapping source cannot flood the display.
+    """
+
+    REFRESH_INTERVAL = 1.0  # seconds
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages = {}
+        self._last_refresh = None
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._refresh)
+        self._setup_appearance()
+
+    def _setup_appearance(self):
+        self.setStyleSheet(
+            """
+            QLabel {
+                color: #B35C00;
+                font-weight: bold;
+                padding: 0 8px;
+            }
+        """
+        )
+        self.setVisible(False)
+
+    def set_message(self, source: str, message: str) -> None:
+        """Show the message of a source, or clear it if the message is empty."""
+        if message:
+            if self._messages.get(source) == message:
+                return
+            self._messages[source] = message
+        elif self._messages.pop(source, None) is None:
+            return
+        self._schedule_refresh()
+
+    def clear(self, source: str) -> None:
+        self.set_message(source, "")
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_timer.isActive():
+            return  # The pending refresh shows the latest messages
+        now = time.monotonic()
+        if self._last_refresh is None or now - self._last_refresh >= (
+            self.REFRESH_INTERVAL
+        ):
+            self._refresh()
+        else:
+            delay = self.REFRESH_INTERVAL - (now - self._last_refresh)
+            self._refresh_timer.start(int(delay * 1000))
+
+    def _refresh(self) -> None:
+        self._last_refresh = time.monotonic()
+        self.setText("  |  ".join(self._messages.values()))
+        self.setToolTip("\n".join(self._messages.values()))
+        self.setVisible(bool(self._messages))
@@ -0,0 +1,57 @@
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QImage, QPainter
+from PySide6.QtWidgets import QWidget
+
+
+class VideoSurface(QWidget):
+    """
+    Widget painting decoded RGB frames, scaled to fit with black bars.
+    The QImage wraps the frame buffer without copying it; the buffer is kept
+    alive until the next frame replaces it.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("video_surface")
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self._image = None
+        self._buffer = None
+
+    def set_frame(self, frame) -> None:
+        """
+        Display a frame.
+
+        Args:
+            frame: C-contiguous numpy array of shape (height, width, 3), RGB24.
+        """
+        height, width, _ = frame.shape
+        self._buffer = frame
+        self._image = QImage(
+            frame.data, width, height, frame.strides[0], QImage.Format.Format_RGB888
+        )
+        self.update()
+
+    def clear(self) -> None:
+        """Remove the displayed frame."""
+        self._image = None
+        self._buffer = None
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), Qt.GlobalColor.black)
+        if self._image is None:
+            return
+
+        # Keep the aspect ratio
+        size = self._image.size().scaled(
+            self.size(), Qt.AspectRatioMode.KeepAspectRatio
+        )
+        target = QRect(
+            (self.width() - size.width()) // 2,
+            (self.height() - size.height()) // 2,
+            size.width(),
+            size.height(),
+        )
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawImage(target, self._image)
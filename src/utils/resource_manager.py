@@ -4,12 +4,13 @@ Utilise pathlib pour une gestion des chemins cross-platform.
 Gère à la fois le mode développement et le mode PyInstaller.
 """
 
+import hashlib
 import importlib.resources
 import os
 import socket
 import sys
 from pathlib import Path
-from typing import Union, Tuple
+from typing import Optional, Union, Tuple
 
 
 class ResourceManager:
@@ -22,20 +23,26 @@ class ResourceManager:
     STREAMING_RTMP_PORT = 1935
     STREAMING_RTSP_PORT = 8554
     STREAMING_PATH = "live/stream"
+    # Chemins des caméras enregistrées ensemble (vue d'ensemble, poste, dressage...)
+    STREAMING_PATHS = (STREAMING_PATH,)
 
     @staticmethod
-    def _get_streaming_url(protocol: str, port: int) -> str:
+    def _get_streaming_url(
+        protocol: str, port: int, stream_path: Optional[str] = None
+    ) -> str:
         """
         Construit une URL de streaming avec le protocole et le port spécifiés.
 
         Args:
             protocol: Protocole de streaming (rtmp ou rtsp)
             port: Port du serveur de streaming
+            stream_path: Chemin du flux, STREAMING_PATH par défaut
 
         Returns:
             str: URL de streaming complète
         """
-        return f"{protocol}://{ResourceManager.STREAMING_HOST}:{port}/{ResourceManager.STREAMING_PATH}"
+        stream_path = stream_path or ResourceManager.STREAMING_PATH
+        return f"{protocol}://{ResourceManager.STREAMING_HOST}:{port}/{stream_path}"
 
     @staticmethod
     def _is_pyinstaller_mode() -> bool:
@@ -101,6 +108,9 @@ class ResourceManager:
             "tags": app_data_path / "tags",
             "qrcode": app_data_path / "qrcode",
             "logs": app_data_path / "logs",
+            "indexes": app_data_path / "indexes",
+            "proxies": app_data_path / "proxies",
+            "sessions": app_data_path / "sessions",
         }
 
         for path in subdirs.values():
@@ -119,6 +129,33 @@ class ResourceManager:
         """
         return ResourceManager.get_user_data_dir() / ressource_name
 
+    @staticmethod
+    def get_sidecar_path(
+        ressource_name: Union[str, Path], video_path: Union[str, Path], suffix: str
+    ) -> Path:
+        """
+        Obtient le chemin d'un fichier associé à une vidéo (index, proxy...)
+        dans un répertoire de données de l'application.
+        Le nom combine le nom de la vidéo et un hash court de son chemin
+        absolu : deux vidéos de même nom dans des dossiers différents ne
+        partagent pas leurs fichiers.
+
+        Args:
+            ressource_name: Répertoire de données (ex. "indexes")
+            video_path: Chemin de la vidéo
+            suffix: Extension du fichier associé (ex. ".idx")
+
+        Returns:
+            Path: Chemin complet du fichier associé
+        """
+        video_path = Path(video_path).resolve()
+        digest = hashlib.sha1(
+            os.path.normcase(str(video_path)).encode("utf-8")
+        ).hexdigest()[:8]
+        return ResourceManager.get_app_data_paths(ressource_name) / (
+            f"{video_path.stem}-{digest}{suffix}"
+        )
+
     @staticmethod
     def get_ipv4_address():
         """
@@ -144,21 +181,27 @@ class ResourceManager:
                 return None
 
     @staticmethod
-    def get_gopro_rtmp_url() -> str:
+    def get_gopro_rtmp_url(stream_path: Optional[str] = None) -> str:
         """
         Obtient l'URL de streaming RTMP pour GoPro.
+
+        Args:
+            stream_path: Chemin du flux de la caméra, STREAMING_PATH par défaut
         """
         return ResourceManager._get_streaming_url(
-            "rtmp", ResourceManager.STREAMING_RTMP_PORT
+            "rtmp", ResourceManager.STREAMING_RTMP_PORT, stream_path
         )
 
     @staticmethod
-    def get_gopro_rtsp_url() -> str:
+    def get_gopro_rtsp_url(stream_path: Optional[str] = None) -> str:
         """
         Obtient l'URL de streaming RTSP pour GoPro.
+
+        Args:
+            stream_path: Chemin du flux de la caméra, STREAMING_PATH par défaut
         """
         return ResourceManager._get_streaming_url(
-            "rtsp", ResourceManager.STREAMING_RTSP_PORT
+            "rtsp", ResourceManager.STREAMING_RTSP_PORT, stream_path
         )
 
     @staticmethod
@@ -0,0 +1,149 @@
+"""
+Camera drop-out while recording from the shared stream ingest.
+MediaMTX reports the stream as gone (streaming_stopped) when the camera
+drops off the Wi-Fi: the ingest must keep reconnecting for the recorder,
+which records a gap instead of ending the take.
+"""
+
+import threading
+import time
+import types
+
+import av
+import numpy as np
+import pytest
+
+from src.core.event_handler import events
+from src.core.streaming import stream_ingest
+from src.core.streaming.stream_ingest import StreamIngestService, StreamIngestThread
+from src.core.video_processing.gap_markers import load_gaps
+from src.core.video_processing.recording_service import RecordingThread
+from src.utils.resource_manager import ResourceManager
+
+STREAM_PATH = "live/test"
+FPS = 30
+
+
+class Camera:
+    """Stand-in for the camera stream: paced like a live source, can drop out."""
+
+    def __init__(self, path):
+        self.path = path
+        self.online = threading.Event()
+        self.online.set()
+
+    def open(self, url, **kwargs):
+        if not self.online.is_set():
+            raise ConnectionRefusedError("camera offline")
+        return _Connection(self, av.open(self.path))
+
+
+class _Connection:
+    def __init__(self, camera, container):
+        self._camera = camera
+        self._container = container
+        self.streams = container.streams
+
+    def demux(self, *streams):
+        for packet in self._container.demux(*streams):
+            if not self._camera.online.is_set():
+                return  # Stream lost
+            if packet.dts is not None:
+                time.sleep(1 / FPS)
+            yield packet
+
+
+@pytest.fixture
+def camera(tmp_path, monkeypatch):
+    path = tmp_path / "camera.mp4"
+    with av.open(str(path), "w") as output:
+        stream = output.add_stream("mpeg4", rate=FPS)
+        stream.width, stream.height = 64, 48
+        stream.pix_fmt = "yuv420p"
+        for i in range(10 * FPS):
+            image = np.zeros((48, 64, 3), np.uint8)
+            image[:, i % 64] = 255
+            frame = av.VideoFrame.from_ndarray(image, format="rgb24")
+            output.mux(stream.encode(frame))
+        output.mux(stream.encode())
+    camera = Camera(str(path))
+    monkeypatch.setattr(stream_ingest, "av", types.SimpleNamespace(open=camera.open))
+    monkeypatch.setattr(StreamIngestThread, "RECONNECT_DELAY", 0.05)
+    monkeypatch.setattr(
+        ResourceManager,
+        "get_app_data_paths",
+        staticmethod(lambda name: tmp_path / "app_data" / name),
+    )
+    return camera
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_camera_dropout_leaves_a_gap(camera, tmp_path):
+    service = StreamIngestService(pre_roll_seconds=0, stream_paths=[STREAM_PATH])
+    try:
+        service.start_all()
+        ingest = service.get_ingest(STREAM_PATH)
+        assert wait_for(lambda: ingest.is_ready)
+
+        recorder = RecordingThread(fsync_interval=None, stream_path=STREAM_PATH)
+        output_file = tmp_path / "recording.mp4"
+        recorder.start_recording(ingest, output_file)
+        time.sleep(0.5)
+
+        # The camera drops off the Wi-Fi, MediaMTX reports the stream gone
+        camera.online.clear()
+        events.streaming_stopped.emit()
+        time.sleep(0.5)
+        assert not recorder.wait(timeout=0)  # Still recording
+        assert ingest.is_alive()
+
+        # It comes back: the running ingest is kept and reconnects
+        camera.online.set()
+        events.streaming_started.emit()
+        assert service.get_ingest(STREAM_PATH) is ingest
+        assert wait_for(lambda: recorder.get_gaps())
+        time.sleep(0.5)
+
+        recorder.stop_recording()
+        assert recorder.wait(timeout=10)
+    finally:
+        service.cleanup()
+
+    gaps = recorder.get_gaps()
+    assert len(gaps) == 1
+    assert gaps[0]["at"] == pytest.approx(0.5, abs=0.3)
+    assert gaps[0]["duration"] >= 0.5
+    assert load_gaps(output_file) == gaps
+    with av.open(str(output_file)) as recording:
+        duration = recording.duration / av.time_base
+    assert duration == pytest.approx(1.0, abs=0.4)
+
+
+def test_ingest_stops_with_the_last_recording(camera, tmp_path):
+    service = StreamIngestService(pre_roll_seconds=0, stream_paths=[STREAM_PATH])
+    try:
+        service.start_all()
+        ingest = service.get_ingest(STREAM_PATH)
+        assert wait_for(lambda: ingest.is_ready)
+        recorder = RecordingThread(fsync_interval=None, stream_path=STREAM_PATH)
+        recorder.start_recording(ingest, tmp_path / "recording.mp4")
+        time.sleep(0.3)
+
+        events.streaming_stopped.emit()
+        time.sleep(0.3)
+        assert ingest.is_alive()
+
+        recorder.stop_recording()
+        assert recorder.wait(timeout=10)
+        ingest.join(timeout=5)
+        assert not ingest.is_alive()
+    finally:
+        service.cleanup()
@@ -0,0 +1,114 @@
+"""
+Reconnection of the OpenCV recorder backend while recording in fragments.
+The writer may open the next fragment while the capture stage is reopening
+the lost stream, so the output must not depend on the capture being open.
+"""
+
+import cv2
+import numpy as np
+import pytest
+
+from src.core.video_processing.recorder_backends import OpenCVRecorderBackend
+from src.core.video_processing.recording_service import RecordingThread
+from src.utils.resource_manager import ResourceManager
+
+WIDTH, HEIGHT, FPS, FRAMES = 64, 48, 30.0, 30
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A one-second video standing for the camera stream."""
+    path = tmp_path / "source.mp4"
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), FPS, (WIDTH, HEIGHT)
+    )
+    for i in range(FRAMES):
+        frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+        frame[:, i * 2] = 255
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def app_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ResourceManager,
+        "get_app_data_paths",
+        staticmethod(lambda name: tmp_path / "app_data" / name),
+    )
+
+
+def video_properties(path):
+    cap = cv2.VideoCapture(str(path))
+    try:
+        assert cap.isOpened()
+        return (
+            int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        )
+    finally:
+        cap.release()
+
+
+def record_until_lost(backend):
+    """Writer stage: write the items read until the stream ends."""
+    gaps = 0
+    while (item := backend.read()) is not None:
+        if backend.starts_new_input(item):
+            backend.continue_timeline()
+            gaps += 1
+        backend.write(item)
+    return gaps
+
+
+def test_open_output_while_reconnecting(source, tmp_path):
+    backend = OpenCVRecorderBackend()
+    backend.open_input(source)
+    backend.open_output(tmp_path / "fragment0.mp4")
+    assert record_until_lost(backend) == 0
+
+    # The stream is lost and cannot be reopened yet: the writer rotates
+    with pytest.raises(Exception):
+        backend.reopen_input(str(tmp_path / "missing.mp4"))
+    backend.close_output()
+    backend.open_output(tmp_path / "fragment1.mp4")
+
+    backend.reopen_input(source)
+    assert record_until_lost(backend) == 1
+    backend.close_output()
+    backend.close_input()
+
+    width, height, frame_count = video_properties(tmp_path / "fragment1.mp4")
+    assert (width, height) == (WIDTH, HEIGHT)
+    assert frame_count == pytest.approx(FRAMES, abs=1)
+
+
+def test_reconnect_while_segmenting(source, tmp_path, app_data, monkeypatch):
+    recorder = RecordingThread(
+        backend="opencv", segment_duration=0.25, fsync_interval=None
+    )
+    monkeypatch.setattr(RecordingThread, "RECONNECT_DELAY", 0.01)
+    # The stream ends twice: the first reconnection attempt fails, the
+    # second one succeeds, then the recording is stopped
+    urls = iter([source, str(tmp_path / "missing.mp4"), source])
+
+    def stream_url(stream_path=None):
+        url = next(urls, None)
+        if url is None:
+            recorder.stop_recording()
+            return str(tmp_path / "missing.mp4")
+        return url
+
+    monkeypatch.setattr(ResourceManager, "get_gopro_rtmp_url", stream_url)
+
+    output_file = tmp_path / "recording.mp4"
+    recorder.start_recording(output_file=output_file)
+    assert recorder.wait(timeout=30)
+
+    assert len(recorder.get_gaps()) == 1
+    assert recorder.get_gaps()[0]["at"] == pytest.approx(FRAMES / FPS, abs=0.1)
+    width, height, frame_count = video_properties(output_file)
+    assert (width, height) == (WIDTH, HEIGHT)
+    assert frame_count == pytest.approx(2 * FRAMES, abs=3)
@@ -0,0 +1,137 @@
+"""
+Multi-camera recording sessions: the cameras start together or not at all,
+and a camera failing while recording stops the whole session.
+"""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+from PySide6.QtCore import QCoreApplication
+
+from src.core.event_handler import events
+from src.core.video_processing.recording_service import (
+    RecordingService,
+    RecordingState,
+    RecordingThread,
+)
+from src.utils.resource_manager import ResourceManager
+
+WIDTH, HEIGHT, FPS, FRAMES = 64, 48, 30.0, 30
+CAMERAS = ["live/overview", "live/station"]
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def source(tmp_path):
+    """A one-second video standing for a camera stream."""
+    path = tmp_path / "source.mp4"
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), FPS, (WIDTH, HEIGHT)
+    )
+    for i in range(FRAMES):
+        frame = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+        frame[:, i * 2] = 255
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture
+def videos(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        ResourceManager,
+        "get_app_data_paths",
+        staticmethod(lambda name: tmp_path / "app_data" / name),
+    )
+    monkeypatch.setattr(RecordingThread, "RECONNECT_DELAY", 0.01)
+    return tmp_path / "app_data" / "videos"
+
+
+def camera_urls(monkeypatch, urls):
+    monkeypatch.setattr(
+        ResourceManager,
+        "get_gopro_rtmp_url",
+        lambda stream_path=None: urls[stream_path],
+    )
+
+
+def create_service():
+    return RecordingService(
+        backend="opencv",
+        segment_duration=None,
+        fsync_interval=None,
+        armed=False,
+        stream_paths=CAMERAS,
+    )
+
+
+def wait_for(app, condition, timeout=20.0):
+    """Run the event loop (cross-thread signals) until the condition holds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        app.processEvents()
+        time.sleep(0.02)
+    return True
+
+
+def test_camera_failing_to_start_aborts_the_session(
+    app, source, videos, tmp_path, monkeypatch
+):
+    camera_urls(
+        monkeypatch,
+        {CAMERAS[0]: source, CAMERAS[1]: str(tmp_path / "missing.mp4")},
+    )
+    service = create_service()
+    pipelines = dict(service._pipelines)
+    try:
+        service.start_recording()
+        assert wait_for(app, lambda: service.state == RecordingState.IDLE)
+        for recorder in pipelines.values():
+            assert recorder.wait(timeout=10)
+    finally:
+        service.cleanup()
+
+    # The camera that opened was released by the aborted barrier, unrecorded
+    assert not list(videos.glob("*.mp4"))
+
+
+def test_camera_failing_while_recording_stops_the_session(
+    app, source, videos, monkeypatch
+):
+    camera_urls(monkeypatch, {CAMERAS[0]: source, CAMERAS[1]: source})
+    service = create_service()
+    pipelines = dict(service._pipelines)
+    failing = pipelines[CAMERAS[1]]._backend
+    write = failing.write
+
+    def write_until_disk_error(item):
+        if failing.frames_written >= FRAMES // 2:
+            raise OSError(28, "No space left on device")
+        write(item)
+
+    monkeypatch.setattr(failing, "write", write_until_disk_error)
+    statuses = []
+    events.recording_status_changed.connect(statuses.append)
+    try:
+        service.start_recording()
+        assert wait_for(app, lambda: service.state == RecordingState.IDLE)
+        assert statuses == ["STARTING", "RECORDING", "STOPPING", "IDLE"]
+        for recorder in pipelines.values():
+            assert recorder.wait(timeout=10)
+    finally:
+        events.recording_status_changed.disconnect(statuses.append)
+        service.cleanup()
+
+    # The healthy camera was stopped and its recording published, the
+    # failed one left its partial file
+    (recording,) = videos.glob("*_live_overview.mp4")
+    assert recording.stat().st_size > 0
+    assert not list(videos.glob("*_live_station.mp4"))